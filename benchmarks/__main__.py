@@ -0,0 +1,97 @@
+"""
+Offline benchmarks of pail's hot paths against the fake maya/pymel in benchmarks.fakemaya.
+
+    python -m benchmarks --cameras 10000 --image-planes 10000 --latency-us 2
+
+Every run is appended to a history file and compared with the previous run of the same size.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('--cameras', type=int, default=2000)
+    parser.add_argument('--image-planes', type=int, default=2000)
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--bake-frames', type=int, default=1000)
+    parser.add_argument('--bake-cameras', type=int, default=20)
+    parser.add_argument('--expressions', type=int, default=2000, help='expressions not feeding any imagePlane')
+    parser.add_argument('--latency-us', type=float, default=0., help='simulated cost of every maya call')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', nargs='*', default=[], help='run cases whose name contains one of these')
+    parser.add_argument('--history', default=os.path.join(os.getcwd(), 'bench_history.jsonl'))
+    parser.add_argument('--no-history', action='store_true')
+    options = parser.parse_args(argv)
+    options.latency = options.latency_us * 1e-6
+    return options
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, stderr=subprocess.STDOUT
+            ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def previous_run(path, params):
+    """ last recorded run with the same parameters """
+    if not os.path.isfile(path):
+        return None
+    last = None
+    with open(path) as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry.get('params') == params:
+                last = entry
+    return last
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    sys.path.insert(0, os.path.join(ROOT, 'src'))
+    from . import fakemaya
+    fakemaya.install()
+    from . import suite
+
+    params = dict(
+        cameras=options.cameras, image_planes=options.image_planes, frames=options.frames,
+        bake_frames=options.bake_frames, bake_cameras=options.bake_cameras, expressions=options.expressions,
+        latency_us=options.latency_us
+        )
+    previous = None if options.no_history else previous_run(options.history, params)
+    results = {}
+    print('{:<40} {:>10} {:>10} {:>10} {:>9}'.format('case', 'min s', 'median s', 'calls', 'vs last'))
+    for name, setup in suite.cases:
+        if options.only and not any(o in name for o in options.only):
+            continue
+        result = suite.run_case(setup, options)
+        if result is None:
+            print('{:<40} {:>10}'.format(name, 'skipped'))
+            continue
+        results[name] = result
+        delta = ''
+        if previous and name in previous['results'] and previous['results'][name]['min']:
+            delta = '{:+.1%}'.format(result['min'] / previous['results'][name]['min'] - 1)
+        print('{:<40} {:>10.4f} {:>10.4f} {:>10} {:>9}'.format(
+            name, result['min'], result['median'], result['calls'], delta
+            ))
+        if result.get('max_error', 0.) > 1e-6:
+            print('    check failed: {:.3g} (world space error for the bakes)'.format(result['max_error']))
+
+    if not options.no_history:
+        entry = dict(time=time.strftime('%Y-%m-%dT%H:%M:%S'), revision=git_revision(), params=params, results=results)
+        with open(options.history, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+
+
+if __name__ == '__main__':
+    main()
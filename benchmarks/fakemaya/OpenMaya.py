@@ -0,0 +1,555 @@
+import math
+
+from . import scene as _scene
+
+
+def _current():
+    return _scene.current
+
+
+class MFn(object):
+    kInvalid = _scene.kInvalid
+    kDependencyNode = _scene.kDependencyNode
+    kDagNode = _scene.kDagNode
+    kTransform = _scene.kTransform
+    kShape = _scene.kShape
+    kCamera = _scene.kCamera
+    kImagePlane = _scene.kImagePlane
+    kExpression = _scene.kExpression
+    kAnimCurve = _scene.kAnimCurve
+    kTime = _scene.kTime
+    kNumericAttribute = _scene.kNumericAttribute
+    kTypedAttribute = _scene.kTypedAttribute
+    kMatrixAttribute = _scene.kMatrixAttribute
+    kUnitAttribute = _scene.kUnitAttribute
+
+
+class MFnData(object):
+    kMatrix = 12
+
+
+class MObject(object):
+    kNullObj = None
+
+    def __init__(self, node=None):
+        if isinstance(node, MObject):
+            node = node.node
+        self.node = node
+
+    def hasFn(self, fn):
+        return self.node is not None and fn in self.node.fns
+
+    def isNull(self):
+        return self.node is None
+
+    def apiType(self):
+        return self.node.fns[-1] if self.node is not None else MFn.kInvalid
+
+    def __eq__(self, other):
+        return isinstance(other, MObject) and self.node is other.node
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+
+MObject.kNullObj = MObject()
+
+
+class _Attribute(MObject):
+    def __init__(self, name):
+        super(_Attribute, self).__init__()
+        self.name = name
+        if name == 'worldMatrix':
+            self.fns = (MFn.kTypedAttribute,)
+        elif name in _scene.ANGULAR or name in _scene.DISTANCE:
+            self.fns = (MFn.kUnitAttribute,)
+        else:
+            self.fns = (MFn.kNumericAttribute,)
+
+    def hasFn(self, fn):
+        return fn in self.fns
+
+
+class MObjectHandle(object):
+    def __init__(self, obj=None):
+        self._node = obj.node if isinstance(obj, MObject) else getattr(obj, '_node', None)
+
+    def object(self):
+        return MObject(self._node)
+
+    def isValid(self):
+        return self._node is not None and self._node.alive
+
+    isAlive = isValid
+
+    def hashCode(self):
+        return self._node.hash if self._node is not None else 0
+
+    def __eq__(self, other):
+        return isinstance(other, MObjectHandle) and self._node is other._node
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+
+class MObjectArray(list):
+    def length(self):
+        return len(self)
+
+
+class MDoubleArray(list):
+    pass
+
+
+class MTimeArray(list):
+    pass
+
+
+class MTime(object):
+    def __init__(self, value=0., unit=None):
+        self.value = float(value)
+        self.unit = unit
+
+    @staticmethod
+    def uiUnit():
+        return 'film'
+
+
+class MDGContext(object):
+    def __init__(self, time=None):
+        self.time = time
+
+
+class MDGContextGuard(object):
+    def __init__(self, context):
+        self.context = context
+        self.previous = None
+
+    def __enter__(self):
+        scene = _current()
+        self.previous = scene.eval_time
+        if self.context.time is not None:
+            scene.eval_time = self.context.time.value
+        return self
+
+    def __exit__(self, *args):
+        _current().eval_time = self.previous
+
+
+class MUuid(object):
+    def __init__(self, value):
+        self.value = value
+
+    def asString(self):
+        return self.value
+
+
+class MMatrix(list):
+    pass
+
+
+class MFnMatrixData(object):
+    def __init__(self, data):
+        self.data = data
+
+    def matrix(self):
+        return MMatrix(value for row in self.data for value in row)
+
+
+class MFnTypedAttribute(object):
+    def __init__(self, attr):
+        self.attr = attr
+
+    def attrType(self):
+        return MFnData.kMatrix if self.attr.name == 'worldMatrix' else 0
+
+
+class MFnUnitAttribute(object):
+    kAngle, kDistance, kTime = range(1, 4)
+
+    def __init__(self, attr):
+        self.attr = attr
+
+    def unitType(self):
+        return self.kAngle if self.attr.name in _scene.ANGULAR else self.kDistance
+
+
+class MDistance(object):
+    """ value stays in the unit it was built with, like om2 """
+    kInvalid, kInches, kFeet, kYards, kMiles, kMillimeters, kCentimeters, kKilometers, kMeters = range(9)
+    NAMES = {
+        kInches: 'in', kFeet: 'ft', kYards: 'yd', kMiles: 'mi', kMillimeters: 'mm', kCentimeters: 'cm',
+        kKilometers: 'km', kMeters: 'm'
+        }
+
+    def __init__(self, value=0., unit=kCentimeters):
+        self.value = value
+        self.unit = unit
+
+    @staticmethod
+    def uiUnit():
+        return next(unit for unit, name in MDistance.NAMES.items() if name == _current().linear_unit)
+
+    @staticmethod
+    def internalUnit():
+        return MDistance.kCentimeters
+
+    def asUnits(self, unit):
+        return self.value * _scene.LINEAR_UNITS[self.NAMES[self.unit]] / _scene.LINEAR_UNITS[self.NAMES[unit]]
+
+    def asCentimeters(self):
+        return self.asUnits(self.kCentimeters)
+
+
+class MAngle(object):
+    """ value stays in the unit it was built with, like om2 """
+    kInvalid, kRadians, kDegrees = range(3)
+
+    def __init__(self, value=0., unit=kRadians):
+        self.value = value
+        self.unit = unit
+
+    @staticmethod
+    def uiUnit():
+        return MAngle.kDegrees
+
+    @staticmethod
+    def internalUnit():
+        return MAngle.kRadians
+
+    def asUnits(self, unit):
+        if unit == self.unit:
+            return self.value
+        return math.degrees(self.value) if unit == self.kDegrees else math.radians(self.value)
+
+    def asRadians(self):
+        return self.asUnits(self.kRadians)
+
+
+class MDGModifier(object):
+    def __init__(self):
+        self.edits = []
+
+    def newPlugValueDouble(self, plug, value):
+        self.edits.append((plug, value))
+
+    newPlugValueString = newPlugValueDouble
+
+    def doIt(self):
+        _current().cost()
+        for plug, value in self.edits:
+            plug._node.attrs[plug.attr] = value
+            plug._node.motion.pop(plug.attr, None)
+        self.edits = []
+
+
+class MPlug(object):
+    kFreeToChange, kNotFreeToChange, kChildrenNotFreeToChange = range(3)
+
+    def __init__(self, node, attr, index=None):
+        self._node = node
+        self.attr = _scene.attr_name(attr)
+        self.index = index
+
+    def node(self):
+        return MObject(self._node)
+
+    def attribute(self):
+        return _Attribute(self.attr)
+
+    def name(self):
+        return '{}.{}'.format(self._node.name, self.attr)
+
+    def partialName(self, *args, **kwargs):
+        return self.attr
+
+    def isFreeToChange(self, *args, **kwargs):
+        _current().cost()
+        return self.kNotFreeToChange if self.attr in self._node.locked else self.kFreeToChange
+
+    def asInt(self, context=None):
+        return int(self.asDouble(context))
+
+    def elementByLogicalIndex(self, index):
+        return MPlug(self._node, self.attr, index)
+
+    def asMObject(self, context=None):
+        scene = _current()
+        scene.cost()
+        frame = context.time.value if context is not None and context.time is not None else None
+        return scene.world_matrix(self._node, frame)
+
+    def asDouble(self, context=None):
+        scene = _current()
+        scene.cost()
+        frame = context.time.value if context is not None and context.time is not None else None
+        return float(scene.value(self._node, self.attr, frame))
+
+    def connectedTo(self, asDst, asSrc):
+        _current().cost()
+        if self.attr == 'message' and asSrc and getattr(self._node, 'camera', None) is not None:
+            return [MPlug(self._node.camera, 'imagePlane', 0)]
+        return []
+
+    def numConnectedElements(self):
+        return len(self._image_planes())
+
+    def connectionByPhysicalIndex(self, index):
+        return _ImagePlaneElement(self._image_planes()[index])
+
+    def _image_planes(self):
+        scene = _current()
+        return [n for n in scene.nodes if n.alive and getattr(n, 'camera', None) is self._node]
+
+
+class _ImagePlaneElement(object):
+    def __init__(self, image_plane):
+        self.image_plane = image_plane
+
+    def connectedTo(self, asDst, asSrc):
+        return [MPlug(self.image_plane, 'message')]
+
+
+class MDagPath(object):
+    def __init__(self, other=None):
+        self.nodes = list(other.nodes) if isinstance(other, MDagPath) else []
+
+    @staticmethod
+    def getAPathTo(obj):
+        scene = _current()
+        scene.cost()
+        node = obj.node
+        if node is None or not node.is_dag:
+            raise RuntimeError('(kInvalidParameter): Object is incompatible with this method')
+        path = MDagPath()
+        while node is not None:
+            path.nodes.insert(0, node)
+            node = node.parent
+        return path
+
+    def node(self):
+        return MObject(self.nodes[-1] if self.nodes else None)
+
+    def transform(self):
+        return MObject(next(n for n in reversed(self.nodes) if _scene.kTransform in n.fns))
+
+    def fullPathName(self):
+        return _current().full_path(self.nodes[-1])
+
+    def partialPathName(self):
+        return _current().partial_path(self.nodes[-1])
+
+    def numberOfShapesDirectlyBelow(self):
+        return len(self._shapes())
+
+    def extendToShape(self, index=0):
+        self.nodes.append(self._shapes()[index])
+        return self
+
+    def instanceNumber(self):
+        return 0
+
+    def isValid(self):
+        return bool(self.nodes) and all(n.alive for n in self.nodes)
+
+    def hasFn(self, fn):
+        return self.node().hasFn(fn)
+
+    def _shapes(self):
+        return [n for n in self.nodes[-1].children if _scene.kShape in n.fns]
+
+
+class MFnDependencyNode(object):
+    def __init__(self, obj=None):
+        _current().cost()
+        if isinstance(obj, MDagPath):
+            obj = obj.node()
+        self._node = obj.node if obj is not None else None
+
+    def object(self):
+        return MObject(self._node)
+
+    def name(self):
+        return self._node.name
+
+    def setName(self, name):
+        _current().rename(self._node, name)
+        return name
+
+    def typeName(self):
+        return self._node.type
+
+    def uuid(self):
+        return MUuid(self._node.uuid)
+
+    def findPlug(self, attr, wantNetworkedPlug=False):
+        return MPlug(self._node, attr)
+
+
+class MFnDagNode(MFnDependencyNode):
+    def parent(self, index=0):
+        return MObject(self._node.parent)
+
+    def childCount(self):
+        return len(self._node.children)
+
+    def child(self, index):
+        return MObject(self._node.children[index])
+
+    def fullPathName(self):
+        return _current().full_path(self._node)
+
+    def partialPathName(self):
+        return _current().partial_path(self._node)
+
+
+class MItDependencyNodes(object):
+    def __init__(self, filter=None):
+        scene = _current()
+        scene.cost()
+        self._nodes = [n for n in scene.nodes if not filter or filter in n.fns]
+        self._index = 0
+
+    def isDone(self):
+        return self._index >= len(self._nodes)
+
+    def thisNode(self):
+        return MObject(self._nodes[self._index])
+
+    def next(self):
+        _current().cost()
+        self._index += 1
+
+
+class MItDependencyGraph(object):
+    kDownstream, kUpstream = range(2)
+    kDepthFirst, kBreadthFirst = range(2)
+    kNodeLevel, kPlugLevel = range(2)
+
+    def __init__(self, root, filter=MFn.kInvalid, direction=kDownstream, traversal=kDepthFirst, level=kNodeLevel):
+        scene = _current()
+        scene.cost()
+        self._nodes = [root._node] + scene.upstream(root._node, root.attr)
+        self._index = 0
+
+    def isDone(self):
+        return self._index >= len(self._nodes)
+
+    def currentNode(self):
+        return MObject(self._nodes[self._index])
+
+    def next(self):
+        self._index += 1
+
+
+class MSelectionList(object):
+    def __init__(self):
+        self._nodes = []
+        self._plugs = []
+
+    def add(self, item, *args):
+        scene = _current()
+        scene.cost()
+        if isinstance(item, MObject):
+            nodes = [item.node]
+        elif isinstance(item, MDagPath):
+            nodes = [item.nodes[-1]]
+        else:
+            nodes = scene.lookup(item)
+            if not nodes:
+                raise RuntimeError('(kInvalidParameter): Object does not exist')
+            if '.' in item:
+                self._plugs.append(MPlug(nodes[0], item.split('.', 1)[1]))
+        for node in nodes:
+            if node not in self._nodes:
+                self._nodes.append(node)
+        return self
+
+    def length(self):
+        return len(self._nodes)
+
+    def getDependNode(self, index):
+        if index >= len(self._nodes):
+            raise IndexError('index out of range')
+        return MObject(self._nodes[index])
+
+    def getDagPath(self, index):
+        return MDagPath.getAPathTo(self.getDependNode(index))
+
+    def getPlug(self, index):
+        return self._plugs[index]
+
+
+class MGlobal(object):
+    @staticmethod
+    def getActiveSelectionList():
+        selection = MSelectionList()
+        for node in _current().selection:
+            selection.add(MObject(node))
+        return selection
+
+
+class MMessage(object):
+    @staticmethod
+    def removeCallback(callback_id):
+        _current().remove_callback(callback_id)
+
+
+class MDGMessage(object):
+    @staticmethod
+    def addNodeAddedCallback(function, nodeType='dependNode', clientData=None):
+        return _current().add_callback('nodeAdded', lambda node: function(MObject(node), clientData))
+
+    @staticmethod
+    def addNodeRemovedCallback(function, nodeType='dependNode', clientData=None):
+        return _current().add_callback('nodeRemoved', lambda node: function(MObject(node), clientData))
+
+    @staticmethod
+    def addConnectionCallback(function, clientData=None):
+        return _current().add_callback('connection', function)
+
+    @staticmethod
+    def addTimeChangeCallback(function, clientData=None):
+        return _current().add_callback('timeChanged', function)
+
+
+class MNodeMessage(object):
+    @staticmethod
+    def addNameChangedCallback(node, function, clientData=None):
+        return _current().add_callback('nameChanged', lambda n: function(MObject(n), '', clientData))
+
+
+class MDagMessage(object):
+    @staticmethod
+    def addParentAddedCallback(function, clientData=None):
+        return _current().add_callback(
+            'parentAdded', lambda n, p: function(MDagPath.getAPathTo(MObject(n)), None, clientData)
+            )
+
+    @staticmethod
+    def addParentRemovedCallback(function, clientData=None):
+        return _current().add_callback('parentRemoved', function)
+
+
+class MSceneMessage(object):
+    kBeforeNew, kAfterNew, kBeforeOpen, kAfterOpen, kAfterImport, kBeforeSave, kAfterSave = range(7)
+
+    @staticmethod
+    def addCallback(message, function, clientData=None):
+        return _current().add_callback(('scene', message), function)
+
+
+class MEventMessage(object):
+    @staticmethod
+    def addEventCallback(event, function, clientData=None):
+        return _current().add_callback(('event', event), function)
+
+
+class MCommandMessage(object):
+    @staticmethod
+    def addCommandCallback(function, clientData=None):
+        return _current().add_callback('command', function)
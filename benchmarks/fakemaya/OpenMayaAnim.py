@@ -0,0 +1,31 @@
+from . import scene as _scene
+from .OpenMaya import MObject, MObjectArray
+
+
+class MFnAnimCurve(object):
+    kAnimCurveTA, kAnimCurveTL, kAnimCurveTT, kAnimCurveTU = range(4)
+    kTangentGlobal, kTangentFixed, kTangentLinear, kTangentFlat, kTangentSmooth = range(5)
+
+    def __init__(self, obj=None):
+        _scene.current.cost()
+        self._node = obj.node if obj is not None else None
+
+    def object(self):
+        return MObject(self._node)
+
+    def numKeys(self):
+        return len(self._node.keys)
+
+    def addKeys(self, times, values, tangentInType=0, tangentOutType=0, keepExistingKeys=False, change=None):
+        _scene.current.cost()
+        if not keepExistingKeys:
+            self._node.keys.clear()
+        self._node.keys.update((t.value, v) for t, v in zip(times, values))
+
+
+class MAnimUtil(object):
+    @staticmethod
+    def findAnimation(plug):
+        _scene.current.cost()
+        curve = plug._node.anim.get(plug.attr)
+        return MObjectArray([MObject(curve)] if curve is not None else [])
@@ -0,0 +1,10 @@
+class MQtUtil(object):
+    """ no Qt main window outside of maya """
+
+    @staticmethod
+    def mainWindow():
+        return None
+
+    @staticmethod
+    def fullName(pointer):
+        return ''
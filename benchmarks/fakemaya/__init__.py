@@ -0,0 +1,36 @@
+import sys
+import types
+
+from . import scene
+
+MODULES = {
+    'maya.api.OpenMaya': 'OpenMaya',
+    'maya.api.OpenMayaAnim': 'OpenMayaAnim',
+    'maya.OpenMayaUI': 'OpenMayaUI',
+    'maya.cmds': 'cmds',
+    'maya.mel': 'mel',
+    'pymel.all': 'pymel',
+    }
+
+
+def install(fake_scene=None):
+    """ Put the stand-ins in sys.modules in place of maya/pymel, return the scene they talk to """
+    scene.current = fake_scene or scene.Scene()
+    from . import OpenMaya, OpenMayaAnim, OpenMayaUI, cmds, mel, pymel
+    stand_ins = dict(
+        OpenMaya=OpenMaya, OpenMayaAnim=OpenMayaAnim, OpenMayaUI=OpenMayaUI, cmds=cmds.cmds, mel=mel.mel, pymel=pymel.pm
+        )
+    for name in 'maya', 'maya.api', 'pymel':
+        sys.modules.setdefault(name, types.ModuleType(name))
+    for name, stand_in in MODULES.items():
+        sys.modules[name] = stand_ins[stand_in]
+        parent, _, child = name.rpartition('.')
+        setattr(sys.modules[parent], child, stand_ins[stand_in])
+    sys.modules['maya'].api = sys.modules['maya.api']
+    return scene.current
+
+
+def use(fake_scene):
+    """ switch the scene the installed stand-ins talk to """
+    scene.current = fake_scene
+    return fake_scene
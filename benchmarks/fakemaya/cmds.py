@@ -0,0 +1,191 @@
+import math
+
+from . import scene as _scene
+
+
+def _split(name):
+    node, _, attr = name.partition('.')
+    return _scene.current.node(node), attr
+
+
+def _names(args):
+    names = []
+    for arg in args:
+        names.extend(arg if isinstance(arg, (list, tuple)) else [arg])
+    return [str(n) for n in names]
+
+
+def to_ui(attr, value):
+    if attr in _scene.ANGULAR:
+        return math.degrees(value)
+    if attr in _scene.DISTANCE:
+        return value / _scene.LINEAR_UNITS[_scene.current.linear_unit]
+    return value
+
+
+def from_ui(attr, value):
+    if attr in _scene.ANGULAR:
+        return math.radians(value)
+    if attr in _scene.DISTANCE:
+        return value * _scene.LINEAR_UNITS[_scene.current.linear_unit]
+    return value
+
+
+class FakeCmds(object):
+    """ maya.cmds stand-in, commands it doesn't know are no-ops that still pay the call cost """
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            _scene.current.cost()
+            _scene.current.emit('command', name)
+
+        return command
+
+    def _call(self):
+        _scene.current.cost()
+
+    def playbackOptions(self, q=False, **kwargs):
+        self._call()
+        scene = _scene.current
+        if kwargs.get('min') or kwargs.get('minTime'):
+            return scene.playback[0]
+        if kwargs.get('max') or kwargs.get('maxTime'):
+            return scene.playback[1]
+
+    def currentUnit(self, q=False, query=False, linear=None, **kwargs):
+        self._call()
+        if q or query:
+            return _scene.current.linear_unit
+        if linear:
+            _scene.current.linear_unit = linear
+
+    def currentTime(self, *args, **kwargs):
+        self._call()
+        if kwargs.get('q') or kwargs.get('query'):
+            return _scene.current.current_time
+        _scene.current.current_time = float(args[0])
+
+    def getAttr(self, name, **kwargs):
+        self._call()
+        node, attr = _split(name)
+        attr = _scene.attr_name(attr)
+        if attr in _scene.COMPOUNDS:
+            return [tuple(self.getAttr('{}.{}'.format(name.split('.')[0], a)) for a in _scene.COMPOUNDS[attr])]
+        value = _scene.current.value(node, attr, kwargs.get('time'))
+        return to_ui(attr, value)
+
+    def setAttr(self, name, *values, **kwargs):
+        self._call()
+        node, attr = _split(name)
+        attr = _scene.attr_name(attr)
+        names = _scene.COMPOUNDS.get(attr, (attr,))
+        for a, value in zip(names, values):
+            node.attrs[a] = from_ui(a, value)
+            node.motion.pop(a, None)
+
+    def setKeyframe(self, *args, **kwargs):
+        self._call()
+        scene = _scene.current
+        attrs = kwargs.get('at') or kwargs.get('attribute')
+        attrs = attrs if isinstance(attrs, (list, tuple)) else [attrs]
+        frame = float(kwargs.get('t', kwargs.get('time', scene.current_time)))
+        for name in _names(args):
+            node, attr = _split(name)
+            for a in ([attr] if attr else attrs):
+                scene.key(node, a, frame, kwargs.get('v', kwargs.get('value')))
+
+    def cutKey(self, *args, **kwargs):
+        self._call()
+        attrs = kwargs.get('attribute') or kwargs.get('at') or []
+        for name in _names(args):
+            node, attr = _split(name)
+            for a in ([attr] if attr else attrs):
+                _scene.current.cut(node, a)
+
+    def listRelatives(self, name, parent=False, children=False, shapes=False, fullPath=False, **kwargs):
+        self._call()
+        node = _scene.current.node(name)
+        if parent:
+            return [node.parent.name] if node.parent is not None else None
+        return [n.name for n in node.children] or None
+
+    def listConnections(self, name, source=True, destination=True, **kwargs):
+        """ connected node names of a node or plug, None when there's none like maya """
+        self._call()
+        scene = _scene.current
+        source, destination = kwargs.get('s', source), kwargs.get('d', destination)
+        node, attr = _split(name)
+        attr = _scene.attr_name(attr) if attr else None
+        found = []
+        for (dst, dst_attr), sources in list(scene.inputs.items()):
+            for src, src_attr in sources:
+                if source and dst is node and attr in (None, dst_attr):
+                    found.append(src)
+                if destination and src is node and attr in (None, src_attr):
+                    found.append(dst)
+        return [scene.partial_path(n) for n in found] or None
+
+    def parent(self, name, *args, **kwargs):
+        self._call()
+        scene = _scene.current
+        node = scene.node(name)
+        scene.reparent(node, None if kwargs.get('world') else scene.node(args[0]))
+        return [scene.partial_path(node)]
+
+    def ls(self, *args, **kwargs):
+        self._call()
+        scene = _scene.current
+        node_type = kwargs.get('type')
+        nodes = [n for name in _names(args) for n in scene.lookup(name)] if args else list(scene.nodes)
+        if node_type:
+            nodes = [n for n in nodes if n.type == node_type]
+        if kwargs.get('uuid'):
+            return [n.uuid for n in nodes]
+        if kwargs.get('long'):
+            return [scene.full_path(n) for n in nodes]
+        return [scene.partial_path(n) for n in nodes]
+
+    def dgeval(self, *args, **kwargs):
+        """ every evaluated node pays the call cost, like an expression would """
+        scene = _scene.current
+        scene.cost()
+        for name in _names(args):
+            for node in scene.lookup(name):
+                scene.cost()
+                scene.emit('dgeval', node)
+
+    def objExists(self, name):
+        self._call()
+        return bool(_scene.current.lookup(name))
+
+    def delete(self, *args, **kwargs):
+        self._call()
+        for name in _names(args):
+            for node in _scene.current.lookup(name):
+                if node.alive:
+                    _scene.current.delete(node)
+
+    def createNode(self, node_type, name=None, parent=None, **kwargs):
+        self._call()
+        scene = _scene.current
+        node = scene.create(node_type, name, scene.node(parent) if parent else None)
+        scene.emit('nodeAdded', node)
+        return node.name
+
+    def rename(self, name, new_name):
+        self._call()
+        _scene.current.rename(_scene.current.node(name), new_name)
+        return new_name
+
+    def camera(self, name, q=False, startupCamera=False, **kwargs):
+        self._call()
+        return False
+
+    def select(self, *args, **kwargs):
+        self._call()
+        scene = _scene.current
+        nodes = [n for name in _names(args) for n in scene.lookup(name)]
+        scene.selection = scene.selection + nodes if kwargs.get('add') else nodes
+
+
+cmds = FakeCmds()
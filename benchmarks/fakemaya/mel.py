@@ -0,0 +1,15 @@
+from . import scene as _scene
+
+
+class FakeMel(object):
+    """ maya.mel stand-in, evaluates nothing """
+
+    def eval(self, command):
+        _scene.current.cost()
+        _scene.current.emit('command', command.split()[0] if command.strip() else '')
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.eval(name)
+
+
+mel = FakeMel()
@@ -0,0 +1,126 @@
+from . import scene as _scene
+from .cmds import cmds
+from .mel import mel
+
+
+class Attribute(object):
+    def __init__(self, node, attr):
+        self.node = node
+        self.attr = _scene.attr_name(attr)
+
+    def name(self):
+        return '{}.{}'.format(self.node.name(), self.attr)
+
+    def get(self, **kwargs):
+        if self.attr in _scene.COMPOUNDS:
+            return tuple(child.get(**kwargs) for child in self.children())
+        return cmds.getAttr(self.name(), time=kwargs.get('t', kwargs.get('time')))
+
+    def set(self, *values, **kwargs):
+        cmds.setAttr(self.name(), *values)
+
+    def children(self):
+        return [Attribute(self.node, a) for a in _scene.COMPOUNDS.get(self.attr, ())]
+
+    def setLocked(self, locked):
+        _scene.current.cost()
+        getattr(self.node.node.locked, 'add' if locked else 'discard')(self.attr)
+
+    def lock(self):
+        self.setLocked(True)
+
+    def unlock(self):
+        self.setLocked(False)
+
+    def isSettable(self):
+        return self.attr not in self.node.node.locked
+
+    def listConnections(self, **kwargs):
+        return []
+
+    def __str__(self):
+        return self.name()
+
+
+class PyNode(object):
+    def __init__(self, node):
+        _scene.current.cost()
+        if isinstance(node, PyNode):
+            node = node.node
+        self.node = node if isinstance(node, _scene.Node) else _scene.current.node(str(node))
+
+    def __getattr__(self, attr):
+        if attr.startswith('__'):
+            raise AttributeError(attr)
+        return Attribute(self, attr)
+
+    def __eq__(self, other):
+        return isinstance(other, PyNode) and self.node is other.node
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return self.node.hash
+
+    def __str__(self):
+        return self.name()
+
+    def name(self):
+        return _scene.current.partial_path(self.node)
+
+    def longName(self):
+        return _scene.current.full_path(self.node)
+
+    def exists(self):
+        return self.node.alive
+
+    def getParent(self):
+        return PyNode(self.node.parent) if self.node.parent is not None else None
+
+    def getShape(self):
+        shapes = self.getShapes()
+        return shapes[0] if shapes else None
+
+    def getShapes(self):
+        return [PyNode(n) for n in self.node.children if _scene.kShape in n.fns]
+
+    def setParent(self, *args, **kwargs):
+        _scene.current.cost()
+        parent = None if kwargs.get('w') or kwargs.get('world') or not args else PyNode(args[0]).node
+        if parent is not self.node.parent:
+            _scene.current.reparent(self.node, parent)
+
+    def listAttr(self, locked=False, **kwargs):
+        return [Attribute(self, a) for a in sorted(self.node.locked)] if locked else []
+
+
+class FakePymel(object):
+    """ pymel.all stand-in """
+    PyNode = PyNode
+    Attribute = Attribute
+    mel = mel
+
+    def __getattr__(self, name):
+        return getattr(cmds, name)
+
+    def ls(self, *args, **kwargs):
+        scene = _scene.current
+        return [PyNode(n) for n in (scene.nodes if not args else scene.lookup(str(args[0])))
+                if not kwargs.get('type') or n.type == kwargs['type']]
+
+    def cutKey(self, *args, **kwargs):
+        scene = _scene.current
+        scene.cost()
+        for arg in args:
+            if isinstance(arg, Attribute):
+                scene.cut(arg.node.node, arg.attr)
+
+    def setKeyframe(self, node, t=None, at=None, v=None, **kwargs):
+        cmds.setKeyframe(str(node), t=t, at=at, v=v)
+
+    def spaceLocator(self, *args, **kwargs):
+        return PyNode(cmds.createNode('transform', name=kwargs.get('name')))
+
+
+pm = FakePymel()
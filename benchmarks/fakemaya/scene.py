@@ -0,0 +1,314 @@
+import fnmatch
+import itertools
+import math
+import time
+
+wall_clock = getattr(time, 'perf_counter', time.time)
+
+# MFn type ids used by the stand-ins
+kInvalid, kDependencyNode, kDagNode, kTransform, kShape, kCamera, kImagePlane, kExpression, kAnimCurve, kTime = range(10)
+kNumericAttribute, kTypedAttribute, kMatrixAttribute, kUnitAttribute = range(100, 104)
+
+NODE_FNS = {
+    'transform': (kDependencyNode, kDagNode, kTransform),
+    'camera': (kDependencyNode, kDagNode, kShape, kCamera),
+    'imagePlane': (kDependencyNode, kDagNode, kShape, kImagePlane),
+    'expression': (kDependencyNode, kExpression),
+    'time': (kDependencyNode, kTime),
+    'animCurveTL': (kDependencyNode, kAnimCurve),
+    'animCurveTA': (kDependencyNode, kAnimCurve),
+    'animCurveTU': (kDependencyNode, kAnimCurve),
+    }
+DEFAULT_ATTRS = {
+    'transform': dict(tx=0., ty=0., tz=0., rx=0., ry=0., rz=0., sx=1., sy=1., sz=1., rotateOrder=0),
+    'camera': dict(
+        focalLength=35., horizontalFilmAperture=1.417, verticalFilmAperture=0.945, nearClipPlane=0.1,
+        farClipPlane=10000., cameraScale=1.
+        ),
+    'imagePlane': dict(
+        imageName='', useFrameExtension=0, frameExtension=1., depth=100., alphaGain=1., fit=1, displayMode=3,
+        colorSpace='sRGB', displayOnlyIfCurrent=0
+        ),
+    }
+ALIASES = {
+    'translateX': 'tx', 'translateY': 'ty', 'translateZ': 'tz', 'rotateX': 'rx', 'rotateY': 'ry', 'rotateZ': 'rz',
+    'scaleX': 'sx', 'scaleY': 'sy', 'scaleZ': 'sz', 'ro': 'rotateOrder', 'fl': 'focalLength',
+    'hfa': 'horizontalFilmAperture', 'vfa': 'verticalFilmAperture', 'ncp': 'nearClipPlane', 'fcp': 'farClipPlane',
+    }
+COMPOUNDS = {'t': ('tx', 'ty', 'tz'), 'r': ('rx', 'ry', 'rz'), 's': ('sx', 'sy', 'sz')}
+ANGULAR = ('rx', 'ry', 'rz')
+DISTANCE = ('tx', 'ty', 'tz', 'nearClipPlane', 'farClipPlane', 'depth')
+LINEAR_UNITS = {'mm': .1, 'cm': 1., 'm': 100., 'km': 100000., 'in': 2.54, 'ft': 30.48, 'yd': 91.44, 'mi': 160934.4}
+ROTATE_ORDERS = ((0, 1, 2), (1, 2, 0), (2, 0, 1), (0, 2, 1), (1, 0, 2), (2, 1, 0))
+
+current = None  # the scene the stand-in modules talk to
+
+
+def attr_name(name):
+    return ALIASES.get(name, name)
+
+
+class Node(object):
+    _hashes = itertools.count(1)
+
+    def __init__(self, name, node_type, parent=None):
+        self.name = name
+        self.type = node_type
+        self.fns = NODE_FNS.get(node_type, (kDependencyNode,))
+        self.parent = parent
+        self.children = []
+        self.attrs = dict(DEFAULT_ATTRS.get(node_type, {}))
+        self.motion = {}  # attr -> value per frame, procedural animation of the generated scene
+        self.anim = {}  # attr -> animCurve node
+        self.keys = {}  # animCurve only: frame -> value
+        self.locked = set()
+        self.hash = next(self._hashes)
+        self.uuid = 'FAKE-{:012X}'.format(self.hash)
+        self.alive = True
+
+    @property
+    def is_dag(self):
+        return kDagNode in self.fns
+
+    def __repr__(self):
+        return '<Node {} {}>'.format(self.type, self.name)
+
+
+class Scene(object):
+    """ In memory node graph the maya/pymel stand-ins read and write, with a configurable cost per call """
+
+    def __init__(self, latency=0.):
+        self.latency = latency
+        self.calls = 0
+        self.nodes = []
+        self.by_name = {}
+        self.by_uuid = {}
+        self.selection = []
+        self.eval_time = 1.
+        self.current_time = 1.
+        self.playback = [1., 100.]
+        self.linear_unit = 'cm'  # ui unit, values are stored in internal units (cm, radians) like maya
+        self.callbacks = {}  # kind -> {id: function}
+        self.inputs = {}  # (node, attr) -> [(source node, attr)]
+        self.sources = {}  # node -> source nodes of all its inputs
+        self._callback_ids = itertools.count(1)
+
+    # cost model
+    def cost(self):
+        """ every stand-in api/command call goes through here """
+        self.calls += 1
+        if self.latency:
+            end = wall_clock() + self.latency
+            while wall_clock() < end:
+                pass
+
+    # callbacks
+    def add_callback(self, kind, function):
+        callback_id = next(self._callback_ids)
+        self.callbacks.setdefault(kind, {})[callback_id] = function
+        return callback_id
+
+    def remove_callback(self, callback_id):
+        for functions in self.callbacks.values():
+            functions.pop(callback_id, None)
+
+    def emit(self, kind, *args):
+        for function in list(self.callbacks.get(kind, {}).values()):
+            function(*args)
+
+    # graph edits
+    def create(self, node_type, name=None, parent=None):
+        name = name or '{}{}'.format(node_type, len(self.nodes) + 1)
+        node = Node(name, node_type, parent)
+        if parent is not None:
+            parent.children.append(node)
+        self.nodes.append(node)
+        self.by_name.setdefault(name, []).append(node)
+        self.by_uuid[node.uuid] = node
+        return node
+
+    def delete(self, node):
+        for child in list(node.children):
+            self.delete(child)
+        for curve in node.anim.values():
+            curve.alive = False
+        self.emit('nodeRemoved', node)
+        node.alive = False
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        self.nodes.remove(node)
+        self.by_name[node.name].remove(node)
+        for key in [k for k, sources in self.inputs.items() if k[0] is node or any(s[0] is node for s in sources)]:
+            del self.inputs[key]
+        self.sources.pop(node, None)
+        for sources in self.sources.values():
+            if node in sources:
+                sources.remove(node)
+        del self.by_uuid[node.uuid]
+
+    def rename(self, node, name):
+        self.by_name[node.name].remove(node)
+        node.name = name
+        self.by_name.setdefault(name, []).append(node)
+        self.emit('nameChanged', node)
+
+    def reparent(self, node, parent=None):
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        node.parent = parent
+        if parent is not None:
+            parent.children.append(node)
+        self.emit('parentAdded', node, parent)
+
+    def connect(self, source, source_attr, destination, destination_attr):
+        self.inputs.setdefault((destination, destination_attr), []).append((source, source_attr))
+        self.sources.setdefault(destination, []).append(source)
+
+    def upstream(self, node, attr):
+        """ nodes feeding node.attr, depth first, through every input of the nodes found on the way """
+        found, stack = [], [s for s, a in self.inputs.get((node, attr), ())]
+        while stack:
+            source = stack.pop()
+            if source in found:
+                continue
+            found.append(source)
+            stack.extend(self.sources.get(source, ()))
+        return found
+
+    def add_expressions(self, image_planes=0, unrelated=0):
+        """ a frame expression (fed by time1) per imagePlane for the first ones, plus expressions nothing reads """
+        time_node = self.create('time', 'time1')
+        planes = [n for n in self.nodes if n.type == 'imagePlane'][:image_planes]
+        for c, plane in enumerate(planes):
+            expression = self.create('expression', 'frameExpression{}'.format(c + 1))
+            self.connect(time_node, 'outTime', expression, 'time')
+            self.connect(expression, 'output', plane, 'frameExtension')
+        for c in range(unrelated):
+            self.connect(time_node, 'outTime', self.create('expression', 'expression{}'.format(c + 1)), 'time')
+        return self
+
+    def populate(self, cameras=100, image_planes=100, frames=100):
+        """ cameras (transform + shape) under a few groups, image planes spread over the cameras """
+        self.playback = [1., float(frames)]
+        groups = [self.create('transform', 'grp{}'.format(c)) for c in range(max(1, cameras // 50))]
+        shapes = []
+        for c in range(cameras):
+            group = groups[c % len(groups)]
+            tsf = self.create('transform', 'cam{}'.format(c), group)
+            tsf.attrs.update(tx=c * 1., rx=0.1 * (c % 7), ry=0.05 * (c % 5))
+            tsf.motion.update(tx=0.5, tz=-0.25, ry=0.01 * (1 + c % 3))
+            tsf.attrs['rotateOrder'] = c % 6
+            shapes.append(self.create('camera', 'cam{}Shape'.format(c), tsf))
+        for c in range(image_planes):
+            cam = shapes[c % len(shapes)] if shapes else None
+            # duplicate short names on purpose, like imagePlane1 under every camera
+            tsf = self.create('transform', 'imagePlane{}'.format(c // max(1, len(shapes)) + 1), cam)
+            self.create('imagePlane', tsf.name + 'Shape', tsf).camera = cam
+        return self
+
+    # lookups
+    def full_path(self, node):
+        names = []
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return '|' + '|'.join(reversed(names))
+
+    def partial_path(self, node):
+        return node.name if len(self.by_name.get(node.name, ())) == 1 else self.full_path(node)
+
+    def lookup(self, name):
+        """ nodes matching a name, path or wildcard pattern """
+        name = name.split('.')[0]
+        if any(c in name for c in '*?['):
+            return [n for n in self.nodes if fnmatch.fnmatchcase(n.name, name)]
+        if '|' in name:
+            return [n for n in self.by_name.get(name.split('|')[-1], ()) if self.full_path(n) == name]
+        if name.startswith('FAKE-'):
+            return [self.by_uuid[name]] if name in self.by_uuid else []
+        return list(self.by_name.get(name, ()))
+
+    def node(self, name):
+        nodes = self.lookup(name)
+        if not nodes:
+            raise RuntimeError('No object matches name: {}'.format(name))
+        return nodes[0]
+
+    # evaluation
+    def value(self, node, attr, frame=None):
+        attr = attr_name(attr)
+        frame = self.eval_time if frame is None else frame
+        if attr in node.anim:
+            return self._curve_value(node.anim[attr], frame)
+        value = node.attrs.get(attr, 0.)
+        if not isinstance(value, (int, float)):
+            return value  # strings
+        return value + node.motion.get(attr, 0.) * frame
+
+    def _curve_value(self, curve, frame):
+        if frame in curve.keys:
+            return curve.keys[frame]
+        frames = sorted(curve.keys)
+        if frame <= frames[0]:
+            return curve.keys[frames[0]]
+        if frame >= frames[-1]:
+            return curve.keys[frames[-1]]
+        after = next(f for f in frames if f > frame)
+        before = frames[frames.index(after) - 1]
+        weight = (frame - before) / float(after - before)
+        return curve.keys[before] * (1 - weight) + curve.keys[after] * weight
+
+    def local_matrix(self, node, frame=None):
+        if kTransform not in node.fns:
+            return identity()
+        rotate = [self.value(node, a, frame) for a in ANGULAR]
+        matrix = identity()
+        for axis in ROTATE_ORDERS[int(node.attrs.get('rotateOrder', 0))]:
+            matrix = mult(matrix, rotation(axis, rotate[axis]))
+        scale = [self.value(node, a, frame) for a in ('sx', 'sy', 'sz')]
+        for row in range(3):
+            for col in range(3):
+                matrix[row][col] *= scale[row]
+        matrix[3][:3] = [self.value(node, a, frame) for a in ('tx', 'ty', 'tz')]
+        return matrix
+
+    def world_matrix(self, node, frame=None):
+        matrix = self.local_matrix(node, frame)
+        while node.parent is not None:
+            node = node.parent
+            matrix = mult(matrix, self.local_matrix(node, frame))
+        return matrix
+
+    def key(self, node, attr, frame, value=None):
+        """ set a key, creating the animCurve when needed """
+        attr = attr_name(attr)
+        value = self.value(node, attr, frame) if value is None else value
+        if attr not in node.anim:
+            curve_type = 'animCurveTA' if attr in ANGULAR else 'animCurveTL'
+            curve = self.create(curve_type, '{}_{}'.format(node.name, attr))
+            curve.target = (node, attr)
+            node.anim[attr] = curve
+        node.anim[attr].keys[frame] = value
+        return node.anim[attr]
+
+    def cut(self, node, attr):
+        curve = node.anim.pop(attr_name(attr), None)
+        if curve is not None:
+            self.delete(curve)
+
+
+def identity():
+    return [[1. if r == c else 0. for c in range(4)] for r in range(4)]
+
+
+def rotation(axis, angle):
+    """ maya row vector rotation matrix """
+    c, s = math.cos(angle), math.sin(angle)
+    matrix = identity()
+    a, b = [(1, 2), (2, 0), (0, 1)][axis]
+    matrix[a][a], matrix[a][b], matrix[b][a], matrix[b][b] = c, s, -s, c
+    return matrix
+
+
+def mult(m1, m2):
+    return [[sum(m1[r][k] * m2[k][c] for k in range(4)) for c in range(4)] for r in range(4)]
@@ -0,0 +1,448 @@
+import importlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from . import fakemaya
+from .fakemaya import scene as fake_scene
+
+wall_clock = getattr(time, 'perf_counter', time.time)
+
+cases = []  # (name, setup) setup(options) returns the callable to time, or None to skip
+
+
+def case(name):
+    def register(setup):
+        cases.append((name, setup))
+        return setup
+
+    return register
+
+
+def new_scene(options, frames=None):
+    """ fresh fake scene populated from the options, made current """
+    scene = fake_scene.Scene(latency=options.latency).populate(
+        options.cameras, options.image_planes, frames or options.frames
+        )
+    return fakemaya.use(scene)
+
+
+def qt_available():
+    try:
+        importlib.import_module('PySide2.QtWidgets')
+        importlib.import_module('shiboken2')
+    except ImportError:
+        return False
+    return True
+
+
+def camera_transforms(scene, count):
+    return [scene.full_path(n) for n in scene.nodes if n.type == 'transform' and n.name.startswith('cam')][:count]
+
+
+def max_world_error(scene, paths, reference, frames):
+    """ biggest difference between the world matrices now and the reference sampled before """
+    error = 0.
+    for path, matrices in zip(paths, reference):
+        node = scene.node(path.split('|')[-1])
+        for frame, before in zip(frames, matrices):
+            after = scene.world_matrix(node, frame)
+            error = max(error, max(abs(a - b) for ra, rb in zip(after, before) for a, b in zip(ra, rb)))
+    return error
+
+
+def sample_reference(scene, paths, frames):
+    return [[scene.world_matrix(scene.node(p.split('|')[-1]), f) for f in frames] for p in paths]
+
+
+@case('main.api_ls cameras')
+def api_ls_cameras(options):
+    from pail.crux import main
+    new_scene(options)
+    return lambda: main.api_ls('handle', obj_type=fake_scene.kCamera)
+
+
+@case('main.api_ls imagePlanes')
+def api_ls_image_planes(options):
+    from pail.crux import main
+    new_scene(options)
+    return lambda: main.api_ls('mobj', obj_type=fake_scene.kImagePlane)
+
+
+@case('main.mobj2 fullPath+shortName')
+def mobj2_uncached(options):
+    from pail.crux import main
+    new_scene(options)
+    handles = main.api_ls('handle', obj_type=fake_scene.kCamera)
+    return lambda: (main.mobj2(handles, 'fullPath'), main.mobj2(handles, 'shortName'))
+
+
+@case('main.mobj2 fullPath+shortName cached')
+def mobj2_cached(options):
+    from pail.crux import main
+    new_scene(options)
+    handles = main.api_ls('handle', obj_type=fake_scene.kCamera)
+    main.enable_cache('benchmark')
+    main.mobj2(handles, 'fullPath')
+    main.mobj2(handles, 'shortName')
+
+    def run():
+        return main.mobj2(handles, 'fullPath'), main.mobj2(handles, 'shortName')
+
+    run.teardown = lambda: main.disable_cache('benchmark')
+    return run
+
+
+@case('main.get_depend_nodes')
+def get_depend_nodes(options):
+    from pail.crux import main
+    scene = new_scene(options)
+    names = [n.name for n in scene.nodes if n.type == 'camera']
+    return lambda: main.get_depend_nodes(names)
+
+
+@case('cameraman.ListWidget populate')
+def list_widget_populate(options):
+    if not qt_available():
+        return None
+    from PySide2 import QtWidgets
+    from pail.crux import main
+    from pail.workbox import cameraman
+    new_scene(options)
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    parent = QtWidgets.QWidget()
+    QtWidgets.QVBoxLayout(parent)
+    handles = main.api_ls('handle', obj_type=fake_scene.kCamera)
+
+    def run():
+        widget = cameraman.ListWidget(parent)
+        for handle in handles:
+            widget.add(handle)
+        return widget, app
+
+    return run
+
+
+@case('cameraman.imagePlane_to_pynode')
+def image_plane_to_pynode(options):
+    if not qt_available():
+        return None
+    from pail.crux import main
+    from pail.workbox import cameraman
+    new_scene(options)
+    handles = main.api_ls('handle', obj_type=fake_scene.kImagePlane)[:100]
+    return lambda: [cameraman.imagePlane_to_pynode(handle) for handle in handles]
+
+
+@case('transform.bake_to_world')
+def transform_bake(options):
+    import pymel.all as pm
+    from pail.crux import transform
+    scene = new_scene(options, options.bake_frames)
+    path = camera_transforms(scene, 1)
+    frames = list(range(1, options.bake_frames + 1))
+    reference = sample_reference(scene, path, frames)
+
+    def run():
+        transform.bake_to_world(pm.PyNode(path[0]))
+
+    run.check = lambda: max_world_error(scene, path, reference, frames)
+
+    return run
+
+
+@case('camera.bake_to_world2 context')
+def camera_bake_context(options):
+    from pail.crux import camera
+    scene = new_scene(options, options.bake_frames)
+    path = camera_transforms(scene, 1)
+    frames = list(range(1, options.bake_frames + 1))
+    reference = sample_reference(scene, path, frames)
+
+    def run():
+        camera.bake_to_world2(path[0], reset_scale=False, mode='context')
+
+    run.check = lambda: max_world_error(scene, path, reference, frames)
+
+    return run
+
+
+@case('camera.bake_many_to_world')
+def camera_bake_many(options):
+    from pail.crux import camera
+    scene = new_scene(options, options.bake_frames)
+    paths = camera_transforms(scene, options.bake_cameras)
+    frames = list(range(1, options.bake_frames + 1))
+    reference = sample_reference(scene, paths, frames)
+
+    def run():
+        camera.bake_many_to_world(paths, reset_scale=False)
+
+    run.check = lambda: max_world_error(scene, paths, reference, frames)
+
+    return run
+
+
+@case('camera.export_animation + import_animation')
+def camera_animation_round_trip(options):
+    import maya.cmds as cmds
+    from pail.crux import camera
+    scene = new_scene(options, options.bake_frames)
+    paths = camera_transforms(scene, options.bake_cameras)
+    frames = list(range(1, options.bake_frames + 1))
+    reference = sample_reference(scene, paths, frames)
+    handle, path = tempfile.mkstemp(suffix='.npz')
+    os.close(handle)
+    # the imported cameras live under an animated rig they have to stay in
+    rig = cmds.createNode('transform', name='importRig')
+    scene.node(rig).attrs.update(tx=10., ry=0.3, sx=2., sy=2., sz=2.)
+    scene.node(rig).motion.update(ty=0.1, rx=0.01)
+    targets = []
+    for c in range(len(paths)):
+        targets.append(cmds.createNode('transform', name='imported{}'.format(c), parent=rig))
+        cmds.createNode('camera', name='imported{}Shape'.format(c), parent=targets[-1])
+
+    def run():
+        camera.export_animation(paths, path)
+        camera.import_animation(path, targets)
+
+    run.check = lambda: max_world_error(scene, targets, reference, frames) + sum(
+        scene.node(target).parent is not scene.node(rig) for target in targets
+        )
+    run.teardown = lambda: os.remove(path)
+    return run
+
+
+def import_chan(options, linear_unit):
+    """ .chan keyed on an unparented camera, the file in the scene's linear unit """
+    import numpy as np
+    from pail.crux import bake, camera
+    scene = new_scene(options, options.bake_frames)
+    scene.linear_unit = linear_unit
+    path = camera_transforms(scene, 1)[0]
+    node = scene.node(path.split('|')[-1])
+    scene.reparent(node, None)
+    frames = np.arange(1, options.bake_frames + 1, dtype=np.float64)
+    rows = np.column_stack(
+        [frames, frames * 0.1, frames * 0.2, frames * 0.3, frames, -frames, frames * 2, np.full(len(frames), 40.)]
+        )
+    handle, chan = tempfile.mkstemp(suffix='.chan')
+    os.close(handle)
+    np.savetxt(chan, rows, fmt='%.10f', delimiter='\t')
+    expected = bake.compose_matrices(rows[:, 1:4] * fake_scene.LINEAR_UNITS[linear_unit], np.radians(rows[:, 4:7]), 2)
+    run = lambda: camera.import_chan(scene.full_path(node), chan)
+    run.check = lambda: max(
+        abs(np.array(scene.world_matrix(node, frame)) - expected[c]).max() for c, frame in enumerate(frames.tolist())
+        )
+    run.teardown = lambda: os.remove(chan)
+    return run
+
+
+@case('camera.import_chan')
+def camera_import_chan(options):
+    return import_chan(options, 'cm')
+
+
+@case('camera.import_chan meter scene')
+def camera_import_chan_meters(options):
+    return import_chan(options, 'm')
+
+
+@case('drag 200 ticks pymel set')
+def drag_pymel(options):
+    import pymel.all as pm
+    from pail.crux import camera
+    scene = new_scene(options)
+    name = next(n.name for n in scene.nodes if n.type == 'camera')
+
+    def run():
+        for tick in range(200):
+            cam = pm.PyNode(name)  # the old per tick PyNode rebuild
+            camera.set_clip_plane(cam, 0.1 + tick * 0.01, 10000.)
+
+    return run
+
+
+@case('drag 200 ticks plugs.PlugDrag')
+def drag_plugs(options):
+    from pail.crux import main, plugs
+    scene = new_scene(options)
+    node = next(n for n in scene.nodes if n.type == 'camera')
+    handle = main.mobj2(node.name, 'handle')
+    cache, drag = plugs.PlugCache(), plugs.PlugDrag()
+
+    def run():
+        for tick in range(200):
+            drag.set(cache.get_many(handle, ['nearClipPlane', 'farClipPlane']), [0.1 + tick * 0.01, 10000.])
+        drag.end()
+
+    run.check = lambda: abs(node.attrs['nearClipPlane'] - (0.1 + 199 * 0.01))
+    return run
+
+
+def image_plane_names(scene, count):
+    return [scene.full_path(n) for n in scene.nodes if n.type == 'imagePlane'][:count]
+
+
+def count_commands(scene, name):
+    """ count a command through the fake's command callback, returns the counter list """
+    counter = []
+    scene.add_callback('command', lambda command: counter.append(1) if command == name else None)
+    return counter
+
+
+def reload_check(scene, resets, expected_resets, evaluated):
+    """ the viewport resets, frame expressions left (should be none) and whether time1 got evaluated """
+    expressions = [n for n in scene.nodes if n.type == 'expression' and n.name.startswith('frameExpression')]
+    return abs(len(resets) - expected_resets) + len(expressions) + ('time' not in evaluated)
+
+
+@case('reload 40 image sequences one by one')
+def reload_single(options):
+    from pail.crux import camera
+    scene = new_scene(options).add_expressions(40, options.expressions)
+    paths = image_plane_names(scene, 40)
+    resets = count_commands(scene, 'ogs')
+    evaluated = []
+    scene.add_callback('dgeval', lambda node: evaluated.append(node.type))
+
+    def run():
+        for path in paths:
+            camera.reload_image_sequence(path)
+
+    run.check = lambda: reload_check(scene, resets, 40, evaluated)
+    return run
+
+
+@case('reload 40 image sequences batch')
+def reload_batch(options):
+    from pail.crux import camera
+    scene = new_scene(options).add_expressions(40, options.expressions)
+    paths = image_plane_names(scene, 40)
+    resets = count_commands(scene, 'ogs')
+    evaluated = []
+    scene.add_callback('dgeval', lambda node: evaluated.append(node.type))
+    run = lambda: camera.reload_image_sequences(paths)
+    run.check = lambda: reload_check(scene, resets, 1, evaluated)
+    return run
+
+
+@case('evaluate_expression whole scene')
+def evaluate_all(options):
+    from pail.crux import util
+    scene = new_scene(options).add_expressions(40, options.expressions)
+    return lambda: util.evaluate_expression()
+
+
+@case('evaluate_expression 40 frameExtensions')
+def evaluate_upstream(options):
+    from pail.crux import util
+    scene = new_scene(options).add_expressions(40, options.expressions)
+    paths = image_plane_names(scene, 40)
+    run = lambda: util.evaluate_expression([path + '.frameExtension' for path in paths])
+    evaluated = []
+    scene.add_callback('dgeval', lambda node: evaluated.append(node.type))
+    # the 40 frame expressions and time1, nothing else
+    run.check = lambda: abs(len(evaluated) - 41) + evaluated.count('expression') - 40
+    return run
+
+
+@case('import pail.crux.camera warm')
+def import_camera_warm(options):
+    new_scene(options)
+
+    def run():
+        for name in [n for n in sys.modules if n == 'pail' or n.startswith('pail.')]:
+            del sys.modules[name]
+        importlib.import_module('pail.crux.camera')
+
+    return run
+
+
+@case('import pail.crux.camera cold')
+def import_camera_cold(options):
+    """ fresh interpreter, so numpy and the rest are really loaded (or not) """
+    new_scene(options)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([root, os.path.join(root, 'src')]))
+    script = (
+        'from benchmarks import fakemaya; fakemaya.install(); import pail.crux.camera, sys; '
+        'assert "numpy" not in sys.modules, "numpy imported eagerly"'
+        )
+    return lambda: subprocess.check_call([sys.executable, '-c', script], env=env)
+
+
+def write_ma(path, cameras, meshes, points=400, linear_unit='centimeter'):
+    """ .ma of cameras with an imagePlane each, among meshes written the way maya writes vertex lists """
+    row = '\t\t ' + ' '.join('{:.1f}'.format(c * 0.1) for c in range(40)) + '\n'
+    with open(path, 'w') as f:
+        f.write('//Maya ASCII 2022 scene\ncurrentUnit -l {} -a degree -t film;\n'.format(linear_unit))
+        for c in range(meshes):
+            f.write('createNode transform -n "geo{0}";\ncreateNode mesh -n "geoShape{0}" -p "geo{0}";\n'.format(c))
+            f.write('\tsetAttr -s {0} ".vt[0:{1}]"\n'.format(points, points - 1) + row * (points * 3 // 40) + '\t\t;\n')
+        for c in range(cameras):
+            f.write('createNode transform -n "cam{0}";\n\tsetAttr ".ro" 2;\n'.format(c))
+            f.write('createNode camera -n "camShape{0}" -p "cam{0}";\n\tsetAttr ".ncp" 1;\n'.format(c))
+            f.write('createNode imagePlane -n "ipShape{0}" -p "camShape{0}";\n'.format(c))
+            f.write('\tsetAttr ".imn" -type "string" "/plates/{0}/plate.1001.exr";\n'.format(c))
+        for c in range(cameras):
+            f.write('connectAttr "ipShape{0}.msg" "camShape{0}.ip" -na;\n'.format(c))
+
+
+@case('ma.records')
+def ma_records(options):
+    from pail.crux import ma
+    new_scene(options)
+    handle, path = tempfile.mkstemp(suffix='.ma')
+    os.close(handle)
+    write_ma(path, options.cameras, options.cameras * 10)
+    found = []
+    run = lambda: found.extend(ma.records(path))
+    run.check = lambda: abs(len(found) - options.cameras * 2) + sum(not v.get('cameras', 1) for t, v in found)
+    run.teardown = lambda: os.remove(path)
+    return run
+
+
+@case('ma.records meter scene')
+def ma_records_meters(options):
+    """ the defaults the file leaves out come back in meters like the values it writes """
+    from pail.crux import ma
+    new_scene(options)
+    handle, path = tempfile.mkstemp(suffix='.ma')
+    os.close(handle)
+    write_ma(path, 10, 0, linear_unit='meter')
+    found = []
+    run = lambda: found.extend(ma.records(path))
+    expected = {'nearClipPlane': 1., 'farClipPlane': 100., 'depth': 1.}
+    run.check = lambda: len(found) != 20 or max(
+        abs(values[attr] - expected[attr]) for node_type, values in found for attr in expected if attr in values
+        )
+    run.teardown = lambda: os.remove(path)
+    return run
+
+
+def run_case(setup, options):
+    """ time a case, a fresh setup per repeat, return None when it's skipped """
+    timings, errors, calls = [], [], []
+    for _ in range(options.repeat):
+        run = setup(options)
+        if run is None:
+            return None
+        scene = fake_scene.current
+        scene.calls = 0
+        start = wall_clock()
+        try:
+            run()
+        finally:
+            timings.append(wall_clock() - start)
+            getattr(run, 'teardown', lambda: None)()
+        calls.append(scene.calls)
+        if hasattr(run, 'check'):
+            errors.append(run.check())
+    timings.sort()
+    result = {'min': timings[0], 'median': timings[len(timings) // 2], 'calls': calls[0]}
+    if errors:
+        result['max_error'] = max(errors)
+    return result
@@ -0,0 +1,39 @@
+# Attributes cameraman shows, shared by the UI, the inventory and the .ma reader (no maya import here).
+# (long name, short name as written in .ma files, kind, maya default), a .ma only has the non default values.
+CAMERA = (
+    ('cameraScale', 'cs', 'double', 1.),
+    ('nearClipPlane', 'ncp', 'distance', 0.1),
+    ('farClipPlane', 'fcp', 'distance', 10000.),
+    )
+TRANSFORM = (
+    ('rotateOrder', 'ro', 'enum', 0),
+    )
+IMAGE_PLANE = (
+    ('imageName', 'imn', 'string', ''),
+    ('colorSpace', 'cs', 'string', 'sRGB'),
+    ('fit', 'f', 'enum', 1),
+    ('displayMode', 'dm', 'enum', 3),
+    ('depth', 'd', 'distance', 100.),
+    ('alphaGain', 'ag', 'double', 1.),
+    ('useFrameExtension', 'ufe', 'bool', False),
+    )
+
+ROTATE_ORDERS = 'xyz', 'yzx', 'zxy', 'xzy', 'yxz', 'zyx'
+FITS = 'Fill', 'Best', 'Horizontal', 'Vertical', 'To Size'
+DISPLAY_MODES = 'None', 'Outline', 'RGB', 'RGBA', 'Luminance', 'Alpha'
+# centimeters per linear unit, by the names currentUnit takes (the defaults above are in cm)
+LINEAR_UNITS = {
+    'millimeter': .1, 'mm': .1, 'centimeter': 1., 'cm': 1., 'meter': 100., 'm': 100., 'kilometer': 100000.,
+    'km': 100000., 'inch': 2.54, 'in': 2.54, 'foot': 30.48, 'ft': 30.48, 'yard': 91.44, 'yd': 91.44,
+    'mile': 160934.4, 'mi': 160934.4,
+    }
+
+
+def names(table):
+    return [attr[0] for attr in table]
+
+
+def defaults(table, linear_unit='centimeter'):
+    """ maya's defaults, distances in the given linear unit """
+    scale = 1. / LINEAR_UNITS[linear_unit]
+    return dict((attr[0], attr[3] * scale if attr[2] == 'distance' else attr[3]) for attr in table)
@@ -0,0 +1,144 @@
+import maya.cmds as cmds
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as oma
+
+from . import main
+from .lazy import LazyModule
+
+np = LazyModule('numpy')
+
+# maya rotateOrder enum -> axis applied first, second, third
+ROTATE_ORDERS = ((0, 1, 2), (1, 2, 0), (2, 0, 1), (0, 2, 1), (1, 0, 2), (2, 1, 0))
+
+
+def frame_range(start=None, end=None):
+    """ frames of the playback range (or the given range) as a list of ints """
+    if start is None:
+        start = cmds.playbackOptions(q=1, min=1)
+    if end is None:
+        end = cmds.playbackOptions(q=1, max=1)
+    return list(range(int(start), int(end) + 1))
+
+
+def world_matrix_plug(obj):
+    """ worldMatrix element plug of the instance the given dag object points to """
+    dag_path = main.mobj2(obj, 'dagPath')
+    plug = om2.MFnDagNode(dag_path).findPlug('worldMatrix', False)
+    return plug.elementByLogicalIndex(dag_path.instanceNumber())
+
+
+def is_matrix_plug(plug):
+    """ as title """
+    attr = plug.attribute()
+    if attr.hasFn(om2.MFn.kMatrixAttribute):
+        return True
+    return attr.hasFn(om2.MFn.kTypedAttribute) and om2.MFnTypedAttribute(attr).attrType() == om2.MFnData.kMatrix
+
+
+def _read_matrix(plug, *context):
+    return list(om2.MFnMatrixData(plug.asMObject(*context)).matrix())
+
+
+def _read_double(plug, *context):
+    return plug.asDouble(*context)
+
+
+def sample_plugs(plugs, frames):
+    """
+    Walk the frames once and read every plug on each frame, evaluating only the plugs' upstream graph.
+    Return one numpy array per plug, (len(frames), 4, 4) for matrix plugs and (len(frames),) for the rest.
+    """
+    readers = [_read_matrix if is_matrix_plug(plug) else _read_double for plug in plugs]
+    samples = [[] for _ in plugs]
+    guard = getattr(om2, 'MDGContextGuard', None)
+    unit = om2.MTime.uiUnit()
+    for frame in frames:
+        context = om2.MDGContext(om2.MTime(frame, unit))
+        if guard:
+            with guard(context):
+                for c, plug in enumerate(plugs):
+                    samples[c].append(readers[c](plug))
+        else:
+            for c, plug in enumerate(plugs):
+                samples[c].append(readers[c](plug, context))
+    result = []
+    for reader, sample in zip(readers, samples):
+        sample = np.array(sample, dtype=np.float64)
+        result.append(sample.reshape(len(frames), 4, 4) if reader is _read_matrix else sample)
+    return result
+
+
+def sample_world_matrices(objs, frames):
+    """ world matrices of given dag objects over frames, shaped (len(objs), len(frames), 4, 4) """
+    return np.array(sample_plugs([world_matrix_plug(obj) for obj in objs], frames))
+
+
+def decompose_matrices(matrices, rotate_order=0):
+    """
+    Decompose (..., 4, 4) maya (row vector) matrices into translate and euler rotate arrays.
+    Rotate is returned in radians for the given rotateOrder, unwrapped along the frame axis.
+    """
+    matrices = np.asarray(matrices, dtype=np.float64)
+    translate = matrices[..., 3, :3].copy()
+    rows = matrices[..., :3, :3]
+    rows = rows / np.linalg.norm(rows, axis=-1)[..., np.newaxis]  # strip scale
+    col = np.swapaxes(rows, -1, -2)  # column vector form, R = Rk * Rj * Ri
+    i, j, k = ROTATE_ORDERS[int(rotate_order)]
+    sign = 1. if (j - i) % 3 == 1 else -1.
+
+    sin_j = np.clip(-sign * col[..., k, i], -1., 1.)
+    angle_j = np.arcsin(sin_j)
+    gimbal = np.abs(sin_j) > 1. - 1e-9
+    angle_i = np.where(
+        gimbal, np.arctan2(-sign * col[..., j, k], col[..., j, j]), np.arctan2(sign * col[..., k, j], col[..., k, k])
+        )
+    angle_k = np.where(gimbal, 0., np.arctan2(sign * col[..., j, i], col[..., i, i]))
+
+    rotate = np.empty(translate.shape, dtype=np.float64)
+    rotate[..., i], rotate[..., j], rotate[..., k] = angle_i, angle_j, angle_k
+    if rotate.ndim > 1 and rotate.shape[-2] > 1:
+        rotate = np.unwrap(rotate, axis=-2)
+    return translate, rotate
+
+
+def compose_matrices(translate, rotate, rotate_order=0):
+    """ (..., 4, 4) maya (row vector) matrices of translate and euler rotate (radians), the inverse of decompose """
+    translate, rotate = np.asarray(translate, dtype=np.float64), np.asarray(rotate, dtype=np.float64)
+    cos, sin = np.cos(rotate), np.sin(rotate)
+    axes = []
+    for axis in range(3):
+        a, b = (axis + 1) % 3, (axis + 2) % 3
+        r = np.zeros(rotate.shape[:-1] + (3, 3))
+        r[..., axis, axis] = 1.
+        r[..., a, a], r[..., a, b] = cos[..., axis], -sin[..., axis]
+        r[..., b, a], r[..., b, b] = sin[..., axis], cos[..., axis]
+        axes.append(r)
+    i, j, k = ROTATE_ORDERS[int(rotate_order)]
+    matrices = np.zeros(rotate.shape[:-1] + (4, 4))
+    matrices[..., :3, :3] = np.swapaxes(np.matmul(axes[k], np.matmul(axes[j], axes[i])), -1, -2)
+    matrices[..., 3, :3] = translate
+    matrices[..., 3, 3] = 1.
+    return matrices
+
+
+def write_curves(node, channels, frames, values):
+    """
+    Replace the animation of given channels with one bulk key write per channel.
+    values is shaped (len(frames), len(channels)), in internal units (cm, radians).
+    """
+    fn = main.mobj2(node, 'fn')
+    unit = om2.MTime.uiUnit()
+    times = om2.MTimeArray([om2.MTime(f, unit) for f in frames])
+    values = np.asarray(values, dtype=np.float64)
+    curves = []
+    for c, channel in enumerate(channels):
+        # seed through cmds so the curve node creation stays on the undo queue
+        cmds.setKeyframe(main.mobj2(node, 'fullPath'), at=channel, t=frames[0])
+        plug = fn.findPlug(channel, False)
+        curve = oma.MFnAnimCurve(oma.MAnimUtil.findAnimation(plug)[0])
+        curve.addKeys(
+            times, om2.MDoubleArray(values[:, c].tolist()), oma.MFnAnimCurve.kTangentLinear,
+            oma.MFnAnimCurve.kTangentLinear, False
+            )
+        curves.append(curve.object())
+    return curves
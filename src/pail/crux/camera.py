@@ -1,13 +1,25 @@
+import logging
 import os
-from six import integer_types
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+from six import integer_types, string_types
 
 import maya.cmds as cmds
-import maya.mel as mel
-import pymel.all as pm
+import maya.api.OpenMaya as om2
 
-from . import util
+from . import attrs, bake, main, plugs, proxy, sequence, transform, util
+from .lazy import LazyModule
 from .util import undo_dec
 
+np = LazyModule('numpy')
+mel = LazyModule('maya.mel')
+pm = LazyModule('pymel.all')
+utils = LazyModule('maya.utils')
+logger = logging.getLogger(__name__)
+
+BAKE_ATTRS = ["tx", "ty", "tz", "rx", "ry", "rz"]
+
 
 @undo_dec
 def set_clip_plane(cam, near, far):
@@ -16,19 +28,41 @@ def set_clip_plane(cam, near, far):
     return cam, near, far
 
 
+def image_plane_paths(imagePlanes):
+    """ full paths of imagePlanes given as PyNodes, names, MObjects or handles """
+    paths = []
+    for imagePlane in imagePlanes:
+        if hasattr(imagePlane, 'longName'):
+            paths.append(imagePlane.longName())
+        elif isinstance(imagePlane, string_types):
+            paths.append(imagePlane)
+        else:
+            paths.append(main.mobj2(imagePlane, 'fullPath'))
+    return paths
+
+
 def set_image_name(imagePlane, text):
-    if os.path.isfile(text):
-        imagePlane.useFrameExtension.set(0)
-        imagePlane.imageName.set(text)
-        imagePlane.useFrameExtension.set(1)
-        return True
-    elif text == '':
-        imagePlane.imageName.set(text)
-        imagePlane.useFrameExtension.set(0)
-        return True
-    else:
+    return set_image_names([imagePlane], text, refresh=False)
+
+
+@undo_dec
+def set_image_names(imagePlanes, text, refresh=True, check=True):
+    """
+    Point every imagePlane to the same image, with one viewport reset for the batch.
+    check=False skips the file check, for paths that come from a directory listing.
+    """
+    if text and check and not os.path.isfile(text):
         return False
-    # reload_image_sequence(imagePlane)
+    paths = image_plane_paths(imagePlanes)
+    for path in paths:
+        proxy_planes.pop(path, None)
+        cmds.setAttr(path + '.useFrameExtension', 0)
+        cmds.setAttr(path + '.imageName', text, type='string')
+        if text:
+            cmds.setAttr(path + '.useFrameExtension', 1)
+    if refresh and paths:
+        mel.eval('ogs -reset')
+    return True
 
 
 def create_new_cam(panel, at_lookAt=True):
@@ -62,33 +96,335 @@ def lock_cam_tsf(cam, lock_it=True):
     camShape.lsr.setLocked(lock_it)
 
 
-@undo_dec
 def reload_image_sequence(imagePlane):
-    imagePlane.frameExtension.unlock()
-    pm.delete(imagePlane.frameExtension.listConnections())
-    cmds.setAttr(imagePlane.name() + '.useFrameExtension', 1)
-    # pm.mel.eval(imagePlane.name())
-    pm.mel.eval('ogs -reset')
-    util.evaluate_expression()
+    return reload_image_sequences([imagePlane])
+
+
+@undo_dec
+def reload_image_sequences(imagePlanes):
+    """
+    Delete the frame expressions of the imagePlanes and turn useFrameExtension back on, then one viewport reset
+    and an evaluation of what drives their frameExtension now (the drivers Maya re-created), the time nodes when
+    a plane is left without one. Return the names of the evaluated nodes.
+    """
+    paths = image_plane_paths(imagePlanes)
+    if not paths:
+        return []
+    expressions = set()
+    for path in paths:
+        cmds.setAttr(path + '.frameExtension', lock=False)
+        expressions.update(cmds.listConnections(path + '.frameExtension', source=True, destination=False) or [])
+    if expressions:
+        cmds.delete(list(expressions))
+    for path in paths:
+        cmds.setAttr(path + '.useFrameExtension', 1)
+    mel.eval('ogs -reset')
+    driven = [
+        path + '.frameExtension' for path in paths
+        if cmds.listConnections(path + '.frameExtension', source=True, destination=False)
+        ]
+    names = util.evaluate_expression(driven) if driven else []
+    if len(driven) < len(paths):
+        time_nodes = [name for name in cmds.ls(type='time') if name not in names]
+        if time_nodes:
+            cmds.dgeval(time_nodes)
+        names += time_nodes
+    return names
 
 
 def set_colorspace(imagePlane, colorspace):
-    pm.mel.eval("colorManagementPrefs -edit -cmEnabled 1")
-    imagePlane.colorSpace.set(colorspace)
+    set_colorspaces([imagePlane], colorspace)
+
+
+@undo_dec
+def set_colorspaces(imagePlanes, colorspace):
+    mel.eval("colorManagementPrefs -edit -cmEnabled 1")
+    for path in image_plane_paths(imagePlanes):
+        cmds.setAttr(path + '.colorSpace', colorspace, type='string')
 
 
 def set_colorspace_display_mode(imagePlane, mode):
+    set_colorspace_display_modes([imagePlane], mode)
+
+
+@undo_dec
+def set_colorspace_display_modes(imagePlanes, mode):
     if not isinstance(mode, integer_types):
         mode = {'None': 0, 'RGB': 2, 'RGBA': 3}[mode]
-    imagePlane.displayMode.set(mode)
+    for path in image_plane_paths(imagePlanes):
+        cmds.setAttr(path + '.displayMode', mode)
+
+
+def swap_image_name(path, image):
+    """ point an imagePlane to a cache or proxy file without going through the undo queue """
+    modifier = om2.MDGModifier()
+    modifier.newPlugValueString(main.get_plugs([path + '.imageName'])[0], image)
+    modifier.doIt()
+
+
+class SequenceManager(object):
+    """
+    Scrub imagePlanes from local copies of their plates (see sequence.FrameCache).
+    attach() scans the plane's sequence once and points the plane to the cache directory,
+    the frames around the plane's frameExtension are then prefetched on every time change.
+    The planes are swapped outside of the undo queue and point to their plates while the scene is saved.
+    """
+
+    def __init__(self, ahead=24, behind=4, cache_root=None, max_bytes=8 << 30, workers=4):
+        self.ahead = ahead
+        self.behind = behind
+        self.cache_root = cache_root
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self.planes = {}  # imagePlane full path -> (original imageName, FrameCache)
+        self.callback_ids = []
+
+    def attach(self, imagePlane):
+        """ return the plane's FrameCache, None if its image isn't part of a sequence or the cache can't link """
+        path = image_plane_paths([imagePlane])[0]
+        if path in self.planes:
+            return self.planes[path][1]
+        image = cmds.getAttr(path + '.imageName')
+        plate = sequence.find_sequence(image) if image and os.path.isfile(image) else None
+        if plate is None:
+            return None
+        cache = sequence.FrameCache(plate, self.cache_root, self.max_bytes, self.workers)
+        if not cache.linkable:
+            # the frames not copied yet wouldn't exist in the cache directory
+            cache.close()
+            logger.warning('%s: no symlinks in %s, the plane stays on its plate', path, cache.directory)
+            return None
+        self.planes[path] = (image, cache)
+        local = self.local_image(path)
+        cache.link(int(sequence.FRAME_RE.match(os.path.basename(local)).group('frame')))  # the rest by the pool
+        swap_image_name(path, local)
+        if not self.callback_ids:
+            self.callback_ids = [
+                om2.MDGMessage.addTimeChangeCallback(self._time_changed),
+                om2.MSceneMessage.addCallback(om2.MSceneMessage.kBeforeSave, self._before_save),
+                om2.MSceneMessage.addCallback(om2.MSceneMessage.kAfterSave, self._after_save),
+                ]
+        self.prefetch(path)
+        return cache
+
+    def local_image(self, path):
+        """ the cache file of an attached plane's original imageName """
+        image, cache = self.planes[path]
+        return cache.local_path(int(sequence.FRAME_RE.match(os.path.basename(image)).group('frame')))
+
+    def detach(self, imagePlane=None):
+        """ point the plane (every plane when None) back to its plate, the copies stay on disk for next time """
+        paths = list(self.planes) if imagePlane is None else image_plane_paths([imagePlane])
+        for path in paths:
+            if path not in self.planes:
+                continue
+            image, cache = self.planes.pop(path)
+            cache.close()
+            if cmds.objExists(path):
+                swap_image_name(path, image)
+        if not self.planes:
+            for callback_id in self.callback_ids:
+                om2.MMessage.removeCallback(callback_id)
+            self.callback_ids = []
+
+    def prefetch(self, path=None):
+        """ queue the frames around the current frameExtension, nearest first """
+        for plane in [path] if path else list(self.planes):
+            if not cmds.objExists(plane):
+                self.planes.pop(plane)[1].close()
+                continue
+            frame = int(round(cmds.getAttr(plane + '.frameExtension')))
+            frames = [frame] + [frame + c for c in range(1, self.ahead + 1)]
+            frames += [frame - c for c in range(1, self.behind + 1)]
+            self.planes[plane][1].prefetch(frames)
+
+    def _time_changed(self, *args):
+        self.prefetch()
+
+    def _before_save(self, *args):
+        """ the scene keeps the plates, not the temp cache files """
+        for path, (image, cache) in self.planes.items():
+            if cmds.objExists(path):
+                swap_image_name(path, image)
+
+    def _after_save(self, *args):
+        for path in self.planes:
+            if cmds.objExists(path):
+                swap_image_name(path, self.local_image(path))
+
+
+sequence_manager = SequenceManager()
+
+proxy_planes = {}  # imagePlane full path -> (full resolution imageName, proxy imageName) while it shows its proxy
+proxy_callback_ids = []
+
+
+def use_proxy(imagePlanes, scale='half', done=None):
+    """
+    Build the missing or stale proxies of the imagePlanes' plates in a background thread (see proxy.ProxyBuilder),
+    then point the planes to them. done(results) is called on the main thread once the planes are switched,
+    results: {imagePlane path: build result, or the error message}. A plane with failed frames stays on its
+    plate and gets an error message. Like SequenceManager, the planes point to their plates while the scene is
+    saved. Return the thread.
+    """
+    jobs = []
+    for path in image_plane_paths(imagePlanes):
+        sequence_manager.detach(path)
+        jobs.append((path, proxy_planes[path][0] if path in proxy_planes else cmds.getAttr(path + '.imageName')))
+
+    def build():
+        results, builders = {}, {}
+        try:
+            for path, image in jobs:
+                try:
+                    plate = sequence.find_sequence(image) if image and os.path.isfile(image) else None
+                    if plate is None:
+                        results[path] = '{} is not an image sequence'.format(image)
+                        continue
+                    builders[path] = proxy.ProxyBuilder(plate, scale)
+                    results[path] = builders[path].build()
+                except (IOError, OSError, RuntimeError) as e:
+                    results[path] = str(e)
+        finally:
+            # whatever happened, the main thread hears back
+            utils.executeDeferred(switch, results, builders)
+
+    def switch(results, builders):
+        for path, image in jobs:
+            result = results.setdefault(path, 'proxy build of {} stopped'.format(path))
+            if not isinstance(result, dict) or not cmds.objExists(path):
+                continue
+            if result['failed']:
+                # a plane on a proxy with holes shows missing frames, stay on the plate
+                results[path] = '{} proxy frames of {} failed, kept the full resolution plate'.format(
+                    len(result['failed']), path
+                    )
+                continue
+            frame = int(sequence.FRAME_RE.match(os.path.basename(image)).group('frame'))
+            proxy_planes[path] = (image, builders[path].path(frame))
+            swap_image_name(path, proxy_planes[path][1])
+        if proxy_planes and not proxy_callback_ids:
+            proxy_callback_ids.extend([
+                om2.MSceneMessage.addCallback(om2.MSceneMessage.kBeforeSave, _proxy_before_save),
+                om2.MSceneMessage.addCallback(om2.MSceneMessage.kAfterSave, _proxy_after_save),
+                ])
+        if done:
+            done(results)
+
+    thread = threading.Thread(target=build, name='pail proxy build')
+    thread.daemon = True
+    thread.start()
+    return thread
+
+
+def use_full(imagePlanes=None):
+    """ point the imagePlanes (every proxied plane when None) back to their full resolution plates """
+    paths = list(proxy_planes) if imagePlanes is None else image_plane_paths(imagePlanes)
+    for path in paths:
+        images = proxy_planes.pop(path, None)
+        if images and cmds.objExists(path):
+            swap_image_name(path, images[0])
+    if not proxy_planes:
+        for callback_id in proxy_callback_ids:
+            om2.MMessage.removeCallback(callback_id)
+        del proxy_callback_ids[:]
+
+
+def _proxy_before_save(*args):
+    """ the scene keeps the full resolution plates, not the temp proxies """
+    for path, (image, proxy_image) in proxy_planes.items():
+        if cmds.objExists(path):
+            swap_image_name(path, image)
+
+
+def _proxy_after_save(*args):
+    for path, (image, proxy_image) in proxy_planes.items():
+        if cmds.objExists(path):
+            swap_image_name(path, proxy_image)
 
 
 def look_thru(imagePlane):
-    imagePlane.displayOnlyIfCurrent.set(0)
-    imagePlane.displayOnlyIfCurrent.set(1)
+    look_thru_many([imagePlane])
+
+
+def look_thru_many(imagePlanes):
+    """ toggle displayOnlyIfCurrent to force the imagePlanes to redraw, all off then all on """
+    paths = image_plane_paths(imagePlanes)
+    for value in 0, 1:
+        for path in paths:
+            cmds.setAttr(path + '.displayOnlyIfCurrent', value)
+
+@undo_dec
+def bake_to_world2(camera, reset_scale=True, mode='constraint'):
+    """
+    Unparent camera to world keeping its world space animation, return the elapsed seconds.
+    mode 'constraint' bakes a parent constrained locator with bakeResults,
+    mode 'context' reads the camera's world matrix per frame with context evaluation (no locator, no cut/paste).
+    """
+    start = time.time()
+    if mode == 'context':
+        camera = _bake_to_world_context(camera)
+    else:
+        camera = _bake_to_world_constraint(camera)
+    if reset_scale:
+        cmds.setAttr(camera + ".sx", 1)
+        cmds.setAttr(camera + ".sy", 1)
+        cmds.setAttr(camera + ".sz", 1)
+    elapsed = time.time() - start
+    logger.debug('bake_to_world2 (%s) %s: %.3fs', mode, camera, elapsed)
+    return elapsed
+
 
 @undo_dec
-def bake_to_world2(camera, reset_scale=True):
+def bake_many_to_world(cameras, reset_scale=True, workers=4, undoable=True):
+    """
+    Bake several cameras to world with a single walk over the timeline, return the baked cameras' names.
+    Every camera is sampled on each frame, decomposition is then spread across a thread pool.
+    undoable=False writes the keys with undo recording off, for scripted batches.
+    """
+    start = time.time()
+    frames = bake.frame_range()
+    handles = main.mobj2(list(cameras), 'handle')
+    matrices = bake.sample_world_matrices(handles, frames)
+    orders = [cmds.getAttr(main.mobj2(h, 'fullPath') + ".rotateOrder") for h in handles]
+    pool = ThreadPool(max(1, min(workers, len(handles))))
+    try:
+        values = pool.map(_world_bake_values, zip(matrices, orders))
+    finally:
+        pool.close()
+        pool.join()
+    # maya's api isn't thread safe, keys are written back on the main thread
+    baked = []
+    with util.undo.fast() if not undoable else util.undo.chunk('bake_many_to_world'):
+        for handle, value in zip(handles, values):
+            camera = _apply_world_bake(main.mobj2(handle, 'fullPath'), frames, value)
+            if reset_scale:
+                cmds.setAttr(camera + ".s", 1, 1, 1)
+            baked.append(camera)
+    logger.debug('bake_many_to_world %s cameras x %s frames: %.3fs', len(baked), len(frames), time.time() - start)
+    return baked
+
+
+def _world_bake_values(matrices_order):
+    translate, rotate = bake.decompose_matrices(*matrices_order)
+    return np.hstack([translate, rotate])
+
+
+def _apply_world_bake(camera, frames, values):
+    cmds.cutKey(camera, time=(":",), hierarchy='none', attribute=BAKE_ATTRS)
+    if cmds.listRelatives(camera, parent=True):
+        camera = cmds.parent(camera, world=True)[0]
+    bake.write_curves(camera, BAKE_ATTRS, frames, values)
+    return camera
+
+
+def _bake_to_world_context(camera):
+    frames = bake.frame_range()
+    matrices = bake.sample_world_matrices([camera], frames)[0]
+    return _apply_world_bake(camera, frames, _world_bake_values((matrices, cmds.getAttr(camera + ".rotateOrder"))))
+
+
+def _bake_to_world_constraint(camera):
     min_time = cmds.playbackOptions(q=True, minTime=True)
     max_time = cmds.playbackOptions(q=True, maxTime=True)
 
@@ -98,11 +434,14 @@ def bake_to_world2(camera, reset_scale=True):
 
     paren_constraint = cmds.parentConstraint(camera, world_loc, maintainOffset=False)
 
-    cmds.ogs(pause=True)
-    cmds.bakeResults(
-        world_loc, simulation=True, attribute=["tx", "ty", "tz", "rx", "ry", "rz"], time=(min_time, max_time)
-    )
-    cmds.ogs(pause=True)
+    paused = cmds.ogs(query=True, pause=True)
+    if not paused:
+        cmds.ogs(pause=True)  # the flag toggles
+    try:
+        cmds.bakeResults(world_loc, simulation=True, attribute=BAKE_ATTRS, time=(min_time, max_time))
+    finally:
+        if not paused:
+            cmds.ogs(pause=True)
 
     cmds.delete(paren_constraint)  # Delete parent constraint.
 
@@ -123,8 +462,141 @@ def bake_to_world2(camera, reset_scale=True):
     )
     mel.eval(cmd)
     cmds.delete(world_loc)
+    return unparented_cam
 
-    if reset_scale:
-        cmds.setAttr(unparented_cam + ".sx", 1)
-        cmds.setAttr(unparented_cam + ".sy", 1)
-        cmds.setAttr(unparented_cam + ".sz", 1)
\ No newline at end of file
+
+ANIMATION_ATTRS = 'focalLength', 'horizontalFilmAperture', 'verticalFilmAperture', 'nearClipPlane', 'farClipPlane'
+
+
+def camera_nodes(camera):
+    """ (transform, shape) full paths of a camera given by its transform or its shape """
+    shape = main.get_shape(main.mobj2(camera, 'mobj'))[0]
+    return main.mobj2(main.get_parent(shape), 'fullPath'), main.mobj2(shape, 'fullPath')
+
+
+def export_animation(cameras, path, frames=None):
+    """
+    Save the cameras' world matrices and ANIMATION_ATTRS per frame to an uncompressed .npz, sampled in one walk
+    over the frames (the playback range by default). Values stay in internal units, a reimport is exact.
+    Arrays: names, frames, rotateOrder, matrices (cameras, frames, 4, 4) and one (cameras, frames) per attribute.
+    """
+    frames = list(frames if frames is not None else bake.frame_range())
+    nodes = [camera_nodes(cam) for cam in cameras]
+    sampled = []
+    for cam_tsf, shape in nodes:
+        fn = main.mobj2(shape, 'fn')
+        sampled.append(bake.world_matrix_plug(cam_tsf))
+        sampled.extend(fn.findPlug(attr, False) for attr in ANIMATION_ATTRS)
+    samples = bake.sample_plugs(sampled, frames)
+    step = len(ANIMATION_ATTRS) + 1
+    data = {
+        'names': np.array([cam_tsf for cam_tsf, shape in nodes]),
+        'frames': np.array(frames, dtype=np.float64),
+        'rotateOrder': np.array([cmds.getAttr(cam_tsf + '.rotateOrder') for cam_tsf, shape in nodes]),
+        'matrices': np.array(samples[::step]).reshape(len(nodes), len(frames), 4, 4),
+        }
+    for c, attr in enumerate(ANIMATION_ATTRS):
+        data[attr] = np.array(samples[c + 1::step]).reshape(len(nodes), len(frames))
+    with open(path, 'wb') as f:
+        np.savez(f, **data)
+    return path
+
+
+def load_animation(path):
+    """ {name: array} of an export_animation file, read at once so the file isn't left open """
+    with np.load(path) as data:
+        return dict((key, data[key]) for key in data.files)
+
+
+@undo_dec
+def import_animation(path, cameras=None):
+    """
+    Key cameras from an export_animation file, new cameras unless existing ones are given (in file order).
+    The world matrices go to translate/rotate/scale through the parent's world inverse on every frame (the
+    cameras stay where they are in the hierarchy) with one bulk key write per channel, attributes that don't
+    change over the frames are set instead. Return the transforms.
+    """
+    data = load_animation(path)
+    frames = data['frames'].tolist()
+    transforms = []
+    for c, name in enumerate(data['names'].tolist()):
+        cam_tsf, shape = camera_nodes(cameras[c] if cameras else _new_camera(name.split('|')[-1]))
+        order = int(data['rotateOrder'][c])
+        cmds.setAttr(cam_tsf + '.rotateOrder', order)
+        matrices = data['matrices'][c]
+        parent = cmds.listRelatives(cam_tsf, parent=True, fullPath=True)
+        if parent:
+            parent_matrices = bake.sample_plugs([bake.world_matrix_plug(parent[0])], frames)[0]
+            matrices = np.matmul(matrices, np.linalg.inv(parent_matrices))
+        translate, rotate = bake.decompose_matrices(matrices, order)
+        scale = np.linalg.norm(matrices[:, :3, :3], axis=-1)
+        cmds.cutKey(cam_tsf, time=(":",), hierarchy='none', attribute=BAKE_ATTRS + ['sx', 'sy', 'sz'])
+        bake.write_curves(cam_tsf, BAKE_ATTRS + ['sx', 'sy', 'sz'], frames, np.hstack([translate, rotate, scale]))
+        key_or_set(shape, [(attr, data[attr][c]) for attr in ANIMATION_ATTRS], frames)
+        transforms.append(cam_tsf)
+    return transforms
+
+
+def _new_camera(name):
+    cam_tsf = cmds.createNode('transform', name=name)
+    cmds.createNode('camera', name=name + 'Shape', parent=cam_tsf)
+    return cam_tsf
+
+
+def key_or_set(node, channels, frames):
+    """ [(attr, values per frame)] in internal units, bulk keys for the channels that change, setAttr for the rest """
+    cmds.cutKey(node, time=(":",), hierarchy='none', attribute=[attr for attr, values in channels])
+    fn = main.mobj2(node, 'fn')
+    animated = []
+    for attr, values in channels:
+        if np.ptp(values):
+            animated.append((attr, values))
+        else:
+            cmds.setAttr('{}.{}'.format(node, attr), plugs.to_ui(fn.findPlug(attr, False), float(values[0])))
+    if animated:
+        bake.write_curves(node, [attr for attr, values in animated], frames, np.column_stack([v for a, v in animated]))
+
+
+def load_chan(path):
+    """
+    (frames, columns) array of a .chan or comma separated per frame file:
+    frame, tx, ty, tz, rx, ry, rz and an optional vertical fov, '#' comments and a header row are skipped
+    """
+    with open(path) as f:
+        first, row = next(((c, line) for c, line in enumerate(f) if line.strip() and not line.startswith('#')), (0, ''))
+    delimiter = ',' if ',' in row else None
+    try:
+        float(row.replace(',', ' ').split()[0])
+        skip = 0
+    except (ValueError, IndexError):
+        skip = first + 1
+    return np.loadtxt(path, delimiter=delimiter, comments='#', skiprows=skip, ndmin=2)
+
+
+@undo_dec
+def import_chan(camera, path, rotate_order='zxy', convert=True):
+    """
+    Key a camera from a .chan (nuke's export, rotate in degrees in rotate_order, zxy by default) with one bulk
+    key write per channel. convert keeps the camera's rotateOrder and converts the rotations to it, otherwise
+    the camera takes the file's order. A vertical fov column keys focalLength against the current film back.
+    Return the camera's transform.
+    """
+    data = load_chan(path)
+    if data.shape[1] < 7:
+        raise ValueError('{}: expected frame, translate and rotate columns, got {}'.format(path, data.shape[1]))
+    cam_tsf, shape = camera_nodes(camera)
+    frames = data[:, 0].tolist()
+    order = attrs.ROTATE_ORDERS.index(rotate_order) if isinstance(rotate_order, string_types) else int(rotate_order)
+    translate = data[:, 1:4] * om2.MDistance(1., om2.MDistance.uiUnit()).asCentimeters()  # scene unit -> cm
+    rotate = np.radians(data[:, 4:7])
+    if not convert:
+        transform.set_rotate_order(pm.PyNode(cam_tsf), order)
+    elif cmds.getAttr(cam_tsf + '.rotateOrder') != order:
+        target = cmds.getAttr(cam_tsf + '.rotateOrder')
+        rotate = bake.decompose_matrices(bake.compose_matrices(translate, rotate, order), target)[1]
+    cmds.cutKey(cam_tsf, time=(":",), hierarchy='none', attribute=BAKE_ATTRS)
+    bake.write_curves(cam_tsf, BAKE_ATTRS, frames, np.hstack([translate, rotate]))
+    if data.shape[1] > 7:
+        vertical_aperture = cmds.getAttr(shape + '.verticalFilmAperture') * 25.4  # inches -> mm
+        key_or_set(shape, [('focalLength', vertical_aperture / 2. / np.tan(np.radians(data[:, 7]) / 2.))], frames)
+    return cam_tsf
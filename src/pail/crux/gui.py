@@ -1,34 +1,161 @@
+import time
 import six
 
 
 import maya.cmds as cmds
-import maya.OpenMayaUI as omui
-
-import shiboken2
-import PySide2.QtWidgets as QtWidgets
+import maya.api.OpenMaya as om2
 
+from .lazy import LazyModule
 from .util import warning
 
+omui = LazyModule('maya.OpenMayaUI')
+shiboken2 = LazyModule('shiboken2')
+QtWidgets = LazyModule('PySide2.QtWidgets')
+
+# cameraman toggle name -> modelEditor flag
+VISIBILITY_FLAGS = {
+    'nurbsCurves': 'nurbsCurves',
+    'polymeshes': 'polymeshes',
+    'locators': 'locators',
+    'camera': 'cameras',
+    'selectionHiliteDisplay': 'selectionHiliteDisplay',
+    'wireframeOnShaded': 'wireframeOnShaded',
+    'imagePlane': 'imagePlane',
+    }
+# cameraman toggle name -> plugin display filter
+PLUGIN_FILTERS = {
+    'gpuCache': 'gpuCacheDisplayFilter',
+    }
+# named visibility presets, toggles missing from a set are left untouched
+FILTER_SETS = {
+    'playback': {'polymeshes': False, 'gpuCache': False, 'imagePlane': False},
+    'heavy': {'polymeshes': False, 'gpuCache': False, 'nurbsCurves': False, 'wireframeOnShaded': False},
+    'imagePlane only': {
+        'polymeshes': False, 'gpuCache': False, 'nurbsCurves': False, 'locators': False, 'camera': False,
+        'imagePlane': True,
+        },
+    }
+previous_panel_states = {}  # panel -> state before the first filter set applied to it
+
+
 def set_show_hide(panel, obj_type, state):
     if not panel:
         warning('You have to ACTIVE a panel')
         return
-    if obj_type == 'nurbsCurves':
-        cmds.modelEditor(panel, e=1, nurbsCurves=state)
-    if obj_type == 'polymeshes':
-        cmds.modelEditor(panel, e=1, polymeshes=state)
-    if obj_type == 'locators':
-        cmds.modelEditor(panel, e=1, locators=state)
-    if obj_type == 'camera':
-        cmds.modelEditor(panel, e=1, cameras=state)
-    if obj_type == 'selectionHiliteDisplay':
-        cmds.modelEditor(panel, e=1, selectionHiliteDisplay=state)
-    if obj_type == 'wireframeOnShaded':
-        cmds.modelEditor(panel, e=1, wireframeOnShaded=state)
-    if obj_type == 'imagePlane':
-        cmds.modelEditor(panel, e=1, imagePlane=state)
-    if obj_type == 'gpuCache':
-        cmds.modelEditor(panel, e=1, pluginObjects=('gpuCacheDisplayFilter', state))
+    apply_panel_state(panel, {obj_type: state})
+
+
+def query_panel_state(panel):
+    """ visibility of every known toggle of a modelPanel, modelEditor only queries one flag per call """
+    state = {}
+    for obj_type, flag in VISIBILITY_FLAGS.items():
+        state[obj_type] = bool(cmds.modelEditor(panel, q=1, **{flag: 1}))
+    for obj_type, plugin_filter in PLUGIN_FILTERS.items():
+        state[obj_type] = bool(cmds.modelEditor(panel, q=1, queryPluginObjects=plugin_filter))
+    return state
+
+
+def apply_panel_state(panels, state):
+    """ Apply a visibility preset {toggle name: bool} to one or many panels, one modelEditor edit per panel """
+    if isinstance(panels, six.string_types):
+        panels = [panels]
+    flags = dict((VISIBILITY_FLAGS[k], bool(v)) for k, v in state.items() if k in VISIBILITY_FLAGS)
+    plugins = [(PLUGIN_FILTERS[k], bool(v)) for k, v in state.items() if k in PLUGIN_FILTERS]
+    for panel in panels:
+        edit = dict(flags)
+        if plugins:
+            edit['pluginObjects'] = plugins[0]
+        if edit:
+            cmds.modelEditor(panel, e=1, **edit)
+        for plugin in plugins[1:]:
+            cmds.modelEditor(panel, e=1, pluginObjects=plugin)
+        if panel in panel_states.states:
+            panel_states.states[panel].update((k, bool(v)) for k, v in state.items())
+
+
+def model_panels():
+    """ as title """
+    return cmds.getPanel(type='modelPanel') or []
+
+
+def apply_filter_set(filter_set, panels=None, measure=False):
+    """
+    Apply a named filter set (or a {toggle name: bool} dict) to given panels, all modelPanels by default.
+    The state before the first application is kept for restore_filter_set.
+    Return the viewport fps before and after when measure is on, (None, None) otherwise.
+    """
+    state = FILTER_SETS[filter_set] if isinstance(filter_set, six.string_types) else filter_set
+    panels = panels or model_panels()
+    before = measure_viewport_fps() if measure else None
+    for panel in panels:
+        current = panel_states.get(panel)
+        remembered = previous_panel_states.setdefault(panel, {})
+        for obj_type in state:
+            remembered.setdefault(obj_type, current[obj_type])
+    apply_panel_state(panels, state)
+    return before, measure_viewport_fps() if measure else None
+
+
+def restore_filter_set(panels=None, measure=False):
+    """ Restore panels (all remembered ones by default) to their state before apply_filter_set """
+    panels = [p for p in (panels or list(previous_panel_states)) if p in previous_panel_states]
+    before = measure_viewport_fps() if measure else None
+    for panel in panels:
+        state = previous_panel_states.pop(panel)
+        if cmds.modelPanel(panel, exists=1):
+            apply_panel_state(panel, state)
+    return before, measure_viewport_fps() if measure else None
+
+
+def measure_viewport_fps(frames=10):
+    """ Step the viewports through a few frames of the playback range and return the redraw rate """
+    current = cmds.currentTime(q=1)
+    start = cmds.playbackOptions(q=1, min=1)
+    end = cmds.playbackOptions(q=1, max=1)
+    span = max(int(end - start), 1)
+    began = time.time()
+    try:
+        for c in range(frames):
+            cmds.currentTime(start + c % (span + 1), update=True)
+            cmds.refresh(force=True)
+    finally:
+        cmds.currentTime(current, update=True)
+    elapsed = time.time() - began
+    return frames / elapsed if elapsed else 0.
+
+
+class PanelStateCache(object):
+    """ Visibility state per panel name, re-queried only after Maya reports a modelEditor change """
+
+    def __init__(self):
+        self.states = {}
+        self.callback_ids = []
+
+    def install(self):
+        if not self.callback_ids:
+            self.callback_ids.append(om2.MEventMessage.addEventCallback('modelEditorChanged', self.invalidate))
+        return self
+
+    def remove(self):
+        for callback_id in self.callback_ids:
+            try:
+                om2.MMessage.removeCallback(callback_id)
+            except RuntimeError:
+                pass
+        self.callback_ids = []
+        self.states.clear()
+
+    def invalidate(self, *args):
+        self.states.clear()
+
+    def get(self, panel):
+        """ cached state of panel, queried when unknown (or always, when the callback isn't installed) """
+        if panel not in self.states or not self.callback_ids:
+            self.states[panel] = query_panel_state(panel)
+        return self.states[panel]
+
+
+panel_states = PanelStateCache()
 
 
 def get_maya_ui_long_name(qt_widget):
@@ -0,0 +1,118 @@
+import functools
+import json
+import os
+import tempfile
+import time
+
+import maya.api.OpenMaya as om2
+
+# opt-in call instrumentation: PAIL_PROFILE=1 or enable(), dumped as JSON or Chrome trace (chrome://tracing)
+# while disabled a timed function costs one global lookup per call
+wall_clock = getattr(time, 'perf_counter', time.time)
+cpu_clock = getattr(time, 'process_time', None) or time.clock
+
+enabled = False
+records = {}  # label -> {'calls', 'wall', 'cpu', 'commands'}
+events = []  # chrome trace complete events
+max_events = 100000
+command_count = [0]
+callback_ids = []
+origin = wall_clock()
+
+
+def enable():
+    """ start recording, count Maya commands through MCommandMessage """
+    global enabled
+    enabled = True
+    if not callback_ids:
+        callback_ids.append(om2.MCommandMessage.addCommandCallback(_command_ran))
+
+
+def disable():
+    """ stop recording, the collected data is kept until reset() """
+    global enabled
+    enabled = False
+    for callback_id in callback_ids:
+        try:
+            om2.MMessage.removeCallback(callback_id)
+        except RuntimeError:
+            pass
+    del callback_ids[:]
+
+
+def reset():
+    """ as title """
+    records.clear()
+    del events[:]
+    command_count[0] = 0
+
+
+def _command_ran(*args):
+    command_count[0] += 1
+
+
+def timed(label=None):
+    """ decorator recording the calls of a function while instrumentation is enabled """
+
+    def decorator(func):
+        name = label or '{}.{}'.format(func.__module__.split('.')[-1], func.__name__)
+
+        @functools.wraps(func)
+        def _timed(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            commands, wall, cpu = command_count[0], wall_clock(), cpu_clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, wall, wall_clock() - wall, cpu_clock() - cpu, command_count[0] - commands)
+
+        return _timed
+
+    return decorator
+
+
+def record(name, start, wall, cpu, commands):
+    """ add one call to the records (times in seconds) """
+    entry = records.setdefault(name, {'calls': 0, 'wall': 0., 'cpu': 0., 'commands': 0})
+    entry['calls'] += 1
+    entry['wall'] += wall
+    entry['cpu'] += cpu
+    entry['commands'] += commands
+    if len(events) < max_events:
+        events.append({
+            'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': 0,
+            'ts': (start - origin) * 1e6, 'dur': wall * 1e6, 'args': {'cpu_ms': cpu * 1e3, 'commands': commands},
+            })
+
+
+def report():
+    """ records sorted by total wall time """
+    return sorted(
+        (dict(name=name, **entry) for name, entry in records.items()), key=lambda r: r['wall'], reverse=True
+        )
+
+
+def dump_json(path=None):
+    """ write report() as JSON, return the path """
+    path = path or _default_path('json')
+    with open(path, 'w') as f:
+        json.dump(report(), f, indent=2)
+    return path
+
+
+def dump_chrome_trace(path=None):
+    """ write the recorded calls in Chrome trace event format, return the path """
+    path = path or _default_path('trace.json')
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+    return path
+
+
+def _default_path(ext):
+    folder = os.environ.get('PAIL_PROFILE_DIR') or tempfile.gettempdir()
+    return os.path.join(folder, 'pail_profile_{}.{}'.format(time.strftime('%Y%m%d_%H%M%S'), ext))
+
+
+if os.environ.get('PAIL_PROFILE'):
+    enable()
@@ -0,0 +1,225 @@
+"""
+Camera/imagePlane inventory of many scenes, one row per node, written as CSV or NDJSON (by extension).
+
+    python -m pail.crux.inventory shots/ -o inventory.ndjson            # .ma text (crux.ma), no Maya
+    python -m pail.crux.inventory shots/ -o inventory.csv --maya 8      # 8 mayapy processes, .mb too
+
+Re-running against the same output only reads the scenes whose size or mtime changed.
+Runs from a plain python, nothing here imports maya but the mayapy worker.
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+from multiprocessing.pool import ThreadPool
+
+import six
+
+from . import attrs, ma, sequence
+
+SCENE_EXTS = '.ma', '.mb'
+COLUMNS = (
+    ['file', 'size', 'mtime', 'type', 'node', 'transform', 'cameras', 'locked'] +
+    attrs.names(attrs.CAMERA) + attrs.names(attrs.TRANSFORM) + attrs.names(attrs.IMAGE_PLANE) + ['error']
+    )
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # the directory holding pail
+
+
+def scene_files(paths):
+    """ scene files of the given files and directories (recursive), sorted """
+    found = []
+    for path in paths:
+        if os.path.isfile(path):
+            found.append(os.path.abspath(path))
+            continue
+        for directory, subdirectories, names in os.walk(path):
+            found.extend(os.path.abspath(os.path.join(directory, n)) for n in names if n.endswith(SCENE_EXTS))
+    return sorted(set(found))
+
+
+def file_stat(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime]
+
+
+def record(path, stat, node_type, values):
+    """ inventory row of a query_camera/query_image_plane like dict, lists joined by ';' """
+    row = dict.fromkeys(COLUMNS, '')
+    row.update(file=path, size=stat[0], mtime=stat[1], type=node_type)
+    for key, value in values.items():
+        if key in row:
+            row[key] = ';'.join(value) if isinstance(value, list) else value
+    return row
+
+
+# -- .ma text mode
+
+
+def _parse_rows(args):
+    """ pool worker, rows of one .ma """
+    path, stat = args
+    try:
+        rows = [record(path, stat, node_type, values) for node_type, values in ma.records(path)]
+    except (IOError, OSError, ValueError, IndexError) as e:
+        return [record(path, stat, 'error', {'error': str(e)})]
+    return rows or [record(path, stat, '', {})]
+
+
+# -- mayapy mode
+
+
+def scene_rows(path, stat):
+    """ rows of the scene open in maya, through the same queries as cameraman """
+    import maya.api.OpenMaya as om2
+    from . import main, plugs, scene
+    cache = plugs.PlugCache()
+    rows = [
+        record(path, stat, 'camera', scene.query_camera(cam, cache))
+        for cam in main.api_ls('mobj', obj_type=om2.MFn.kCamera)
+        ]
+    rows += [
+        record(path, stat, 'imagePlane', scene.query_image_plane(imagePlane, cache))
+        for imagePlane in main.api_ls('mobj', obj_type=om2.MFn.kImagePlane)
+        ]
+    return rows or [record(path, stat, '', {})]
+
+
+def worker(output, files, load_references=True):
+    """ mayapy side, open each scene and append its rows to output as NDJSON """
+    import maya.standalone
+    maya.standalone.initialize(name='python')
+    import maya.cmds as cmds
+    with open(output, 'w') as f:
+        for path in files:
+            stat = file_stat(path)
+            try:
+                cmds.file(
+                    path, open=True, force=True, prompt=False, loadReferenceDepth='all' if load_references else 'none'
+                    )
+                rows = scene_rows(path, stat)
+            except RuntimeError as e:
+                rows = [record(path, stat, 'error', {'error': str(e)})]
+            for row in rows:
+                f.write(json.dumps(row) + '\n')
+            f.flush()
+    maya.standalone.uninitialize()
+
+
+def _mayapy_rows(args):
+    """ pool thread, one mayapy process for a batch of scenes """
+    mayapy, files, load_references = args
+    handle, output = tempfile.mkstemp(suffix='.ndjson')
+    os.close(handle)
+    command = [mayapy, '-m', 'pail.crux.inventory', '--worker', output] + files
+    if not load_references:
+        command.insert(-len(files), '--no-references')
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT] + os.environ.get('PYTHONPATH', '').split(os.pathsep)))
+    try:
+        with open(os.devnull, 'w') as devnull:
+            code = subprocess.call(command, stdout=devnull, stderr=subprocess.STDOUT, env=env)
+        rows = read_rows(output)
+    except (IOError, OSError) as e:
+        code, rows = str(e), []
+    finally:
+        if os.path.exists(output):
+            os.remove(output)
+    done = set(row['file'] for row in rows)
+    for path in files:
+        if path not in done and os.path.exists(path):
+            rows.append(record(path, file_stat(path), 'error', {'error': 'mayapy exited with {}'.format(code)}))
+    return rows
+
+
+# -- output
+
+
+def read_rows(path):
+    if not os.path.exists(path):
+        return []
+    if path.endswith('.csv'):
+        with open(path, 'rb' if six.PY2 else 'r') as f:
+            return list(csv.DictReader(f))
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_rows(path, rows):
+    part = path + '.part'
+    if path.endswith('.csv'):
+        with open(part, 'wb') if six.PY2 else open(part, 'w', newline='') as f:
+            writer = csv.DictWriter(f, COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(part, 'w') as f:
+            for row in rows:
+                f.write(json.dumps(row) + '\n')
+    sequence.replace(part, path)
+
+
+def run(paths, output, maya=False, workers=None, mayapy='mayapy', batch=20, load_references=True):
+    """
+    Inventory the scenes under paths into output, reusing the rows of scenes unchanged since the last run.
+    maya: open the scenes in `workers` mayapy processes (`batch` scenes each) instead of reading .ma text.
+    Returns {'scenes', 'read', 'rows'}.
+    """
+    workers = workers or multiprocessing.cpu_count()
+    previous = {}
+    for row in read_rows(output):
+        previous.setdefault(row['file'], []).append(row)
+    rows, todo = [], []
+    for path in scene_files(paths):
+        stat = file_stat(path)
+        old = previous.get(path)
+        if old and old[0]['type'] != 'error' and [int(old[0]['size']), float(old[0]['mtime'])] == stat:
+            rows.extend(old)
+        elif maya or path.endswith('.ma'):
+            todo.append((path, stat))
+    if maya:
+        files = [path for path, stat in todo]
+        jobs = [(mayapy, files[c:c + batch], load_references) for c in range(0, len(files), batch)]
+        pool = ThreadPool(workers)
+        mapper = _mayapy_rows
+    else:
+        jobs = todo
+        pool = multiprocessing.Pool(workers)
+        mapper = _parse_rows
+    try:
+        for new in pool.imap_unordered(mapper, jobs):
+            rows.extend(new)
+    finally:
+        pool.close()
+        pool.join()
+    rows.sort(key=lambda row: (row['file'], row['type'], row['node']))
+    write_rows(output, rows)
+    return {'scenes': len(set(row['file'] for row in rows)), 'read': len(todo), 'rows': len(rows)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pail.crux.inventory')
+    parser.add_argument('paths', nargs='*')
+    parser.add_argument('-o', '--output', default='inventory.ndjson', help='.csv or .ndjson')
+    parser.add_argument('--maya', type=int, metavar='PROCESSES', help='open the scenes in mayapy processes')
+    parser.add_argument('--mayapy', default='mayapy')
+    parser.add_argument('--batch', type=int, default=20, help='scenes per mayapy process')
+    parser.add_argument('--workers', type=int, help='text mode processes, cpu count by default')
+    parser.add_argument('--no-references', action='store_true')
+    parser.add_argument('--worker', metavar='OUTPUT', help=argparse.SUPPRESS)
+    options = parser.parse_args(argv)
+    if options.worker:
+        worker(options.worker, options.paths, not options.no_references)
+        return 0
+    result = run(
+        options.paths, options.output, maya=bool(options.maya), workers=options.maya or options.workers,
+        mayapy=options.mayapy, batch=options.batch, load_references=not options.no_references
+        )
+    print('{scenes} scenes ({read} read), {rows} rows'.format(**result))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
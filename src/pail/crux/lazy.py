@@ -0,0 +1,31 @@
+import importlib
+import sys
+
+
+class LazyModule(object):
+    """ Stand-in for a module that is imported on first attribute access (pymel, Qt, numpy are slow to load) """
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        if self.__dict__['_module'] is None:
+            self.__dict__['_module'] = importlib.import_module(self.__dict__['_name'])
+        return self.__dict__['_module']
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        return '<lazy module {!r}{}>'.format(self._name, '' if self.__dict__['_module'] else ' (not loaded)')
+
+    @property
+    def loaded(self):
+        return self.__dict__['_module'] is not None or self.__dict__['_name'] in sys.modules
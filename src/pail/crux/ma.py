@@ -0,0 +1,194 @@
+"""
+Streaming reader of Maya ASCII scenes, cameras and imagePlanes without loading Maya.
+Lines are read as bytes and only the statements of those nodes (and of transforms, for rotateOrder) are
+tokenized. The dag branch being written is followed with a stack (a .ma writes parents before children),
+memory grows with the cameras and imagePlanes found, not with the size of the scene.
+"""
+import io
+import re
+
+from . import attrs
+
+TABLES = {'camera': attrs.CAMERA, 'imagePlane': attrs.IMAGE_PLANE, 'transform': attrs.TRANSFORM}
+TOKEN_RE = re.compile(r'"((?:[^"\\]|\\.)*)"|(\S+)')
+NUMBER_RE = re.compile(r'-?\.?\d')
+ON = 'on', 'yes', 'true', '1'
+
+
+def tokens(statement):
+    """ words of a mel statement, quoted strings unescaped """
+    return [word or quoted.replace('\\"', '"').replace('\\\\', '\\') for quoted, word in TOKEN_RE.findall(statement)]
+
+
+def flag(words, name):
+    return words[words.index(name) + 1] if name in words[:-1] else None
+
+
+def convert(kind, word):
+    if kind == 'string':
+        return word
+    if kind == 'bool':
+        return word in ON
+    if kind == 'enum':
+        return int(float(word))
+    return float(word)
+
+
+def attribute(node_type, attr):
+    """ (long name, kind) of a short or long attribute name, None when it isn't one cameraman shows """
+    for name, short_name, kind, default in TABLES.get(node_type, ()):
+        if attr in (name, short_name):
+            return name, kind
+    return None
+
+
+def words(data):
+    """ tokens of a statement read as bytes, without its ';' """
+    return tokens(data.rstrip().rstrip(b';').decode('utf-8', 'replace'))
+
+
+class Node(object):
+    __slots__ = 'type', 'name', 'path', 'values', 'locked', 'keys', 'transform'
+
+    def __init__(self, node_type, name, path):
+        self.type = node_type
+        self.name = name
+        self.path = path
+        self.values = {}
+        self.locked = []
+        self.transform = None  # a camera's transform Node
+        # quoted attribute names as they appear in the setAttr lines worth tokenizing
+        self.keys = tuple('".{}"'.format(n).encode('utf-8') for a in TABLES.get(node_type, ()) for n in a[:2])
+
+    def set_attr(self, words):
+        attr = next((w for w in words if w.startswith('.')), None)
+        found = attr and attribute(self.type, attr[1:])
+        if not found:
+            return
+        name, kind = found
+        rest, c = words[words.index(attr) + 1:], 0
+        while c < len(rest):
+            if rest[c].startswith('-') and not NUMBER_RE.match(rest[c]):
+                c += 2  # flag and its argument
+                continue
+            self.values[name] = convert(kind, rest[c])
+            break
+        if flag(words, '-l') in ON:
+            self.locked.append(name)
+
+
+def lines(path, buffering=1 << 20):
+    with io.open(path, 'rb', buffering=buffering) as f:
+        for line in f:
+            yield line
+
+
+def events(lines):
+    """
+    Generator of ('node', Node) for every camera and imagePlane once its block is read,
+    ('link', imagePlane path, camera path) and ('lock', path, attr) for other connections into those nodes,
+    ('unit', linear unit) for the file's currentUnit.
+    """
+    stack = []  # Nodes of the dag branch being written
+    paths = {}  # name -> path of the nodes yielded and of the cameras' transforms
+    current, statement = None, []
+    for line in lines:
+        if not line[:1].isspace():
+            if current is not None and current.type != 'transform':
+                yield 'node', current
+            current, statement = None, []
+            if line.startswith(b'createNode '):
+                current = _create(words(line), stack, paths)
+            elif line.startswith(b'connectAttr '):
+                event = _connect(line, paths)
+                if event:
+                    yield event
+            elif line.startswith(b'currentUnit '):
+                linear = flag(words(line), '-l') or flag(words(line), '-linear')
+                if linear in attrs.LINEAR_UNITS:
+                    yield 'unit', linear
+            continue
+        if current is None:
+            continue
+        if not statement:
+            stripped = line.lstrip()
+            if not stripped.startswith(b'setAttr') or not any(key in line for key in current.keys):
+                continue
+        statement.append(line)
+        if line.rstrip().endswith(b';'):
+            current.set_attr(words(b''.join(statement)))
+            statement = []
+    if current is not None and current.type != 'transform':
+        yield 'node', current
+
+
+def _create(words, stack, paths):
+    """ place a createNode in the hierarchy, return its Node when it's worth reading """
+    node_type, name, parent = words[1], flag(words, '-n'), flag(words, '-p')
+    if parent is None:
+        del stack[:]
+        path = '|' + name
+    else:
+        while stack and parent not in (stack[-1].name, stack[-1].path):
+            stack.pop()
+        if stack:
+            path = '{}|{}'.format(stack[-1].path, name)
+        else:
+            path = '{}|{}'.format(parent if parent.startswith('|') else paths.get(parent, '|' + parent), name)
+    node = Node(node_type, name, path)
+    if node_type == 'camera' and stack and stack[-1].type == 'transform':
+        node.transform = stack[-1]
+        paths[stack[-1].name] = stack[-1].path
+    stack.append(node)
+    if node_type in ('camera', 'imagePlane'):
+        paths[name] = path
+    return node if node_type in TABLES else None
+
+
+def _connect(line, paths):
+    parts = line.decode('utf-8', 'replace').split('"')
+    if len(parts) < 5:
+        return None
+    (src_node, src_attr), (dst_node, dst_attr) = [part.lstrip(':').split('.', 1) for part in (parts[1], parts[3])]
+    dst_path = dst_node if dst_node.startswith('|') else paths.get(dst_node)
+    if dst_path is None:
+        return None
+    if src_attr in ('msg', 'message') and dst_attr.split('[')[0] in ('ip', 'imagePlane'):
+        return 'link', src_node if src_node.startswith('|') else paths.get(src_node, '|' + src_node), dst_path
+    return 'lock', dst_path, dst_attr
+
+
+def records(path):
+    """
+    [(type, values)] of a .ma's cameras and imagePlanes, values like scene.query_camera/query_image_plane,
+    maya's defaults for what the file leaves out, distances in the file's linear unit
+    """
+    nodes, cameras, locks, linear_unit = {}, {}, [], 'centimeter'
+    for event in events(lines(path)):
+        if event[0] == 'node':
+            nodes[event[1].path] = event[1]
+        elif event[0] == 'link':
+            cameras.setdefault(event[1], []).append(event[2])
+        elif event[0] == 'unit':
+            linear_unit = event[1]
+        else:
+            locks.append(event[1:])
+    transforms = dict((node.transform.path, node.transform) for node in nodes.values() if node.transform)
+    for lock_path, attr in locks:
+        node = nodes.get(lock_path) or transforms.get(lock_path)
+        found = node and attribute(node.type, attr)
+        if found:
+            node.locked.append(found[0])
+    result = []
+    for node_path, node in sorted(nodes.items()):
+        values = attrs.defaults(TABLES[node.type], linear_unit)
+        values.update(node.values, node=node_path, locked=list(node.locked))
+        if node.type == 'camera':
+            transform = node.transform or Node('transform', '', '')
+            values.update(attrs.defaults(attrs.TRANSFORM, linear_unit), **transform.values)
+            values['locked'] += transform.locked
+            values['transform'] = transform.path
+        else:
+            values['cameras'] = cameras.get(node_path, [])
+        result.append((node.type, values))
+    return result
@@ -1,7 +1,11 @@
+import re
+
 from six import string_types
 
 import maya.api.OpenMaya as om2
 
+WILDCARD_RE = re.compile(r'[*?\[]')
+
 
 def get_selection():
     """ API get selection """
@@ -9,12 +13,21 @@ def get_selection():
     return [(sel_list.getDependNode(c)) for c in range(sel_list.length())]
 
 
+# mobj2 conversion cache, only used while its invalidation callbacks are installed (see enable_cache)
+cache = {}  # MObjectHandle.hashCode() -> (MObjectHandle, {return_type: value})
+cache_stats = {'hits': 0, 'misses': 0}
+cache_users = []
+cache_callback_ids = []
+CACHEABLE_TYPES = ('shortName', 'fullPath', 'partialPath', 'handle', 'dagPath', 'fn', 'dagFn')
+
+
 def get_shape(mObj):
     """ get the shape of given object, if it's already a shape, return itself"""
     shapes = []
     if mObj.hasFn(om2.MFn.kTransform):
-        for c in range(mobj2(mObj, 'dagPath').numberOfShapesDirectlyBelow()):
-            shapes.append(mobj2(mObj, 'dagPath').extendToShape(c).node())
+        dag_path = mobj2(mObj, 'dagPath')
+        for c in range(dag_path.numberOfShapesDirectlyBelow()):
+            shapes.append(om2.MDagPath(dag_path).extendToShape(c).node())
     elif mObj.hasFn(om2.MFn.kShape):
         shapes.append(mObj)
     return shapes
@@ -59,22 +72,9 @@ def get_nodes_tsf(obj, returnType):
 
 def mobj2(obj, return_type):
     def get(obj, return_type):
-        if return_type == 'shortName':
-            return om2.MFnDependencyNode(obj).name()
-        elif return_type == 'fullPath':
-            return om2.MDagPath.getAPathTo(obj).fullPathName()
-        elif return_type == 'fn':
-            return om2.MFnDependencyNode(obj)
-        elif return_type == 'partialPath':
-            return om2.MDagPath.getAPathTo(obj).partialPathName()
-        elif return_type == 'handle':
-            return om2.MObjectHandle(obj)
-        elif return_type == 'dagPath':
-            return om2.MDagPath.getAPathTo(obj)
-        elif return_type == 'dagFn':
-            return om2.MFnDagNode(obj)
-        elif return_type == 'mobj':
-            return obj
+        if cache_users and return_type in CACHEABLE_TYPES:
+            return cached_get(obj, return_type)
+        return convert_mobj(obj, return_type)
 
     def convert(obj):
         if isinstance(obj, om2.MDagPath):
@@ -86,6 +86,8 @@ def mobj2(obj, return_type):
         elif isinstance(obj, string_types):
             return get_depend_node(obj)
         elif isinstance(obj, (list, tuple)):
+            if obj and all(isinstance(o, string_types) for o in obj):
+                return get_depend_node(obj)  # one selection list for all names
             return [convert(o) for o in obj]
         elif isinstance(obj, om2.MObjectArray):
             return [convert(obj[c]) for c in range(len(obj))]
@@ -101,15 +103,198 @@ def mobj2(obj, return_type):
         raise TypeError(obj)
 
 
+def mobj2_many(objs, return_types):
+    """
+    Convert a list/MObjectArray of objects to several types, return one tuple per object.
+    Each object is looked up once, every type comes from the same MDagPath and function set (see convert_many).
+    """
+    return [convert_many(obj, return_types) for obj in mobj2(objs, 'mobj')]
+
+
+def convert_many(obj, return_types):
+    """ tuple of return_types of a MObject, through the cache when it's enabled """
+    values = _cache_entry(obj)[1] if cache_users else {}
+    missing = [t for t in return_types if t not in values]
+    if cache_users:
+        cache_stats['hits'] += len(return_types) - len(missing)
+        cache_stats['misses'] += len(missing)
+    if missing:
+        dag = obj.hasFn(om2.MFn.kDagNode)
+        dag_path = om2.MDagPath.getAPathTo(obj) if dag else None
+        fn = om2.MFnDagNode(dag_path) if dag else om2.MFnDependencyNode(obj)
+        for return_type in missing:
+            if return_type == 'mobj':
+                value = obj
+            elif return_type == 'shortName':
+                value = fn.name()
+            elif return_type == 'fn' or dag and return_type == 'dagFn':
+                value = fn
+            elif dag and return_type == 'dagPath':
+                value = dag_path
+            elif dag and return_type == 'fullPath':
+                value = dag_path.fullPathName()
+            elif dag and return_type == 'partialPath':
+                value = dag_path.partialPathName()
+            else:
+                value = convert_mobj(obj, return_type)  # handle, or the error of a dag type on a dg node
+            values[return_type] = value
+    return tuple(om2.MDagPath(values[t]) if t == 'dagPath' else values[t] for t in return_types)
+
+
+def convert_mobj(obj, return_type):
+    """ uncached conversion of a MObject """
+    if return_type == 'shortName':
+        return om2.MFnDependencyNode(obj).name()
+    elif return_type == 'fullPath':
+        return om2.MDagPath.getAPathTo(obj).fullPathName()
+    elif return_type == 'fn':
+        return om2.MFnDependencyNode(obj)
+    elif return_type == 'partialPath':
+        return om2.MDagPath.getAPathTo(obj).partialPathName()
+    elif return_type == 'handle':
+        return om2.MObjectHandle(obj)
+    elif return_type == 'dagPath':
+        return om2.MDagPath.getAPathTo(obj)
+    elif return_type == 'dagFn':
+        return om2.MFnDagNode(obj)
+    elif return_type == 'mobj':
+        return obj
+
+
+def cached_get(obj, return_type):
+    """ conversion through the cache, dag paths are returned as copies since MDagPath methods edit in place """
+    values = _cache_entry(obj)[1]
+    if return_type in values:
+        cache_stats['hits'] += 1
+    else:
+        cache_stats['misses'] += 1
+        values[return_type] = convert_mobj(obj, return_type)
+    if return_type == 'dagPath':
+        return om2.MDagPath(values[return_type])
+    return values[return_type]
+
+
+def _cache_entry(obj):
+    """ (MObjectHandle, {return_type: value}) of a MObject, a fresh one when the cached node isn't it anymore """
+    handle = om2.MObjectHandle(obj)
+    entry = cache.get(handle.hashCode())
+    if entry is None or not entry[0].isValid() or not entry[0].object() == obj:
+        entry = cache[handle.hashCode()] = (handle, {})
+    return entry
+
+
+def enable_cache(user='default'):
+    """ Start caching mobj2 conversions, install the rename/reparent/delete callbacks that keep it valid """
+    if user not in cache_users:
+        cache_users.append(user)
+    if cache_callback_ids:
+        return
+    clear = lambda *args: cache.clear()
+    cache_callback_ids.extend([
+        om2.MNodeMessage.addNameChangedCallback(om2.MObject.kNullObj, _cache_node_renamed),
+        om2.MDGMessage.addNodeRemovedCallback(_cache_node_removed),
+        om2.MDagMessage.addParentAddedCallback(clear),
+        om2.MDagMessage.addParentRemovedCallback(clear),
+        om2.MSceneMessage.addCallback(om2.MSceneMessage.kBeforeNew, clear),
+        om2.MSceneMessage.addCallback(om2.MSceneMessage.kBeforeOpen, clear),
+        ])
+
+
+def disable_cache(user='default'):
+    """ Stop caching once the last user is gone """
+    if user in cache_users:
+        cache_users.remove(user)
+    if cache_users:
+        return
+    for callback_id in cache_callback_ids:
+        try:
+            om2.MMessage.removeCallback(callback_id)
+        except RuntimeError:
+            pass
+    del cache_callback_ids[:]
+    cache.clear()
+
+
+def reset_cache_stats():
+    """ as title """
+    cache_stats['hits'] = cache_stats['misses'] = 0
+
+
+def _cache_node_renamed(mObj, *args):
+    if mObj.hasFn(om2.MFn.kDagNode):
+        cache.clear()  # the paths of every descendant change too
+    else:
+        cache.pop(om2.MObjectHandle(mObj).hashCode(), None)
+
+
+def _cache_node_removed(mObj, *args):
+    cache.pop(om2.MObjectHandle(mObj).hashCode(), None)
+
+
 def get_depend_node(name_str):
-    node = []
-    if isinstance(name_str, list):
-        for name in name_str:
-            selection = om2.MSelectionList()
+    """ MObject of given name, or a list of MObjects for a list of names """
+    if isinstance(name_str, (list, tuple)):
+        nodes, failed = get_depend_nodes(name_str)
+        if failed:
+            raise ValueError('No object matches name: {}'.format(', '.join(failed)))
+        return list(nodes)
+    selection = om2.MSelectionList()
+    selection.add(name_str)
+    return selection.getDependNode(0)
+
+
+def get_depend_nodes(names):
+    """
+    Resolve many names with a single MSelectionList.
+    Return a MObjectArray parallel to names, one entry per name: a null MObject where it failed, the first
+    match for a wildcard pattern or an ambiguous name (like get_depend_node), and the names that didn't resolve.
+    """
+    selection = om2.MSelectionList()
+    nodes = om2.MObjectArray()
+    failed = []
+    for name in names:
+        before = selection.length()
+        try:
             selection.add(name)
-        node = [selection.getDependNode(c) for c in range(len(name_str))]
-    else:
-        selection = om2.MSelectionList()
-        selection.add(name_str)
-        node = selection.getDependNode(0)
-    return node
+        except RuntimeError:
+            failed.append(name)
+            nodes.append(om2.MObject())
+            continue
+        if selection.length() == before + 1 and not WILDCARD_RE.search(name):
+            nodes.append(selection.getDependNode(before))
+        else:
+            # patterns, ambiguous names and names already in the list (it merges duplicates): some of the
+            # matches may have been in the list before, resolve on their own for the first one
+            nodes.append(get_depend_node(name))
+    return nodes, failed
+
+
+def get_plugs(names):
+    """ MPlugs of 'node.attr' names, one MSelectionList for all of them """
+    selection = om2.MSelectionList()
+    for name in names:
+        selection.add(name)
+    return [selection.getPlug(c) for c in range(selection.length())]
+
+
+def upstream_nodes(plugs, fn_types=(om2.MFn.kExpression, om2.MFn.kTime)):
+    """
+    Nodes of the given MFn types feeding the plugs, walking upstream plug by plug with MItDependencyGraph.
+    Return MObjects in the order they're found, each node once.
+    """
+    found = []
+    seen = set()
+    for plug in plugs:
+        dg_it = om2.MItDependencyGraph(
+            plug, om2.MFn.kInvalid, om2.MItDependencyGraph.kUpstream, om2.MItDependencyGraph.kDepthFirst,
+            om2.MItDependencyGraph.kPlugLevel
+            )
+        while not dg_it.isDone():
+            node = dg_it.currentNode()
+            key = om2.MObjectHandle(node).hashCode()
+            if key not in seen:
+                seen.add(key)
+                if any(node.hasFn(fn_type) for fn_type in fn_types):
+                    found.append(node)
+            dg_it.next()
+    return found
@@ -0,0 +1,136 @@
+import maya.cmds as cmds
+import maya.api.OpenMaya as om2
+
+from . import main, util
+
+
+def plug_path(plug):
+    """ unique 'node.attr' name of a plug, dag nodes by full path since short names can clash """
+    node = plug.node()
+    if node.hasFn(om2.MFn.kDagNode):
+        node_name = om2.MDagPath.getAPathTo(node).fullPathName()
+    else:
+        node_name = om2.MFnDependencyNode(node).name()
+    return '{}.{}'.format(node_name, plug.partialName(useLongNames=True))
+
+
+def settable(plug):
+    """ same rule as pymel's Attribute.isSettable """
+    return plug.isFreeToChange() == om2.MPlug.kFreeToChange
+
+
+def _unit(plug):
+    attr = plug.attribute()
+    if not attr.hasFn(om2.MFn.kUnitAttribute):
+        return None
+    unit_type = om2.MFnUnitAttribute(attr).unitType()
+    return {om2.MFnUnitAttribute.kDistance: om2.MDistance, om2.MFnUnitAttribute.kAngle: om2.MAngle}.get(unit_type)
+
+
+def to_ui(plug, value):
+    """ internal value (cm, radians) to the ui unit cmds.setAttr/getAttr work in """
+    unit = _unit(plug)
+    return unit(value).asUnits(unit.uiUnit()) if unit else value
+
+
+def from_ui(plug, value):
+    """ ui unit value to the internal unit MPlug/MDGModifier work in """
+    unit = _unit(plug)
+    return unit(value, unit.uiUnit()).asUnits(unit.internalUnit()) if unit else value
+
+
+def get_value(plug):
+    """ double value of a plug in ui units """
+    return to_ui(plug, plug.asDouble())
+
+
+def read(plug, kind):
+    """ value of a plug by attrs kind ('string', 'enum', 'bool', 'distance', 'double'), ui units """
+    if kind == 'string':
+        return plug.asString()
+    if kind == 'enum':
+        return plug.asInt()
+    if kind == 'bool':
+        return plug.asBool()
+    return get_value(plug)
+
+
+class PlugCache(object):
+    """ MPlugs looked up once per node and attribute, reused while the node is alive """
+
+    def __init__(self):
+        self.plugs = {}  # (MObjectHandle.hashCode(), attr) -> (MObjectHandle, MPlug)
+
+    def get(self, obj, attr):
+        handle = main.mobj2(obj, 'handle')
+        key = (handle.hashCode(), attr)
+        cached = self.plugs.get(key)
+        if cached and cached[0].isValid() and cached[0].object() == handle.object():
+            return cached[1]
+        plug = om2.MFnDependencyNode(handle.object()).findPlug(attr, False)
+        self.plugs[key] = (handle, plug)
+        return plug
+
+    def get_many(self, obj, attrs):
+        return [self.get(obj, attr) for attr in attrs]
+
+    def clear(self):
+        self.plugs.clear()
+
+
+class PlugDrag(object):
+    """
+    Live edits of double plugs while a slider or spinbox is dragged.
+    Every tick goes through one MDGModifier (no undo queue, no command echo), end() puts the start
+    values back and sets the last ones with cmds.setAttr in one chunk, the whole drag is one undo.
+    """
+
+    def __init__(self):
+        self.edits = {}  # (node hash, attr) -> [MObjectHandle, MPlug, plug path, start value, last value], ui units
+        self.skipped = set()  # locked or connected plugs, checked once per drag
+
+    @property
+    def active(self):
+        return bool(self.edits)
+
+    def set(self, plugs, values):
+        """ values in ui units, as the widgets show them """
+        modifier = om2.MDGModifier()
+        for plug, value in zip(plugs, values):
+            handle = om2.MObjectHandle(plug.node())
+            key = (handle.hashCode(), plug.partialName())
+            edit = self.edits.get(key)
+            if edit is None:
+                if key in self.skipped or not settable(plug):
+                    self.skipped.add(key)
+                    continue
+                edit = self.edits[key] = [handle, plug, plug_path(plug), get_value(plug), value]
+            edit[4] = value
+            modifier.newPlugValueDouble(plug, from_ui(plug, value))
+        modifier.doIt()
+
+    def _alive(self):
+        return [edit for edit in self.edits.values() if edit[0].isValid()]
+
+    def cancel(self):
+        """ put the start values back without touching the undo queue """
+        modifier = om2.MDGModifier()
+        for handle, plug, path, start, last in self._alive():
+            modifier.newPlugValueDouble(plug, from_ui(plug, start))
+        modifier.doIt()
+        self.edits.clear()
+        self.skipped.clear()
+
+    def end(self):
+        """ commit the drag as one undoable step, return the plug paths that changed """
+        changed = [(edit[2], edit[4]) for edit in self._alive() if edit[3] != edit[4]]
+        if not self.edits:
+            self.skipped.clear()
+            return []
+        self.cancel()
+        if not changed:
+            return []
+        with util.undo.chunk('pail drag'):
+            for path, value in changed:
+                cmds.setAttr(path, value)
+        return [path for path, value in changed]
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import threading
+from multiprocessing.pool import ThreadPool
+
+from . import sequence
+
+SCALES = {'half': 0.5, 'quarter': 0.25}
+TOOLS = 'oiiotool', 'imconvert'  # first found on PATH (or in $MAYA_LOCATION/bin) is used
+PROXY_EXT = '.jpg'  # 8 bit, read fast by the viewport
+CHUNK = 1 << 20  # bytes read at a time while hashing a frame
+
+
+def find_tool(names=TOOLS):
+    """ path of the first converter found, None when there's none """
+    directories = os.environ.get('PATH', '').split(os.pathsep)
+    if os.environ.get('MAYA_LOCATION'):
+        directories.append(os.path.join(os.environ['MAYA_LOCATION'], 'bin'))
+    for name in names:
+        for directory in directories:
+            for path in os.path.join(directory, name), os.path.join(directory, name + '.exe'):
+                if os.path.isfile(path) and os.access(path, os.X_OK):
+                    return path
+    return None
+
+
+def convert_command(tool, src, dst, scale):
+    """ command line downscaling src to an 8 bit dst """
+    percent = '{:g}%'.format(scale * 100)
+    if os.path.basename(tool).startswith('oiiotool'):
+        return [tool, src, '--resize', percent, '-d', 'uint8', '-o', dst]
+    return [tool, src, '-resize', percent, '-depth', '8', dst]
+
+
+def fingerprint(path):
+    """ content hash of a frame, objects are shared across plates by it (the manifest saves rehashing) """
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def default_root():
+    return os.environ.get('PAIL_PROXY_CACHE') or os.path.join(sequence.default_cache_root(), 'proxy')
+
+
+class ProxyBuilder(object):
+    """
+    Downscaled 8 bit copies of a sequence, built by converter subprocesses run from a thread pool.
+    Converted frames are stored once by fingerprint under root/objects and linked into a frame numbered
+    directory the imagePlane reads. A manifest keeps the source stats, only missing or changed frames
+    are converted again and an interrupted build picks up where it stopped.
+    """
+
+    def __init__(self, plate, scale='half', root=None, workers=None, tool=None):
+        self.sequence = plate
+        self.scale = scale
+        self.root = root or default_root()
+        self.tool = tool or find_tool()
+        self.workers = workers or multiprocessing.cpu_count()
+        key = hashlib.md5(os.path.join(plate.directory, plate.pattern).encode('utf-8')).hexdigest()[:12]
+        self.directory = os.path.join(self.root, '{}_{}'.format(key, scale))
+        self.objects = os.path.join(self.root, 'objects')
+        self.manifest_path = os.path.join(self.directory, 'manifest.json')
+        self.manifest = self._load_manifest()  # frame (str) -> {'stat': [size, mtime], 'hash': fingerprint}
+        self.lock = threading.Lock()
+        self.cancelled = False
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _save_manifest(self):
+        part = self.manifest_path + '.part'
+        with open(part, 'w') as f:
+            json.dump(self.manifest, f)
+        sequence.replace(part, self.manifest_path)
+
+    def file_name(self, frame):
+        return '{}{}{}'.format(self.sequence.head, str(frame).zfill(self.sequence.padding), PROXY_EXT)
+
+    def path(self, frame):
+        return os.path.join(self.directory, self.file_name(frame))
+
+    def object_path(self, digest):
+        return os.path.join(self.objects, digest[:2], '{}_{}{}'.format(digest, self.scale, PROXY_EXT))
+
+    def stale_frames(self, frames=None):
+        """ frames whose proxy is missing or whose source changed since it was built """
+        stale = []
+        for frame in frames or self.sequence.frames:
+            entry = self.manifest.get(str(frame))
+            if entry is None or not os.path.isfile(self.path(frame)):
+                stale.append(frame)
+                continue
+            stat = os.stat(self.sequence.path(frame))
+            if entry['stat'] != [stat.st_size, stat.st_mtime]:
+                stale.append(frame)
+        return stale
+
+    def _build_frame(self, frame):
+        """ worker: fingerprint, convert unless the object exists already, link it in, return (frame, error) """
+        if self.cancelled:
+            return frame, 'cancelled'
+        src = self.sequence.path(frame)
+        try:
+            stat = os.stat(src)
+            digest = fingerprint(src)
+            obj = self.object_path(digest)
+            if not os.path.isfile(obj):
+                sequence.makedirs(os.path.dirname(obj))
+                part = '{}.{}.part{}'.format(obj, threading.current_thread().ident, PROXY_EXT)
+                with open(os.devnull, 'w') as devnull:
+                    subprocess.check_call(
+                        convert_command(self.tool, src, part, SCALES[self.scale]), stdout=devnull,
+                        stderr=subprocess.STDOUT
+                        )
+                sequence.replace(part, obj)
+            self._link(obj, self.path(frame))
+        except (IOError, OSError, subprocess.CalledProcessError) as e:
+            return frame, str(e)
+        with self.lock:
+            self.manifest[str(frame)] = {'stat': [stat.st_size, stat.st_mtime], 'hash': digest}
+        return frame, None
+
+    @staticmethod
+    def _link(obj, path):
+        if os.path.lexists(path):
+            os.remove(path)
+        try:
+            os.link(obj, path)
+        except (AttributeError, OSError):
+            shutil.copyfile(obj, path)
+
+    def build(self, frames=None, progress=None, save_every=20):
+        """
+        Convert the stale frames, return {'converted': [...], 'failed': {frame: error}}.
+        progress(done, total) is called after every frame, from the calling thread.
+        """
+        if self.tool is None:
+            raise RuntimeError('no image converter found, looked for {}'.format(', '.join(TOOLS)))
+        sequence.makedirs(self.directory)
+        stale = self.stale_frames(frames)
+        result = {'converted': [], 'failed': {}}
+        pool = ThreadPool(self.workers)
+        try:
+            for c, (frame, error) in enumerate(pool.imap_unordered(self._build_frame, stale)):
+                if error:
+                    result['failed'][frame] = error
+                else:
+                    result['converted'].append(frame)
+                if not (c + 1) % save_every:
+                    with self.lock:
+                        self._save_manifest()
+                if progress:
+                    progress(c + 1, len(stale))
+        finally:
+            pool.close()
+            pool.join()
+            with self.lock:
+                self._save_manifest()
+        return result
+
+    def cancel(self):
+        self.cancelled = True
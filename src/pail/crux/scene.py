@@ -0,0 +1,178 @@
+import maya.api.OpenMaya as om2
+
+from . import attrs, main, plugs
+
+
+def _query(values, node, table, plug_cache):
+    for name, short_name, kind, default in table:
+        plug = plug_cache.get(node, name)
+        values[name] = plugs.read(plug, kind)
+        if not plugs.settable(plug):
+            values['locked'].append(name)
+
+
+def query_camera(cam, plug_cache=None):
+    """
+    attrs.CAMERA of a camera and attrs.TRANSFORM of its transform in ui units, as cameraman shows them,
+    'locked' lists the ones that can't be set (locked or connected)
+    """
+    plug_cache = plug_cache or plugs.PlugCache()
+    mObj = main.mobj2(cam, 'mobj')
+    parent = main.get_parent(mObj)
+    values = {'node': main.mobj2(mObj, 'fullPath'), 'transform': main.mobj2(parent, 'fullPath'), 'locked': []}
+    _query(values, mObj, attrs.CAMERA, plug_cache)
+    _query(values, parent, attrs.TRANSFORM, plug_cache)
+    return values
+
+
+def query_image_plane(imagePlane, plug_cache=None):
+    """ attrs.IMAGE_PLANE of an imagePlane and the cameras it's connected to, see query_camera """
+    plug_cache = plug_cache or plugs.PlugCache()
+    mObj = main.mobj2(imagePlane, 'mobj')
+    values = {
+        'node': main.mobj2(mObj, 'fullPath'), 'cameras': main.mobj2(get_connected_cam(mObj), 'fullPath'),
+        'locked': []
+        }
+    _query(values, mObj, attrs.IMAGE_PLANE, plug_cache)
+    return values
+
+
+def get_connected_cam(imagePlane):
+    """ get camera by given object's message connection (and has to be a camera node)"""
+    connected = []
+    fn = main.mobj2(imagePlane, 'fn')
+    plug = fn.findPlug('message', False)
+    for i in plug.connectedTo(0, 1):
+        if i.node().hasFn(om2.MFn.kCamera):
+            connected.append(i.node())
+    return connected
+
+
+def get_connected_imagePlane(cam):
+    """ get imagePlane by given object's imagePlane attribute connection (and has to be a imagePlane node) """
+    connected = []
+    fn = main.mobj2(cam, 'fn')
+    plug = fn.findPlug('imagePlane', False)
+    for c in range(plug.numConnectedElements()):
+        for connected_plug in plug.connectionByPhysicalIndex(c).connectedTo(1, 0):
+            if connected_plug.node().hasFn(om2.MFn.kImagePlane):
+                connected.append(connected_plug.node())
+    return connected
+
+
+class SceneIndex(object):
+    """
+    In memory index of cameras, imagePlanes and the connections between them.
+    Built once, then kept up to date by node added/removed, rename, reparent and connection callbacks.
+    version increases on every change so the UI can tell when it has to diff its lists.
+    """
+    types = {om2.MFn.kCamera: 'camera', om2.MFn.kImagePlane: 'imagePlane'}
+
+    def __init__(self):
+        self.nodes = dict((mType, {}) for mType in self.types)  # MFn type -> {hashCode: MObjectHandle}
+        self.connections = {}  # hashCode -> {hashCode: MObjectHandle}, both directions
+        self.version = 0
+        self.callback_ids = []
+
+    def build(self):
+        """ full scan, only needed on install and scene open/new """
+        for mType, nodes in self.nodes.items():
+            nodes.clear()
+            for handle in main.api_ls('handle', obj_type=mType):
+                nodes[handle.hashCode()] = handle
+        self.connections.clear()
+        for handle in list(self.nodes[om2.MFn.kCamera].values()):
+            for imagePlane in get_connected_imagePlane(handle.object()):
+                self._connect(handle, om2.MObjectHandle(imagePlane))
+        self.version += 1
+
+    def install(self):
+        """ scan the scene and start listening to it """
+        self.build()
+        for type_name in self.types.values():
+            self.callback_ids.append(om2.MDGMessage.addNodeAddedCallback(self._node_added, type_name))
+            self.callback_ids.append(om2.MDGMessage.addNodeRemovedCallback(self._node_removed, type_name))
+        self.callback_ids.append(om2.MNodeMessage.addNameChangedCallback(om2.MObject.kNullObj, self._name_changed))
+        self.callback_ids.append(om2.MDagMessage.addParentAddedCallback(self._parent_changed))
+        self.callback_ids.append(om2.MDGMessage.addConnectionCallback(self._connection_changed))
+        for msg in om2.MSceneMessage.kAfterOpen, om2.MSceneMessage.kAfterNew, om2.MSceneMessage.kAfterImport:
+            self.callback_ids.append(om2.MSceneMessage.addCallback(msg, self._scene_changed))
+        return self
+
+    def remove(self):
+        """ stop listening """
+        for callback_id in self.callback_ids:
+            try:
+                om2.MMessage.removeCallback(callback_id)
+            except RuntimeError:
+                pass
+        self.callback_ids = []
+
+    def ls(self, mType):
+        """ valid handles of given MFn type """
+        return [handle for handle in self.nodes[mType].values() if handle.isValid()]
+
+    def connected(self, obj):
+        """ connected camera(s) of an imagePlane, or imagePlane(s) of a camera, as MObjects """
+        handle = main.mobj2(obj, 'handle')
+        return [h.object() for h in self.connections.get(handle.hashCode(), {}).values() if h.isValid()]
+
+    def _type_of(self, mObj):
+        for mType in self.nodes:
+            if mObj.hasFn(mType):
+                return mType
+
+    def _connect(self, handle, other):
+        self.connections.setdefault(handle.hashCode(), {})[other.hashCode()] = other
+        self.connections.setdefault(other.hashCode(), {})[handle.hashCode()] = handle
+
+    def _disconnect(self, handle, other):
+        self.connections.get(handle.hashCode(), {}).pop(other.hashCode(), None)
+        self.connections.get(other.hashCode(), {}).pop(handle.hashCode(), None)
+
+    def _node_added(self, mObj, *args):
+        mType = self._type_of(mObj)
+        if mType is None:
+            return
+        handle = om2.MObjectHandle(mObj)
+        self.nodes[mType][handle.hashCode()] = handle
+        self.version += 1
+
+    def _node_removed(self, mObj, *args):
+        mType = self._type_of(mObj)
+        if mType is None:
+            return
+        hash_code = om2.MObjectHandle(mObj).hashCode()
+        self.nodes[mType].pop(hash_code, None)
+        for other in self.connections.pop(hash_code, {}).values():
+            self.connections.get(other.hashCode(), {}).pop(hash_code, None)
+        self.version += 1
+
+    def _is_relevant(self, mObj):
+        """ indexed node, or a transform above one (the lists display transform names) """
+        if self._type_of(mObj) is not None:
+            return om2.MObjectHandle(mObj).hashCode() in self.nodes[self._type_of(mObj)]
+        if mObj.hasFn(om2.MFn.kTransform):
+            return any(self._is_relevant(shape) for shape in main.get_shape(mObj))
+        return False
+
+    def _name_changed(self, mObj, *args):
+        if self._is_relevant(mObj):
+            self.version += 1
+
+    def _parent_changed(self, child, parent, *args):
+        if self._is_relevant(child.node()):
+            self.version += 1
+
+    def _connection_changed(self, src_plug, dst_plug, made, *args):
+        src, dst = src_plug.node(), dst_plug.node()
+        if not (src.hasFn(om2.MFn.kImagePlane) and dst.hasFn(om2.MFn.kCamera)):
+            return
+        if made:
+            self._connect(om2.MObjectHandle(dst), om2.MObjectHandle(src))
+        else:
+            self._disconnect(om2.MObjectHandle(dst), om2.MObjectHandle(src))
+        self.version += 1
+
+    def _scene_changed(self, *args):
+        self.build()
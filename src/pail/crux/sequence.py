@@ -0,0 +1,445 @@
+import collections
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from multiprocessing.pool import ThreadPool
+
+# plate.1001.exr -> head 'plate.', frame '1001', tail '.exr', the frame number is the last digits before the extension
+FRAME_RE = re.compile(r'^(?P<head>.*?)(?P<frame>\d+)(?P<tail>\.[A-Za-z0-9]+)$')
+# files an imagePlane can show on their own, listed next to the sequences
+IMAGE_EXTS = (
+    '.exr', '.dpx', '.cin', '.tif', '.tiff', '.png', '.jpg', '.jpeg', '.tga', '.iff', '.bmp', '.gif', '.hdr', '.psd',
+    '.mov', '.mp4', '.avi'
+    )
+
+scandir = getattr(os, 'scandir', None)
+replace = getattr(os, 'replace', os.rename)
+
+
+class Sequence(object):
+    """ frame numbered files of a directory sharing head and tail, plate.####.exr """
+
+    def __init__(self, directory, head, tail):
+        self.directory = directory
+        self.head = head
+        self.tail = tail
+        self.padding = 0
+        self.zero_padded = False
+        self.files = {}  # frame -> file name
+
+    def add(self, frame_str, name):
+        self.files[int(frame_str)] = name
+        if len(frame_str) > 1 and frame_str.startswith('0'):
+            if not self.zero_padded:
+                self.padding, self.zero_padded = len(frame_str), True
+        elif not self.zero_padded:
+            self.padding = min(self.padding or len(frame_str), len(frame_str))
+
+    def copy(self):
+        other = Sequence(self.directory, self.head, self.tail)
+        other.padding, other.zero_padded, other.files = self.padding, self.zero_padded, dict(self.files)
+        return other
+
+    @property
+    def pattern(self):
+        return '{}{}{}'.format(self.head, '#' * self.padding, self.tail)
+
+    @property
+    def frames(self):
+        return sorted(self.files)
+
+    @property
+    def first(self):
+        return min(self.files)
+
+    @property
+    def last(self):
+        return max(self.files)
+
+    def gaps(self):
+        """ missing frames between first and last """
+        return [f for f in range(self.first, self.last + 1) if f not in self.files]
+
+    def file_name(self, frame):
+        return self.files.get(frame) or '{}{}{}'.format(self.head, str(frame).zfill(self.padding), self.tail)
+
+    def path(self, frame):
+        return os.path.join(self.directory, self.file_name(frame))
+
+    def __len__(self):
+        return len(self.files)
+
+    def __str__(self):
+        gaps = self.gaps()
+        missing = ' ({} missing)'.format(len(gaps)) if gaps else ''
+        return '{} {}-{}{}'.format(self.pattern, self.first, self.last, missing)
+
+
+def entries(directory):
+    """ (name, is directory) of a directory's entries, os.scandir when available (no stat per entry on most systems) """
+    if scandir:
+        for entry in scandir(directory):
+            yield entry.name, entry.is_dir()
+    else:
+        for name in os.listdir(directory):
+            yield name, os.path.isdir(os.path.join(directory, name))
+
+
+def file_names(directory):
+    return [name for name, is_dir in entries(directory) if not is_dir]
+
+
+def collapse(directory, names, sequences=None, singles=None):
+    """
+    group frame numbered names into Sequences, extend the given {(head, tail): Sequence} dict when given.
+    The other image and movie names are appended to singles when given.
+    """
+    sequences = {} if sequences is None else sequences
+    for name in names:
+        match = FRAME_RE.match(name)
+        if not match:
+            if singles is not None and name.lower().endswith(IMAGE_EXTS):
+                singles.append(name)
+            continue
+        key = match.group('head'), match.group('tail')
+        if key not in sequences:
+            sequences[key] = Sequence(directory, *key)
+        sequences[key].add(match.group('frame'), name)
+    return sequences
+
+
+listings = collections.OrderedDict()  # directory -> (mtime, subdirectories, {(head, tail): Sequence}, singles)
+listings_lock = threading.Lock()
+LISTINGS_MAX = 32  # directories kept, least recently scanned dropped first
+
+
+def scan_listing(directory, partial=None, chunk=2000):
+    """
+    Subdirectories, {(head, tail): Sequence} and the other image/movie names of a directory,
+    cached until the directory's mtime changes (the last LISTINGS_MAX directories).
+    partial(subdirectories, sequences, singles) is called every `chunk` entries while a big directory is read.
+    """
+    mtime = os.stat(directory).st_mtime
+    with listings_lock:
+        cached = listings.pop(directory, None)
+        if cached and cached[0] == mtime:
+            listings[directory] = cached
+            return cached[1:]
+    subdirectories, sequences, singles, names = [], {}, [], []
+    for name, is_dir in entries(directory):
+        if is_dir:
+            subdirectories.append(name)
+        else:
+            names.append(name)
+        if len(names) >= chunk:
+            collapse(directory, names, sequences, singles)
+            names = []
+            if partial:
+                # copies, the caller may read them from another thread while this one goes on
+                partial(sorted(subdirectories), [s.copy() for s in sorted_sequences(sequences)], sorted(singles))
+    collapse(directory, names, sequences, singles)
+    subdirectories.sort()
+    singles.sort()
+    with listings_lock:
+        listings[directory] = (mtime, subdirectories, sequences, singles)
+        while len(listings) > LISTINGS_MAX:
+            listings.popitem(last=False)
+    return subdirectories, sequences, singles
+
+
+def sorted_sequences(sequences):
+    return sorted(sequences.values(), key=lambda s: s.pattern)
+
+
+def scan(directory):
+    """ every sequence of a directory, sorted by pattern """
+    return sorted_sequences(scan_listing(directory)[1])
+
+
+def find_sequence(path):
+    """ the sequence a frame file belongs to, None if the name has no frame number """
+    directory, name = os.path.split(path)
+    match = FRAME_RE.match(name)
+    if not match:
+        return None
+    return scan_listing(directory)[1].get((match.group('head'), match.group('tail')))
+
+
+class Scanner(object):
+    """
+    Directory listings read by a thread pool (see scan_listing), results are handed to callbacks
+    called from the pool threads: partial(directory, subdirectories, sequences, singles) while reading,
+    done(directory, subdirectories, sequences, singles, error) at the end.
+    """
+
+    def __init__(self, workers=4):
+        self.pool = ThreadPool(workers)
+
+    def scan(self, directories, partial=None, done=None):
+        for directory in directories:
+            self.pool.apply_async(self._scan, (directory, partial, done))
+
+    @staticmethod
+    def _scan(directory, partial, done):
+        def report(subdirectories, sequences, singles):
+            if partial:
+                partial(directory, subdirectories, sequences, singles)
+
+        try:
+            subdirectories, sequences, singles = scan_listing(directory, report)
+        except (IOError, OSError) as e:
+            if done:
+                done(directory, [], [], [], str(e))
+            return
+        if done:
+            done(directory, subdirectories, sorted_sequences(sequences), singles, None)
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
+
+
+def default_cache_root():
+    """ PAIL_FRAME_CACHE, point it to a tmpfs (/dev/shm/...) to keep the frames in RAM """
+    return os.environ.get('PAIL_FRAME_CACHE') or os.path.join(tempfile.gettempdir(), 'pail_frame_cache')
+
+
+def makedirs(directory):
+    try:
+        os.makedirs(directory)
+    except OSError:
+        if not os.path.isdir(directory):
+            raise
+
+
+class CacheBudget(object):
+    """
+    Local copies under one cache root, shared by its FrameCaches (see budget), the least recently used copies
+    go back to a symlink past max_bytes whichever cache made them. lock guards the FrameCaches using it too.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.copies = collections.OrderedDict()  # local path -> (bytes, source path), least recently used first
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def add(self, local, size, source):
+        """ lock held """
+        self.discard(local)
+        self.copies[local] = (size, source)
+        self.size += size
+        self.evict()
+
+    def discard(self, local):
+        """ lock held """
+        entry = self.copies.pop(local, None)
+        if entry:
+            self.size -= entry[0]
+
+    def touch(self, local):
+        """ lock held, mark a copy as most recently used, False if there's no copy """
+        if local not in self.copies:
+            return False
+        self.copies[local] = self.copies.pop(local)
+        return True
+
+    def evict(self):
+        """ lock held, drop the oldest copies until under max_bytes, keep the newest one """
+        while self.size > self.max_bytes and len(self.copies) > 1:
+            local, (size, source) = self.copies.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+            try:
+                os.remove(local)
+            except OSError:
+                pass
+            symlink(source, local)
+
+
+budgets = {}  # cache root -> CacheBudget
+budgets_lock = threading.Lock()
+
+
+def budget(cache_root, max_bytes):
+    """ the CacheBudget of a cache root, max_bytes is the latest caller's """
+    with budgets_lock:
+        if cache_root not in budgets:
+            budgets[cache_root] = CacheBudget(max_bytes)
+        budgets[cache_root].max_bytes = max_bytes
+        return budgets[cache_root]
+
+
+def symlink(source, path):
+    if getattr(os, 'symlink', None):
+        try:
+            os.symlink(source, path)
+        except OSError:
+            pass
+
+
+def can_symlink(directory):
+    """ whether symlinks can be made in directory (not on windows without the privilege) """
+    if not getattr(os, 'symlink', None):
+        return False
+    probe = os.path.join(directory, '.link_probe.{}'.format(threading.current_thread().ident))
+    try:
+        os.symlink(probe + '.target', probe)  # a file link, dangling is fine
+    except (OSError, NotImplementedError):
+        return False
+    os.remove(probe)
+    return True
+
+
+class FrameCache(object):
+    """
+    Local copies of a sequence's frames, copied by a thread pool. Frames not copied yet are symlinks to the
+    source (where the os allows), the cache directory shows the whole sequence once the pool has linked it and
+    an imagePlane can read it directly, only when linkable (frames are just copied otherwise).
+    max_bytes applies to the whole cache root (see CacheBudget).
+    Copies left by a previous session are reused while the source's size and mtime match the manifest.
+    """
+
+    def __init__(self, sequence, cache_root=None, max_bytes=8 << 30, workers=4):
+        self.sequence = sequence
+        cache_root = cache_root or default_cache_root()
+        key = hashlib.md5(os.path.join(sequence.directory, sequence.pattern).encode('utf-8')).hexdigest()[:12]
+        self.directory = os.path.join(cache_root, key)
+        self.budget = budget(cache_root, max_bytes)
+        self.lock = self.budget.lock
+        self.pending = set()
+        self.stats = {'hits': 0, 'copies': 0, 'reused': 0, 'errors': 0}
+        self.manifest_path = os.path.join(self.directory, 'manifest.json')
+        self.manifest = self._load_manifest()  # frame (str) -> [size, mtime] of the source when it was copied
+        self.changes = 0
+        makedirs(self.directory)
+        self.linkable = can_symlink(self.directory)
+        self.pool = ThreadPool(workers)
+        self.results = [self.pool.apply_async(self._link_all)] if self.linkable else []
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _save_manifest(self):
+        """ lock held """
+        part = self.manifest_path + '.part'
+        try:
+            with open(part, 'w') as f:
+                json.dump(self.manifest, f)
+            replace(part, self.manifest_path)
+        except (IOError, OSError):
+            pass
+        self.changes = 0
+
+    def local_path(self, frame):
+        return os.path.join(self.directory, self.sequence.file_name(frame))
+
+    def link(self, frame):
+        """ symlink a frame to its source unless there's something there already """
+        symlink(self.sequence.path(frame), self.local_path(frame))
+
+    def _source_stat(self, frame):
+        stat = os.stat(self.sequence.path(frame))
+        return [stat.st_size, stat.st_mtime]
+
+    def _reusable(self, frame, stat):
+        """ a copy (not a link) made from the source as it is now """
+        local = self.local_path(frame)
+        return self.manifest.get(str(frame)) == stat and os.path.isfile(local) and not os.path.islink(local)
+
+    def _link_all(self):
+        """ pool, link the frames, take over the fresh copies of a previous session and drop the stale ones """
+        for frame in self.sequence.frames:
+            local = self.local_path(frame)
+            if os.path.islink(local):
+                continue
+            if not os.path.isfile(local):
+                self.link(frame)
+                continue
+            try:
+                stat = self._source_stat(frame)
+            except OSError:
+                continue
+            with self.lock:
+                if frame in self.pending or local in self.budget.copies:
+                    continue
+                if self._reusable(frame, stat):
+                    self.budget.add(local, os.path.getsize(local), self.sequence.path(frame))
+                    self.stats['reused'] += 1
+                    continue
+                try:
+                    os.remove(local)
+                except OSError:
+                    continue
+                self.link(frame)
+
+    def prefetch(self, frames):
+        """ copy the frames in the background, nearest first as given, return how many were queued """
+        queued = 0
+        with self.lock:
+            for frame in frames:
+                if frame not in self.sequence.files or frame in self.pending:
+                    continue
+                if self.budget.touch(self.local_path(frame)):
+                    self.stats['hits'] += 1
+                    continue
+                self.pending.add(frame)
+                self.results.append(self.pool.apply_async(self._fetch, (frame,)))
+                queued += 1
+        self.results = [r for r in self.results if not r.ready()]
+        return queued
+
+    def _fetch(self, frame):
+        local = self.local_path(frame)
+        part = local + '.part'
+        try:
+            stat = self._source_stat(frame)
+            reused = self._reusable(frame, stat)
+            if not reused:
+                shutil.copyfile(self.sequence.path(frame), part)
+                replace(part, local)
+            size = os.path.getsize(local)
+        except (IOError, OSError):
+            with self.lock:
+                self.pending.discard(frame)
+                self.stats['errors'] += 1
+            return
+        with self.lock:
+            self.pending.discard(frame)
+            self.manifest[str(frame)] = stat
+            self.stats['reused' if reused else 'copies'] += 1
+            self.budget.add(local, size, self.sequence.path(frame))
+            self.changes += 1
+            if self.changes >= 20:
+                self._save_manifest()
+
+    def wait(self):
+        """ block until the queued links and copies are done """
+        for result in list(self.results):
+            result.wait()
+        self.results = []
+        with self.lock:
+            self._save_manifest()
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
+        with self.lock:
+            self._save_manifest()
+
+    def clear(self):
+        """ close and remove the cache directory """
+        self.close()
+        with self.lock:
+            for local in [p for p in self.budget.copies if os.path.dirname(p) == self.directory]:
+                self.budget.discard(local)
+        shutil.rmtree(self.directory, ignore_errors=True)
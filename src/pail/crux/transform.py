@@ -1,32 +1,28 @@
 import six
-import pymel.all as pm
 
+from . import bake
+from .lazy import LazyModule
 from .util import undo_dec, warning
 
+np = LazyModule('numpy')
+pm = LazyModule('pymel.all')
+
 
 @undo_dec
 def bake_to_world(transform, mode='keyRange'):
-    all_vec, all_rVec = [], []
-    temp_loc = pm.spaceLocator()
-    cst = pm.parentConstraint(transform, temp_loc, mo=0)
-    f_start, f_end = pm.playbackOptions(q=1, min=1), pm.playbackOptions(q=1, max=1)
-    for i in range(int(f_start), int(f_end + 1)):
-        all_vec.append(temp_loc.t.get(t=i))
-        all_rVec.append(temp_loc.r.get(t=i))
-    pm.delete(temp_loc)
+    """ Unparent transform to world and key its world space translate/rotate over the playback range """
+    frames = bake.frame_range()
+    matrices = bake.sample_world_matrices([transform.longName()], frames)[0]
+    translate, rotate = bake.decompose_matrices(matrices, transform.rotateOrder.get())
     transform.setParent(w=1)
     for ats in transform.t, transform.r:
         ats.unlock()
         pm.cutKey(ats)
         [attr.unlock() for attr in ats.children()]
         [pm.cutKey(attr) for attr in ats.children()]
-    for c in range(int(f_start), int(f_end + 1)):
-        pm.setKeyframe(transform, t=c, at='tx', v=all_vec[c - int(f_start)][0])
-        pm.setKeyframe(transform, t=c, at='ty', v=all_vec[c - int(f_start)][1])
-        pm.setKeyframe(transform, t=c, at='tz', v=all_vec[c - int(f_start)][2])
-        pm.setKeyframe(transform, t=c, at='rx', v=all_rVec[c - int(f_start)][0])
-        pm.setKeyframe(transform, t=c, at='ry', v=all_rVec[c - int(f_start)][1])
-        pm.setKeyframe(transform, t=c, at='rz', v=all_rVec[c - int(f_start)][2])
+    bake.write_curves(
+        transform.longName(), ['tx', 'ty', 'tz', 'rx', 'ry', 'rz'], frames, np.hstack([translate, rotate])
+        )
 
 
 def set_rotate_order(transform, ro):
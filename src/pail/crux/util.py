@@ -1,7 +1,17 @@
-import sys
+import contextlib
+import functools
+import logging
+
+from six import string_types
 
 import maya.cmds as cmds
-import pymel.all as pm
+
+from . import instrument, main
+from .lazy import LazyModule
+
+QtCore = LazyModule('PySide2.QtCore')
+
+logger = logging.getLogger(__name__)
 
 
 def warning(msg, ui=None, lasts=3000):
@@ -21,24 +31,146 @@ class Callback(object):
         return self.func(*self.args, **self.kwargs)
 
 
-def evaluate_expression():
-    [pm.dgeval(i) for i in pm.ls(type='expression')]
+def evaluate_expression(plugs=None):
+    """
+    dgeval the expressions and time nodes feeding the given plugs (MPlugs or 'node.attr' names),
+    every expression of the scene when no plug is given. Return the names of the evaluated nodes.
+    """
+    if plugs is None:
+        names = cmds.ls(type='expression')
+    else:
+        plugs = main.get_plugs([p for p in plugs if isinstance(p, string_types)]) + \
+            [p for p in plugs if not isinstance(p, string_types)]
+        names = [main.mobj2(node, 'shortName') for node in main.upstream_nodes(plugs)]
+    if names:
+        cmds.dgeval(names)
+    return names
 
 
-def undo_dec(func):
+class UndoManager(object):
     """
-    A decorator that will make commands undoable in maya.
+    Undo chunks for the tools.
+    A gesture keeps one chunk open across a drag or edit session (every call with the same name joins it),
+    it's closed by end(), by a call that isn't part of it, or after `idle` seconds without a new call.
     """
 
-    def _deco(*args, **kwargs):
-        cmds.undoInfo(openChunk=True)
-        func_return = None
+    def __init__(self, idle=0.5):
+        self.idle = idle
+        self.gesture = None  # name of the open gesture chunk
+        self.depth = 0  # nested chunk()/fast() calls
+        self._timer = None
+
+    def _idle_timer(self):
+        if self._timer is None:
+            self._timer = QtCore.QTimer()
+            self._timer.setSingleShot(True)
+            self._timer.timeout.connect(self.end)
+        return self._timer
+
+    def begin(self, name):
+        """ open the gesture chunk, or keep the open one alive when it's the same gesture """
+        if self.gesture != name:
+            self.end()
+            cmds.undoInfo(openChunk=True, chunkName=name)
+            self.gesture = name
+        self._idle_timer().start(int(self.idle * 1000))
+
+    def end(self):
+        """ close the open gesture chunk, if any """
+        if self.gesture is None:
+            return
+        if self._timer is not None:
+            self._timer.stop()
+        self.gesture = None
+        cmds.undoInfo(closeChunk=True)
+
+    @contextlib.contextmanager
+    def chunk(self, name=None):
+        """ one undo chunk, a call outside of the open gesture ends it first """
+        if not self.depth:
+            self.end()
+        self.depth += 1
+        cmds.undoInfo(openChunk=True, chunkName=name or 'pail')
         try:
-            func_return = func(*args, **kwargs)
-        except:
-            print(sys.exc_info()[1])
+            yield
         finally:
             cmds.undoInfo(closeChunk=True)
-            return func_return
+            self.depth -= 1
+
+    @contextlib.contextmanager
+    def fast(self):
+        """
+        Bulk scripted edits with undo recording off, without flushing the queue (undoInfo(stateWithoutFlush)).
+        Nothing done inside can be undone, keep it for operations that build their own result (bakes).
+        """
+        self.end()
+        state = cmds.undoInfo(q=True, stateWithoutFlush=True)
+        cmds.undoInfo(stateWithoutFlush=False)
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            cmds.undoInfo(stateWithoutFlush=state)
+
+
+undo = UndoManager()
+
+
+def report_error(func, error):
+    """ failures of undoable tool calls: warning in the viewport and script editor, traceback logged """
+    logger.error('%s failed', func.__name__, exc_info=True)
+    warning('{} failed: {}'.format(func.__name__, error))
+
+
+def undo_dec(func=None, fast=False):
+    """
+    A decorator that will make commands undoable in maya.
+    @undo_dec(fast=True) runs the function with undo recording off (see UndoManager.fast).
+    Errors are raised again, and reported once by the outermost call when undoable calls nest.
+    """
+    if func is None:
+        return functools.partial(undo_dec, fast=fast)
+    func = instrument.timed()(func)
+
+    @functools.wraps(func)
+    def _deco(*args, **kwargs):
+        try:
+            with undo.fast() if fast else undo.chunk(func.__name__):
+                return func(*args, **kwargs)
+        except Exception as e:
+            if not undo.depth:
+                report_error(func, e)
+            raise
 
     return _deco
+
+
+def undo_gesture(name):
+    """
+    A decorator for slots called continuously while a widget is dragged or scrolled,
+    the calls share one undo chunk until the gesture ends (see UndoManager).
+    """
+
+    def decorator(func):
+        func = instrument.timed()(func)
+
+        @functools.wraps(func)
+        def _deco(*args, **kwargs):
+            if undo.depth:
+                return func(*args, **kwargs)
+            undo.begin(name)
+            undo.depth += 1  # undoable calls made from here nest in the gesture chunk
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                undo.depth -= 1
+                undo.end()
+                report_error(func, e)
+                raise
+            undo.depth -= 1
+            return result
+
+        return _deco
+
+    return decorator
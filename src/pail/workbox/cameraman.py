@@ -3,17 +3,20 @@ import os
 import sys
 from six import integer_types, string_types
 
-import maya.mel as mel
 import maya.cmds as cmds
-import pymel.all as pm
 import maya.api.OpenMaya as om2
 
 
 
 from PySide2 import QtCore, QtGui, QtWidgets
 
-from ..crux import camera, main, gui, main, transform, util
-from ..crux.util import Callback, undo_dec
+from ..crux import camera, main, gui, main, instrument, plugs, scene, sequence, transform, util
+from ..crux.lazy import LazyModule
+from ..crux.util import Callback, undo_dec, undo_gesture
+
+mel = LazyModule('maya.mel')
+pm = LazyModule('pymel.all')
+shiboken2 = LazyModule('shiboken2')
 
 
 class CameramanGUI(QtWidgets.QMainWindow):
@@ -21,12 +24,18 @@ class CameramanGUI(QtWidgets.QMainWindow):
         QtWidgets.QMainWindow.__init__(self, parent)
         # dockable
         # self.setObjectName('CamTool')
-        mel.eval("colorManagementPrefs -edit -cmEnabled 1")
+        # not needed to draw the window, keep it off the show() path
+        cmds.evalDeferred(
+            'import maya.mel; maya.mel.eval("colorManagementPrefs -edit -cmEnabled 1")', lowestPriority=True
+            )
         self.callback = None
         self.setWindowTitle('CamTool')
         self.resize(675, 760)
         self.last_active_panel = None
         self.update_panel()
+        main.enable_cache('cameraman')
+        self.scene_index = scene.SceneIndex().install()
+        self.listed_state = None  # (status, index version) the lists were last synced with
 
         self.statusBar = QtWidgets.QStatusBar(self)
         set_font_size(self.statusBar, 13)
@@ -69,12 +78,19 @@ class CameramanGUI(QtWidgets.QMainWindow):
         self.prior_QPB = self.func_list.add(QtWidgets.QPushButton('Camera first'))
         self.prior_QPB.setCheckable(1)
 
+        self.profile_QPB = self.func_list.add(QtWidgets.QPushButton('Profile'))
+        self.profile_QPB.setCheckable(1)
+        self.profile_QPB.setChecked(instrument.enabled)
+
         self.refresh_cam_QPB.clicked.connect(self.refresh)
-        self.prior_QPB.clicked.connect(self.switch_lists)
+        self.profile_QPB.clicked.connect(Callback(self.toggle_profile))
+        self.prior_QPB.clicked.connect(Callback(self.switch_lists))
 
         # camera scroll area
         self.cam_listWidget = ListWidget(self.left_widget)
         self.imagePlane_listWidget = ListWidget(self.left_widget)
+        self.cam_listWidget.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.imagePlane_listWidget.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
 
         def set_menu_signal(listWidget, function):
             listWidget.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
@@ -84,7 +100,7 @@ class CameramanGUI(QtWidgets.QMainWindow):
         set_menu_signal(self.imagePlane_listWidget, self.rClick_imagePlane)
 
         # only cam currentItem changed need to update?
-        self.cam_listWidget.currentItemChanged.connect(self.update_cam_sets)
+        self.cam_listWidget.currentItemChanged.connect(Callback(self.update_cam_sets))
         # selection change - update ui
         self.cam_listWidget.itemSelectionChanged.connect(Callback(self.click_update, self.cam_listWidget))
         self.imagePlane_listWidget.itemSelectionChanged.connect(Callback(self.click_update, self.imagePlane_listWidget))
@@ -105,46 +121,44 @@ class CameramanGUI(QtWidgets.QMainWindow):
         for child in self.func_panel_vis.children():
             if isinstance(child, QtWidgets.QPushButton):
                 child.setCheckable(1)
+        self.vis_buttons = {
+            'wireframeOnShaded': self.vis_wireframeOnShaded_QPB,
+            'imagePlane': self.vis_imagePlane_QPB,
+            'gpuCache': self.vis_gpuCache_QPB,
+            'selectionHiliteDisplay': self.vis_selectionHiliteDisplay_QPB,
+            'nurbsCurves': self.vis_nurbsCurves_QPB,
+            'polymeshes': self.vis_polymeshes_QPB,
+            'camera': self.vis_cameras_QPB,
+            'locators': self.vis_locators_QPB,
+            }
+        self.shown_panel_state = None  # (panel, state) the toggles currently show
+        gui.panel_states.install()
+        for obj_type, button in self.vis_buttons.items():
+            button.clicked.connect(Callback(self.toggle_visibility, obj_type))
 
-        self.vis_wireframeOnShaded_QPB.clicked.connect(
-            lambda: gui.set_show_hide(self.update_panel(), 'wireframeOnShaded', self.vis_wireframeOnShaded_QPB.isChecked())
-            )
-        self.vis_imagePlane_QPB.clicked.connect(
-            lambda: gui.set_show_hide(self.update_panel(), 'imagePlane', self.vis_imagePlane_QPB.isChecked())
-            )
-        self.vis_gpuCache_QPB.clicked.connect(
-            lambda: gui.set_show_hide(self.update_panel(), 'gpuCache', self.vis_gpuCache_QPB.isChecked())
-            )
-        self.vis_selectionHiliteDisplay_QPB.clicked.connect(
-            lambda: gui.set_show_hide(
-                self.update_panel(), 'selectionHiliteDisplay', self.vis_selectionHiliteDisplay_QPB.isChecked()
-                )
-            )
-        self.vis_nurbsCurves_QPB.clicked.connect(
-            lambda: gui.set_show_hide(self.update_panel(), 'nurbsCurves', self.vis_nurbsCurves_QPB.isChecked())
-            )
-        self.vis_polymeshes_QPB.clicked.connect(
-            lambda: gui.set_show_hide(self.update_panel(), 'polymeshes', self.vis_polymeshes_QPB.isChecked())
-            )
-        self.vis_cameras_QPB.clicked.connect(
-            lambda: gui.set_show_hide(self.update_panel(), 'camera', self.vis_cameras_QPB.isChecked())
-            )
-        self.vis_locators_QPB.clicked.connect(
-            lambda: gui.set_show_hide(self.update_panel(), 'locators', self.vis_locators_QPB.isChecked())
-            )
 
         add_separator(self.sep_layoutWidget, 10)
 
         # right column
+        # function set: viewport filter sets, broadcast to one or every modelPanel
+        self.func_filterSet = FuncLayout(self.right_widget)
+        self.filterSet_QCombo = self.func_filterSet.add(QtWidgets.QComboBox())
+        self.filterSet_QCombo.addItems(sorted(gui.FILTER_SETS))
+        self.allPanels_QCB = self.func_filterSet.add(QtWidgets.QCheckBox('All Panels'))
+        self.applyFilterSet_QPB = self.func_filterSet.add(QtWidgets.QPushButton('Apply'))
+        self.restoreFilterSet_QPB = self.func_filterSet.add(QtWidgets.QPushButton('Restore'))
+        self.func_filterSet._layout.setStretch(0, 1)
+
+        self.applyFilterSet_QPB.clicked.connect(self.apply_filter_set)
+        self.restoreFilterSet_QPB.clicked.connect(self.restore_filter_set)
+
         # function set: color space of image plane
         self.func_colorspace = FuncLayout(self.right_widget)
         self.func_colorspace.add(QtWidgets.QLabel('Color Space'))
         self.colorspace_QCombo = self.func_colorspace.add(QtWidgets.QComboBox())
         self.colorspace_QCombo.addItems(['Raw', 'sRGB', 'ACES2065-1'])
 
-        self.colorspace_QCombo.currentIndexChanged.connect(
-            lambda: camera.set_colorspace(self.get_image_plane(), self.colorspace_QCombo.currentText())
-            )
+        self.colorspace_QCombo.currentIndexChanged.connect(Callback(self.set_colorspace))
 
         # function set: color space mode of image plane
         self.func_colorspace_mode = FuncLayout(self.right_widget)
@@ -152,30 +166,44 @@ class CameramanGUI(QtWidgets.QMainWindow):
         self.display_mode_QCombo = self.func_colorspace_mode.add(QtWidgets.QComboBox())
         self.display_mode_QCombo.addItems(['None', 'Outline', 'RGB', 'RGBA', 'Luminance', 'Alpha'])
 
-        self.display_mode_QCombo.currentIndexChanged.connect(
-            lambda: camera.set_colorspace_display_mode(self.get_image_plane(), self.display_mode_QCombo.currentIndex())
-            )
+        self.display_mode_QCombo.currentIndexChanged.connect(Callback(self.set_display_mode))
 
         # function set: Toggle look thru to force image plane to refresh
         self.func_setLookThru = FuncLayout(self.right_widget)
         self.setLookThru_QPB = self.func_setLookThru.add(QtWidgets.QPushButton('Set Look Thru'))
 
-        self.setLookThru_QPB.clicked.connect(lambda: camera.look_thru(self.get_image_plane()))
+        self.setLookThru_QPB.clicked.connect(lambda: camera.look_thru_many(self.get_image_plane_srcs()))
 
         # function set: reload image sequence by disconnecting frame expression
         self.func_reloadIS = FuncLayout(self.right_widget)
         self.reloadIS_QPB = self.func_reloadIS.add(QtWidgets.QPushButton('Reload image sequence'))
 
-        self.reloadIS_QPB.clicked.connect(lambda: camera.reload_image_sequence(self.get_image_plane()))
+        self.localCache_QPB = self.func_reloadIS.add(QtWidgets.QPushButton('Local Cache'))
+        self.localCache_QPB.setCheckable(True)
+        self.localCache_QPB.setToolTip('Scrub from local copies of the plate, prefetched around the current frame')
+
+        self.reloadIS_QPB.clicked.connect(lambda: camera.reload_image_sequences(self.get_image_plane_srcs()))
+        self.localCache_QPB.toggled.connect(self.toggle_local_cache)
 
         # function set: image path
         self.func_imageName = FuncLayout(self.right_widget)
         self.func_imageName.add(QtWidgets.QLabel('Image Name'))
         self.imageName_QLE = self.func_imageName.add(QtWidgets.QLineEdit())
         self.browseImagePath_QPB = self.func_imageName.add(QtWidgets.QPushButton('...'))
+        self.proxyScale_QCombo = self.func_imageName.add(QtWidgets.QComboBox())
+        self.proxyScale_QCombo.addItems(['half', 'quarter'])
+        self.proxy_QPB = self.func_imageName.add(QtWidgets.QPushButton('Proxy'))
+        self.proxy_QPB.setCheckable(True)
+        self.proxy_QPB.setToolTip('Show 8 bit downscaled copies of the plate, built in the background when missing')
 
         self.imageName_QLE.editingFinished.connect(lambda: self.set_image_name(self.imageName_QLE.text()))
-        self.browseImagePath_QPB.clicked.connect(self.browse_image_path)
+        self.browseImagePath_QPB.clicked.connect(Callback(self.browse_image_path))
+        self.proxy_QPB.toggled.connect(self.toggle_proxy)
+
+        # sequence picker, hidden until browsing
+        self.sequence_picker = SequencePicker(self.right_widget)
+        self.sequence_picker.setVisible(False)
+        self.sequence_picker.picked.connect(self.pick_sequence)
 
         # function set: image plane's depth and fit
         self.func_depth = FuncLayout(self.right_widget)
@@ -188,11 +216,10 @@ class CameramanGUI(QtWidgets.QMainWindow):
         self.func_depth._layout.setStretch(2, 1)
 
         self.imageDepth_QDSB.valueChanged.connect(
-            lambda: self.get_image_plane().depth.set(self.imageDepth_QDSB.value())
-            )
-        self.fit_QCombo.currentIndexChanged.connect(
-            lambda: self.get_image_plane().fit.set(self.fit_QCombo.currentIndex())
+            lambda: self.drag_plugs(self.get_image_plane_src(), ['depth'], [self.imageDepth_QDSB.value()])
             )
+        self.imageDepth_QDSB.editingFinished.connect(self.commit_drag)
+        self.fit_QCombo.currentIndexChanged.connect(Callback(self.set_fit))
 
         # function set: alpha gain
         self.func_alphaGain = FuncLayout(self.right_widget)
@@ -202,6 +229,7 @@ class CameramanGUI(QtWidgets.QMainWindow):
         self.imageAlphaGain.setSingleStep(1)
         self.imageAlphaGain.setOrientation(QtCore.Qt.Horizontal)
         self.imageAlphaGain.valueChanged.connect(self.set_alpha_gain)
+        self.imageAlphaGain.sliderReleased.connect(self.commit_drag)
 
         add_separator(self.right_widget, 10)
 
@@ -216,16 +244,10 @@ class CameramanGUI(QtWidgets.QMainWindow):
         self.func_clipPlane._layout.setStretch(1, 1)
         self.func_clipPlane._layout.setStretch(2, 1)
 
-        self.nearClipPlane_QDSB.valueChanged.connect(
-            lambda: camera.set_clip_plane(
-                self.get_cam().getShape(), self.nearClipPlane_QDSB.value(), self.farClipPlane_QDSB.value()
-                )
-            )
-        self.farClipPlane_QDSB.valueChanged.connect(
-            lambda: camera.set_clip_plane(
-                self.get_cam().getShape(), self.nearClipPlane_QDSB.value(), self.farClipPlane_QDSB.value()
-                )
-            )
+        self.nearClipPlane_QDSB.valueChanged.connect(self.set_clip_plane)
+        self.farClipPlane_QDSB.valueChanged.connect(self.set_clip_plane)
+        self.nearClipPlane_QDSB.editingFinished.connect(self.commit_drag)
+        self.farClipPlane_QDSB.editingFinished.connect(self.commit_drag)
 
         # function set: quickly lock/unlock transform attributes of camera
         self.func_lockTransform = FuncLayout(self.right_widget)
@@ -246,16 +268,19 @@ class CameramanGUI(QtWidgets.QMainWindow):
         self.func_rotateOrder._layout.setStretch(1, 1)
         self.func_rotateOrder._layout.setStretch(2, 1)
 
-        self.rotateOrder_QCombo.currentIndexChanged.connect(self.change_cam_rotateOrder)
-        self.bake_cam_QPB.clicked.connect(self.bake_cam)
+        self.rotateOrder_QCombo.currentIndexChanged.connect(Callback(self.change_cam_rotateOrder))
+        self.bake_cam_QPB.clicked.connect(Callback(self.bake_cam))
 
         add_separator(self.right_widget, 10)
 
         self.func_bake_scale = FuncLayout(self.right_widget)
         self.reset_scale = self.func_bake_scale.add(QtWidgets.QCheckBox("Reset Scale"))
         self.reset_scale.setChecked(True)
+        self.constraint_free = self.func_bake_scale.add(QtWidgets.QCheckBox("Constraint Free"))
         self.rep_world_bake_btn = self.func_bake_scale.add(QtWidgets.QPushButton("Bake"))
         self.rep_world_bake_btn.clicked.connect(self.bake_cam_world)
+        self.batch_world_bake_btn = self.func_bake_scale.add(QtWidgets.QPushButton("Bake All Selected"))
+        self.batch_world_bake_btn.clicked.connect(self.bake_selected_cams_world)
 
         add_separator(self.right_widget, 10)
 
@@ -270,16 +295,32 @@ class CameramanGUI(QtWidgets.QMainWindow):
         self.func_playblast._layout.setStretch(0, 1)
         self.func_playblast._layout.setStretch(1, 0)
 
-        self.playblast_qpb.clicked.connect(pm.playblast)
-        self.playblastOptions_qpb.clicked.connect(pm.runtime.PlayblastOptions)
+        # pymel is only loaded once a button is clicked, not while the window is built
+        self.playblast_qpb.clicked.connect(Callback(self.playblast))
+        self.playblastOptions_qpb.clicked.connect(Callback(self.playblast_options))
 
         # MISC
+        # slider/spinbox drags edit cached plugs live and are committed as one undo once they settle
+        self.plugs = plugs.PlugCache()
+        self.drag = plugs.PlugDrag()
+        self.drag_timer = QtCore.QTimer(self)
+        self.drag_timer.setSingleShot(True)
+        self.drag_timer.setInterval(500)
+        self.drag_timer.timeout.connect(self.commit_drag)
+        # selection changed events are coalesced into one deferred update per idle tick
+        self.selection_pending = False
+        self.selection_stats = {'events': 0, 'coalesced': 0, 'updates': 0, 'deferred_hidden': 0}
+        self.selection_timer = QtCore.QTimer(self)
+        self.selection_timer.setSingleShot(True)
+        self.selection_timer.setInterval(0)
+        self.selection_timer.timeout.connect(self.flush_selection_update)
         self.sc_callback = om2.MEventMessage.addEventCallback(
             "SelectionChanged", Callback(selection_changed_cam_tool, ui=self)
             )
         self.update_imagePlane_sets()
         self.update_cam_sets()
 
+    @undo_gesture('rotateOrder')
     def change_cam_rotateOrder(self):
         transform.set_rotate_order(self.get_cam(), self.rotateOrder_QCombo.currentText())
 
@@ -288,31 +329,115 @@ class CameramanGUI(QtWidgets.QMainWindow):
         if not cam:
             util.warning('No active camera', ui=self.statusBar)
             return
-        camera.bake_to_world2(
+        mode = 'context' if self.constraint_free.isChecked() else 'constraint'
+        elapsed = camera.bake_to_world2(
             str(cam),
-            reset_scale=self.reset_scale.isChecked()
+            reset_scale=self.reset_scale.isChecked(),
+            mode=mode
         )
+        if elapsed is not None:
+            self.statusBar.showMessage('Baked {} ({}) in {:.2f}s'.format(cam, mode, elapsed), 5000)
+
+    def bake_selected_cams_world(self):
+        """ Bake every camera selected in the camera list to world in one pass """
+        cams = [main.handle_tsf(i.src, 'fullPath') for i in self.cam_listWidget.selectedItems() if i.src.isValid()]
+        if not cams:
+            util.warning('You haven\'t select any camera in the list', ui=self.statusBar)
+            return
+        baked = camera.bake_many_to_world(cams, reset_scale=self.reset_scale.isChecked())
+        if baked:
+            self.statusBar.showMessage('Baked {} cameras to world'.format(len(baked)), 5000)
 
     @undo_dec
     def bake_cam(self):
         transform.bake_to_world(self.get_cam())
 
+    def schedule_selection_update(self):
+        """ Queue a UI update for the Maya selection, bursts of events end up in one update """
+        self.selection_stats['events'] += 1
+        if self.selection_pending:
+            self.selection_stats['coalesced'] += 1
+            return
+        self.selection_pending = True
+        if self.isVisible() and not self.isMinimized():
+            self.selection_timer.start()
+        else:
+            self.selection_stats['deferred_hidden'] += 1
+
+    def flush_selection_update(self):
+        """ Run the pending selection update, skipped (and kept pending) while the window is hidden """
+        if not self.selection_pending or not self.isVisible() or self.isMinimized():
+            return
+        self.selection_pending = False
+        self.selection_stats['updates'] += 1
+        update_by_selection(self)
+
+    def showEvent(self, event):
+        super(CameramanGUI, self).showEvent(event)
+        if self.selection_pending:
+            self.selection_timer.start()
+
+    def changeEvent(self, event):
+        super(CameramanGUI, self).changeEvent(event)
+        if event.type() == QtCore.QEvent.WindowStateChange and self.selection_pending:
+            self.selection_timer.start()
+
+    def toggle_profile(self):
+        """ Start recording call timings, or stop and dump them """
+        if self.profile_QPB.isChecked():
+            instrument.reset()
+            instrument.enable()
+            self.statusBar.showMessage('Profiling...')
+            return
+        instrument.disable()
+        path = instrument.dump_json()
+        instrument.dump_chrome_trace(path[:-len('json')] + 'trace.json')
+        self.statusBar.showMessage('Profile saved to {}'.format(path), 10000)
+
+    def vis_panels(self):
+        """ panels the visibility toggles act on """
+        if self.allPanels_QCB.isChecked():
+            return gui.model_panels()
+        panel = self.update_panel()
+        return [panel] if panel else []
+
+    def toggle_visibility(self, obj_type):
+        """ Show/hide obj_type in the active panel, or every modelPanel when All Panels is on """
+        panels = self.vis_panels()
+        if not panels:
+            util.warning('You have to ACTIVE a panel', ui=self.statusBar)
+            return
+        gui.apply_panel_state(panels, {obj_type: self.vis_buttons[obj_type].isChecked()})
+
+    def apply_filter_set(self):
+        """ Apply the chosen filter set and report the viewport frame rate change """
+        panels = self.vis_panels()
+        if not panels:
+            util.warning('You have to ACTIVE a panel', ui=self.statusBar)
+            return
+        before, after = gui.apply_filter_set(self.filterSet_QCombo.currentText(), panels, measure=True)
+        self.shown_panel_state = None
+        self.statusBar.showMessage('Viewport {:.1f} -> {:.1f} fps'.format(before, after), 5000)
+
+    def restore_filter_set(self):
+        """ Restore the panels changed by filter sets """
+        before, after = gui.restore_filter_set(measure=True)
+        self.shown_panel_state = None
+        self.statusBar.showMessage('Viewport {:.1f} -> {:.1f} fps'.format(before, after), 5000)
+
     def enterEvent(self, event):
-        """ Update panel show/hide option when mouse enter the UI """
+        """
+        Update panel show/hide option when mouse enter the UI, only touched if the panel or its state changed.
+        The attribute widgets are always read again, the attributes may have been edited anywhere in Maya.
+        """
         current_panel = self.update_panel()
         if not current_panel:
             return
-        self.vis_gpuCache_QPB.setChecked(
-            bool(cmds.modelEditor(current_panel, q=1, queryPluginObjects='gpuCacheDisplayFilter'))
-            )
-        self.vis_imagePlane_QPB.setChecked(bool(cmds.modelEditor(current_panel, q=1, imagePlane=1)))
-        self.vis_wireframeOnShaded_QPB.setChecked(bool(cmds.modelEditor(current_panel, q=1, wireframeOnShaded=1)))
-        self.vis_nurbsCurves_QPB.setChecked(bool(cmds.modelEditor(current_panel, q=1, nurbsCurves=1)))
-        self.vis_polymeshes_QPB.setChecked(bool(cmds.modelEditor(current_panel, q=1, polymeshes=1)))
-        self.vis_cameras_QPB.setChecked(bool(cmds.modelEditor(current_panel, q=1, cameras=1)))
-        self.vis_selectionHiliteDisplay_QPB.setChecked(
-            bool(cmds.modelEditor(current_panel, q=1, selectionHiliteDisplay=1))
-            )
+        state = gui.panel_states.get(current_panel)
+        if self.shown_panel_state != (current_panel, state):
+            self.shown_panel_state = (current_panel, dict(state))
+            for obj_type, button in self.vis_buttons.items():
+                button.setChecked(state[obj_type])
         self.update_cam_sets()
         self.update_imagePlane_sets()
 
@@ -325,16 +450,23 @@ class CameramanGUI(QtWidgets.QMainWindow):
                 for child in func_layout.children():
                     child.blockSignals(block)
 
+    def playblast(self):
+        pm.playblast()
+
+    def playblast_options(self):
+        pm.runtime.PlayblastOptions()
+
     @undo_dec
     def set_image_name(self, text):
-        """ Set path of imagePlane """
-        if not camera.set_image_name(self.get_image_plane(), text):
+        """ Set path of every selected imagePlane, one viewport reset for all of them """
+        imagePlanes = self.get_image_plane_srcs()
+        if not camera.set_image_names(imagePlanes, text):
             util.warning('image not exists', ui=self.statusBar)
             self.imageName_QLE.setText('')
             return
         self.imageName_QLE.setText(text)
-        pm.mel.eval('ogs -reset')
-        # reload_image_sequence(self.get_image_plane())
+        if len(imagePlanes) > 1:
+            self.statusBar.showMessage('Image set on {} imagePlanes'.format(len(imagePlanes)), 5000)
 
     def refresh(self):
         """ Refresh button function: clear all listWidget and then add back """
@@ -342,13 +474,89 @@ class CameramanGUI(QtWidgets.QMainWindow):
         for listWidget in self.cam_listWidget, self.imagePlane_listWidget:
             for i in range(listWidget.count()):
                 listWidget.takeItem(0)
+        self.scene_index.build()
+        self.listed_state = None
         self.switch_lists(force=self.prior_QPB.isChecked())
+        self.statusBar.showMessage(
+            'mobj2 cache: {hits} hits / {misses} misses'.format(**main.cache_stats), 5000
+            )
+
+    def toggle_proxy(self, state):
+        """ switch the selected imagePlanes between their plates and proxies, proxies are built off the main thread """
+        imagePlanes = self.get_image_plane_srcs()
+        if not state:
+            camera.use_full(imagePlanes)
+            self.update_imagePlane_sets()
+            return
+        self.proxy_QPB.setEnabled(0)
+        self.statusBar.showMessage('Building proxies for {} imagePlanes...'.format(len(imagePlanes)))
+        camera.use_proxy(imagePlanes, self.proxyScale_QCombo.currentText(), done=self.proxy_done)
+
+    def proxy_done(self, results):
+        if not shiboken2.isValid(self):
+            return  # closed while building
+        errors = [r for r in results.values() if not isinstance(r, dict)]
+        converted = sum(len(r['converted']) for r in results.values() if isinstance(r, dict))
+        failed = sum(len(r['failed']) for r in results.values() if isinstance(r, dict))
+        for error in errors:
+            util.warning(error, ui=self.statusBar)
+        if not errors:
+            self.statusBar.showMessage('Proxies: {} frames converted, {} failed'.format(converted, failed), 5000)
+        self.update_imagePlane_sets()
+
+    def toggle_local_cache(self, state):
+        """ point the selected imagePlanes to (or back from) the local frame cache """
+        imagePlanes = self.get_image_plane_srcs()
+        for imagePlane in imagePlanes:
+            if not state:
+                camera.sequence_manager.detach(imagePlane)
+            elif camera.sequence_manager.attach(imagePlane) is None:
+                name = main.mobj2(imagePlane, 'shortName')
+                util.warning("{} is not an image sequence or can't be cached".format(name), ui=self.statusBar)
+        self.update_imagePlane_sets()
 
     def set_alpha_gain(self):
-        ip = self.get_image_plane()
-        if ip:
-            ip.alphaGain.set(self.imageAlphaGain.value() / 50.)
+        self.drag_plugs(self.get_image_plane_src(), ['alphaGain'], [self.imageAlphaGain.value() / 50.])
+
+    def set_clip_plane(self):
+        self.drag_plugs(
+            self.get_cam_src(), ['nearClipPlane', 'farClipPlane'],
+            [self.nearClipPlane_QDSB.value(), self.farClipPlane_QDSB.value()]
+            )
+
+    def drag_plugs(self, src, attrs, values):
+        """ live edit, the undo step is made by commit_drag when the slider is released or the value settles """
+        if src is None or not src.isValid():
+            return
+        self.drag.set(self.plugs.get_many(src, attrs), values)
+        if not self.imageAlphaGain.isSliderDown():
+            self.drag_timer.start()
+
+    def commit_drag(self):
+        self.drag_timer.stop()
+        if self.drag.active:
+            self.drag.end()
+
+    def set_plug(self, src, attr, value):
+        """ edit of a cached plug outside of a drag """
+        if src is None or not src.isValid():
+            return
+        self.commit_drag()
+        cmds.setAttr(plugs.plug_path(self.plugs.get(src, attr)), value)
 
+    @undo_gesture('fit')
+    def set_fit(self):
+        self.set_plug(self.get_image_plane_src(), 'fit', self.fit_QCombo.currentIndex())
+
+    @undo_gesture('colorSpace')
+    def set_colorspace(self):
+        camera.set_colorspaces(self.get_image_plane_srcs(), self.colorspace_QCombo.currentText())
+
+    @undo_gesture('displayMode')
+    def set_display_mode(self):
+        camera.set_colorspace_display_modes(self.get_image_plane_srcs(), self.display_mode_QCombo.currentIndex())
+
+    @instrument.timed()
     def update_cam_sets(self):
         """ update camera attribute on UI by selection """
         self.block_signal(1)
@@ -363,31 +571,28 @@ class CameramanGUI(QtWidgets.QMainWindow):
         if not src.isValid():
             self.block_signal(0)
             return
-        cam = pm.PyNode(main.mobj2(src, 'fullPath'))
-        cam_scale = cam.cameraScale.get()
+        self.commit_drag()
+        values = scene.query_camera(src, self.plugs)
+        cam_scale = values['cameraScale']
         self.camScale.setText('  {}  '.format(cam_scale))
         if not cam_scale == 1.:
             assign_bg_color(self.camScale, 'red')
         else:
             self.camScale.setStyleSheet('')
-        if cam.nearClipPlane.isSettable():
-            self.nearClipPlane_QDSB.setValue(cam.nearClipPlane.get())
-            self.nearClipPlane_QDSB.setEnabled(1)
-        else:
-            self.nearClipPlane_QDSB.setEnabled(0)
-        if cam.farClipPlane.isSettable():
-            self.farClipPlane_QDSB.setValue(cam.farClipPlane.get())
-            self.farClipPlane_QDSB.setEnabled(1)
+        for spin_box, attr in (self.nearClipPlane_QDSB, 'nearClipPlane'), (self.farClipPlane_QDSB, 'farClipPlane'):
+            if attr in values['locked']:
+                spin_box.setEnabled(0)
+            else:
+                spin_box.setValue(values[attr])
+                spin_box.setEnabled(1)
+        if 'rotateOrder' in values['locked']:
+            self.rotateOrder_QCombo.setEnabled(0)
         else:
-            self.farClipPlane_QDSB.setEnabled(0)
-        cam_tsf = cam.getParent()
-        if cam_tsf.rotateOrder.isSettable():
-            self.rotateOrder_QCombo.setCurrentIndex(cam_tsf.rotateOrder.get())
+            self.rotateOrder_QCombo.setCurrentIndex(values['rotateOrder'])
             self.rotateOrder_QCombo.setEnabled(1)
-        else:
-            self.rotateOrder_QCombo.setEnabled(0)
         self.block_signal(0)
 
+    @instrument.timed()
     def update_imagePlane_sets(self):
         """ update imagePlane attribute on UI by selection """
         self.block_signal(1)
@@ -402,50 +607,81 @@ class CameramanGUI(QtWidgets.QMainWindow):
             self.imageName_QLE.setText('')
             self.setLookThru_QPB.setEnabled(0)
             self.reloadIS_QPB.setEnabled(0)
+            self.localCache_QPB.setEnabled(0)
             self.imageName_QLE.setEnabled(0)
             self.browseImagePath_QPB.setEnabled(0)
+            self.proxy_QPB.setEnabled(0)
             self.block_signal(0)
             return
         src = sl[0].src
         if not src.isValid():
             self.block_signal(0)
             return
-        imagePlane = imagePlane_to_pynode(src)[-1]
+        self.commit_drag()
+        values = scene.query_image_plane(src, self.plugs)
         self.setLookThru_QPB.setEnabled(1)
         self.fit_QCombo.setEnabled(1)
         self.reloadIS_QPB.setEnabled(1)
+        self.localCache_QPB.setEnabled(1)
+        self.localCache_QPB.setChecked(main.mobj2(src, 'fullPath') in camera.sequence_manager.planes)
         self.imageName_QLE.setEnabled(1)
         self.browseImagePath_QPB.setEnabled(1)
+        self.proxy_QPB.setEnabled(1)
+        self.proxy_QPB.setChecked(main.mobj2(src, 'fullPath') in camera.proxy_planes)
         self.colorspace_QCombo.setEnabled(1)
         self.display_mode_QCombo.setEnabled(1)
         self.imageDepth_QDSB.setEnabled(1)
         self.imageAlphaGain.setEnabled(1)
         self.imageName_QLE.setEnabled(1)
-        current_colorpsace = imagePlane.colorSpace.get()
+        current_colorpsace = values['colorSpace']
         if current_colorpsace in ['Raw', 'sRGB', 'ACES2065-1']:
-            self.colorspace_QCombo.setCurrentIndex({'Raw': 0, 'sRGB': 1, 'ACES2065-1': 2}[imagePlane.colorSpace.get()])
+            self.colorspace_QCombo.setCurrentIndex({'Raw': 0, 'sRGB': 1, 'ACES2065-1': 2}[current_colorpsace])
         else:
             util.warning("Colorspace is not one of 'Raw','sRGB','ACES2065-1', the UI wont update", self.statusBar)
-        self.fit_QCombo.setCurrentIndex(imagePlane.fit.get())
-        self.display_mode_QCombo.setCurrentIndex(
-            {'None': 0, 'Outline': 1, 'RGB': 2, 'RGBA': 3, 'Luminance': 4, 'Alpha': 5}[
-                imagePlane.displayMode.get(asString=1)]
-            )
-        self.imageDepth_QDSB.setValue(imagePlane.depth.get())
-        self.imageAlphaGain.setValue(imagePlane.alphaGain.get() * 50)
-        self.imageName_QLE.setText(imagePlane.imageName.get())
+        self.fit_QCombo.setCurrentIndex(values['fit'])
+        self.display_mode_QCombo.setCurrentIndex(values['displayMode'])
+        self.imageDepth_QDSB.setValue(values['depth'])
+        self.imageAlphaGain.setValue(values['alphaGain'] * 50)
+        self.imageName_QLE.setText(values['imageName'])
         self.block_signal(0)
 
     def closeEvent(self, event):
         """ Remove callback on UI Closing """
+        self.selection_timer.stop()
+        self.commit_drag()
+        util.undo.end()
+        camera.sequence_manager.detach()
+        self.sequence_picker.scanner.close()
+        self.plugs.clear()
         try:
             om2.MMessage.removeCallback(self.sc_callback)
         except:
             pass
+        self.scene_index.remove()
+        main.disable_cache('cameraman')
+        gui.panel_states.remove()
 
-    @undo_dec
     def browse_image_path(self):
-        """ Browse image path for imagePlane """
+        """ Show the sequence picker at the directory of the current image """
+        if self.sequence_picker.isVisible():
+            self.sequence_picker.setVisible(False)
+            return
+        line = self.imageName_QLE.text()
+        directory = os.path.dirname(line) if line else os.path.expanduser('~')
+        self.sequence_picker.setVisible(True)
+        self.sequence_picker.scan(directory)
+
+    @undo_dec
+    def pick_sequence(self, path):
+        """ picked from a fresh directory listing, no need to check the file on the main thread """
+        imagePlanes = self.get_image_plane_srcs()
+        if camera.set_image_names(imagePlanes, path, check=False):
+            self.imageName_QLE.setText(path)
+            self.sequence_picker.setVisible(False)
+
+    @undo_dec
+    def browse_image_file(self):
+        """ Browse image path for imagePlane with Maya's file dialog """
         usd = pm.internalVar(usd=True)
         usd = '/'.join(usd.split('/')[:4]) + '/scripts'
         line = self.imageName_QLE.text()
@@ -481,6 +717,8 @@ class CameramanGUI(QtWidgets.QMainWindow):
         if listWidget == self.cam_listWidget:
             action_lookThru = self.list_menu.addAction('Look Thru')
             self.connect(action_lookThru, QtCore.SIGNAL('triggered()'), lambda: self.lookThru(listWidget))
+            action_importChan = self.list_menu.addAction('Import .chan')
+            self.connect(action_importChan, QtCore.SIGNAL('triggered()'), lambda: self.import_chan(listWidget))
         action_rename = self.list_menu.addAction('Rename')
         self.connect(action_rename, QtCore.SIGNAL('triggered()'), lambda: self.rename_item(listWidget))
         action_delete = self.list_menu.addAction('Delete')
@@ -533,6 +771,24 @@ class CameramanGUI(QtWidgets.QMainWindow):
         fp = main.mobj2(main.get_parent(src.object()), 'fullPath')
         mel.eval('lookThroughModelPanel {} {}'.format(fp, self.update_panel()))
 
+    def import_chan(self, list_widget):
+        """ Key current camera in listWidget from a .chan file """
+        item = list_widget.currentItem()
+        if not item or not item.src.isValid():
+            return
+        file_path = pm.fileDialog2(
+            dialogStyle=2, caption='Import .chan', fileMode=1, fileFilter='Chan (*.chan *.txt *.csv);;All (*.*)'
+            )
+        if not file_path:
+            return
+        try:
+            cam_tsf = camera.import_chan(item.src, file_path[0])
+        except (IOError, OSError, ValueError) as e:
+            util.warning(str(e), ui=self.statusBar)
+            return
+        self.statusBar.showMessage('Keyed {} from {}'.format(cam_tsf, os.path.basename(file_path[0])), 5000)
+        self.update_cam_sets()
+
     @undo_dec
     def rename_item(self, list_widget, n=None):
         """ Rename current item in listWidget """
@@ -565,26 +821,37 @@ class CameramanGUI(QtWidgets.QMainWindow):
             list_widget.takeItem(list_widget.row(item))
         list_widget.update_names()
 
+    @instrument.timed()
     def switch_lists(self, force=None):
-        """ Switch the order of two listWidget and update accordingly """
+        """ Switch the order of two listWidget and update accordingly, only diff the lists with the scene index """
         self.block_signal(1)
         status = self.prior_QPB.isChecked() if force == None else force
-        type_list = ['camera', 'imagePlane']
-        mType = [om2.MFn.kCamera, om2.MFn.kImagePlane][status]
-        lss = main.api_ls('mobj', obj_type=mType)
         widget_list = [self.cam_listWidget, self.imagePlane_listWidget]
-        self.prior_QPB.setText(['Camera first', 'imagePlane first'][status])
-        scroll_as = self.cam_listWidget.scrollArea, self.imagePlane_listWidget.scrollArea
-        self.left_layout.removeWidget(scroll_as[1 - status])
-        self.left_layout.addWidget(scroll_as[1 - status])
-        self.imagePlane_listWidget.clear()
-        self.cam_listWidget.clear()
-        remove_skip_cam = []
-        for cam in lss:
-            sn = main.mobj2(cam, 'shortName')
+        state = (status, self.scene_index.version)
+        if state == self.listed_state:
+            self.block_signal(0)
+            return
+        if self.listed_state is None or self.listed_state[0] != status:
+            self.prior_QPB.setText(['Camera first', 'imagePlane first'][status])
+            scroll_as = self.cam_listWidget.scrollArea, self.imagePlane_listWidget.scrollArea
+            self.left_layout.removeWidget(scroll_as[1 - status])
+            self.left_layout.addWidget(scroll_as[1 - status])
+            widget_list[0].clear()
+            widget_list[1].clear()
+        mType = [om2.MFn.kCamera, om2.MFn.kImagePlane][status]
+        handles = []
+        for handle in self.scene_index.ls(mType):
+            sn = main.mobj2(handle, 'shortName')
             if not 'shakeCam' in sn and not 'tweakCam' in sn:
-                widget_list[status].add(main.mobj2(cam, 'handle'))
+                handles.append(handle)
+        widget_list[status].sync(handles)
+        self.listed_state = state
         self.block_signal(0)
+        # connections may have changed as well, refresh the dependent list
+        if widget_list[status].selectedItems():
+            self.click_update(widget_list[status])
+        else:
+            widget_list[1 - status].clear()
 
     def click_update(self, listWidget):
         list_widgets = self.cam_listWidget, self.imagePlane_listWidget
@@ -607,13 +874,12 @@ class CameramanGUI(QtWidgets.QMainWindow):
         self.update_cam_sets()
         list_widgets = self.cam_listWidget, self.imagePlane_listWidget
         index = list_widgets.index(listWidget)
-        get_connected_cmd = [get_connected_imagePlane, get_connected_cam][index]
         if int(self.prior_QPB.isChecked()) == 1 - index:  # pass if is active one is at the bottom
             return
         src_widget = list_widgets[index]
         dst_widget = list_widgets[1 - index]
         dst_widget.clear()
-        connected_tsf = get_connected_cmd(item.src)
+        connected_tsf = self.scene_index.connected(item.src)
         if not connected_tsf:
             return
         for i in connected_tsf:
@@ -642,6 +908,11 @@ class CameramanGUI(QtWidgets.QMainWindow):
 
     def get_cam(self):
         """ get camera PyNode from listWidget """
+        cam = self.get_cam_src()
+        return pm.PyNode(main.mobj2(cam, 'fullPath')).getParent() if cam else None
+
+    def get_cam_src(self):
+        """ get the MObjectHandle of the camera shape from listWidget """
         cam = None
         if not self.cam_listWidget.count():
             util.warning('You have no cam in cam list.', ui=self.statusBar)
@@ -655,11 +926,23 @@ class CameramanGUI(QtWidgets.QMainWindow):
             else:
                 util.warning('You haven\'t select any camera in the list', ui=self.statusBar)
                 return None
-        cam = pm.PyNode(main.mobj2(cam, 'fullPath')).getParent()
         return cam
 
     def get_image_plane(self):
         """ get imagePlane PyNode from listWidget """
+        imagePlane = self.get_image_plane_src()
+        return imagePlane_to_pynode(imagePlane)[-1] if imagePlane else None
+
+    def get_image_plane_srcs(self):
+        """ MObjectHandles of every imagePlane selected in the listWidget, for batch edits """
+        imagePlanes = [i.src for i in self.imagePlane_listWidget.selectedItems() if i.src.isValid()]
+        if imagePlanes:
+            return imagePlanes
+        imagePlane = self.get_image_plane_src()
+        return [imagePlane] if imagePlane else []
+
+    def get_image_plane_src(self):
+        """ get the MObjectHandle of the imagePlane from listWidget """
         imagePlane = None
         if not self.imagePlane_listWidget.count():
             util.warning('You have no imagePlane in list.', ui=self.statusBar)
@@ -673,13 +956,14 @@ class CameramanGUI(QtWidgets.QMainWindow):
             else:
                 util.warning('You haven\'t select any camera in the list', ui=self.statusBar)
                 return None
-        imagePlane = imagePlane_to_pynode(imagePlane)[-1]
         return imagePlane
 
 
 class ListWidget(QtWidgets.QListWidget):
     def __init__(self, parent):
         super(ListWidget, self).__init__()
+        self.items_by_hash = {}  # MObjectHandle.hashCode() -> item
+        self.items_by_path = {}  # full path -> item
         self.scrollArea = QtWidgets.QScrollArea(parent)
         parent.layout().addWidget(self.scrollArea)
         self.scrollArea.setWidgetResizable(True)
@@ -695,7 +979,7 @@ class ListWidget(QtWidgets.QListWidget):
         """ Shortcut to add QtWidgets"""
         self.addItem(main.handle_tsf(item, 'shortName'))
         p_path = main.handle_tsf(item, 'partialPath')
-        last = self.list_items()[2][-1]
+        last = self.item(self.count() - 1)
         last.setToolTip(p_path)
         try:
             if cmds.camera(p_path, q=1, startupCamera=1):
@@ -703,17 +987,61 @@ class ListWidget(QtWidgets.QListWidget):
         except:
             pass
         last.src = main.mobj2(item, 'handle')
+        last.full_path = main.mobj2(last.src, 'fullPath')
+        self.items_by_hash[last.src.hashCode()] = last
+        self.items_by_path[last.full_path] = last
         return last
 
+    def takeItem(self, row):
+        item = super(ListWidget, self).takeItem(row)
+        if item is not None and hasattr(item, 'src'):
+            if self.items_by_hash.get(item.src.hashCode()) is item:
+                del self.items_by_hash[item.src.hashCode()]
+            if self.items_by_path.get(item.full_path) is item:
+                del self.items_by_path[item.full_path]
+        return item
+
+    def clear(self):
+        super(ListWidget, self).clear()
+        self.items_by_hash.clear()
+        self.items_by_path.clear()
+
+    def sync(self, handles):
+        """ Diff the items against given handles: drop the missing ones, add the new ones """
+        wanted = dict((handle.hashCode(), handle) for handle in handles)
+        for item in [self.item(i) for i in range(self.count())]:
+            if not item.src.isValid() or item.src.hashCode() not in wanted:
+                self.takeItem(self.row(item))
+            else:
+                wanted.pop(item.src.hashCode())
+        for handle in handles:
+            if handle.hashCode() in wanted:
+                self.add(handle)
+        self.update_names()
+
     def update_names(self):
-        """ update item names """
+        """ update item names, and the path index since renaming/reparenting changes the paths """
         items = [self.item(i) for i in range(self.count())]
+        self.items_by_path.clear()
         for c, item in enumerate(items):
             if not item.src.isValid():
                 self.takeItem(self.row(item))
             else:
                 item.setToolTip(main.handle_tsf(item.src, 'partialPath'))
                 item.setText(main.handle_tsf(item.src, 'shortName'))
+                item.full_path = main.mobj2(item.src, 'fullPath')
+                self.items_by_path[item.full_path] = item
+
+    def find(self, input):
+        """ get item by MObject/MObjectHandle/MDagPath or full path, None if it's not listed """
+        if isinstance(input, string_types):
+            return self.items_by_path.get(input)
+        if isinstance(input, om2.MDagPath):
+            input = input.node()
+        if isinstance(input, om2.MObject):
+            input = om2.MObjectHandle(input)
+        if isinstance(input, om2.MObjectHandle):
+            return self.items_by_hash.get(input.hashCode())
 
     def list_items(self):
         """ list different types of item """
@@ -722,7 +1050,7 @@ class ListWidget(QtWidgets.QListWidget):
         for item in items:
             if hasattr(item, 'src'):
                 src.append(item.src)
-                full_path_names.append(main.mobj2(item.src, 'fullPath'))
+                full_path_names.append(item.full_path)
             else:
                 src.append(None)
                 full_path_names.append(None)
@@ -737,30 +1065,110 @@ class ListWidget(QtWidgets.QListWidget):
         return item.text(), item.src, item
 
     def set_selected(self, input):
-        """ set selected by different types of input should be implemented more """
+        """ set selected by index, item, displayed name, or anything find() accepts """
         if isinstance(input, integer_types):
             self.setCurrentItem(self.item(input))
-        elif isinstance(input, string_types):
-            names = self.list_items()[0]
-            self.setCurrentItem(self.item(names.index(input)))
         elif isinstance(input, QtWidgets.QListWidgetItem):
             self.setCurrentItem(input)
-        elif isinstance(input, om2.MObject):
-            idx = self.list_items()[3].index(main.mobj2(input, 'fullPath'))
-            self.setCurrentItem(self.item(idx))
+        else:
+            item = self.find(input)
+            if item is None and isinstance(input, string_types):
+                found = self.findItems(input, QtCore.Qt.MatchExactly)
+                item = found[0] if found else None
+            if item is not None:
+                self.setCurrentItem(item)
 
     def remove(self, input):
-        """ remove selected by different types of input should be implemented more """
+        """ remove by index, item, displayed name, or anything find() accepts """
         if not isinstance(input, integer_types):
-            names = [i[0] for i in self.list_items()]
-            if isinstance(input, string_types):
-                input = names.index(input)
-            elif isinstance(input, QtWidgets.QListWidgetItem):
-                input = names.index(input.text())
-                self.setCurrentItem(input)
+            item = input if isinstance(input, QtWidgets.QListWidgetItem) else self.find(input)
+            if item is None and isinstance(input, string_types):
+                found = self.findItems(input, QtCore.Qt.MatchExactly)
+                item = found[0] if found else None
+            if item is None:
+                return
+            input = self.row(item)
         self.takeItem(input)
 
 
+class SequencePicker(QtWidgets.QWidget):
+    """
+    Directory listing with frame files collapsed into sequences (stills and movies listed as they are),
+    read in the background and shown as it comes
+    """
+    picked = QtCore.Signal(str)  # a frame of the picked sequence, or the picked still/movie
+    # scanner callbacks come from its threads, signals queue them to the UI thread
+    listing_partial = QtCore.Signal(str, object, object, object)
+    listing_done = QtCore.Signal(str, object, object, object, object)
+
+    def __init__(self, parent):
+        super(SequencePicker, self).__init__()
+        parent.layout().addWidget(self)
+        self._layout = QtWidgets.QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self.path_QLE = QtWidgets.QLineEdit(self)
+        self.listing_QLW = QtWidgets.QListWidget(self)
+        self.file_dialog_QPB = QtWidgets.QPushButton('File Dialog...', self)
+        for widget in self.path_QLE, self.listing_QLW, self.file_dialog_QPB:
+            self._layout.addWidget(widget)
+        self.directory = None
+        self.scanner = sequence.Scanner()
+
+        self.path_QLE.returnPressed.connect(lambda: self.scan(self.path_QLE.text()))
+        self.listing_QLW.itemDoubleClicked.connect(self.activate)
+        self.file_dialog_QPB.clicked.connect(Callback(self.open_file_dialog))
+        self.listing_partial.connect(self.show_listing)
+        self.listing_done.connect(self.scan_done)
+
+    def scan(self, directory):
+        directory = os.path.normpath(directory)
+        self.directory = directory
+        self.path_QLE.setText(directory)
+        self.listing_QLW.clear()
+        self.listing_QLW.addItem('scanning...')
+        self.scanner.scan([directory], partial=self.listing_partial.emit, done=self.listing_done.emit)
+
+    def show_listing(self, directory, subdirectories, sequences, singles):
+        if directory != self.directory:
+            return  # an older scan
+        self.listing_QLW.clear()
+        item = QtWidgets.QListWidgetItem('..')
+        item.path = os.path.dirname(directory)
+        self.listing_QLW.addItem(item)
+        for name in subdirectories:
+            item = QtWidgets.QListWidgetItem(name + '/')
+            item.path = os.path.join(directory, name)
+            self.listing_QLW.addItem(item)
+        for plate in sequences:
+            item = QtWidgets.QListWidgetItem(str(plate))
+            item.path = plate.path(plate.first)
+            item.picked = True
+            self.listing_QLW.addItem(item)
+        for name in singles:
+            item = QtWidgets.QListWidgetItem(name)
+            item.path = os.path.join(directory, name)
+            item.picked = True
+            self.listing_QLW.addItem(item)
+
+    def scan_done(self, directory, subdirectories, sequences, singles, error):
+        if directory != self.directory:
+            return
+        if error:
+            self.listing_QLW.clear()
+            self.listing_QLW.addItem(error)
+            return
+        self.show_listing(directory, subdirectories, sequences, singles)
+
+    def activate(self, item):
+        if getattr(item, 'picked', False):
+            self.picked.emit(item.path)
+        elif getattr(item, 'path', None):
+            self.scan(item.path)
+
+    def open_file_dialog(self):
+        self.parent().window().browse_image_file()
+
+
 class FuncLayout(QtWidgets.QWidget):
     def __init__(self, parent):
         super(FuncLayout, self).__init__()
@@ -814,9 +1222,16 @@ def init_window():
     return ui
 
 
+@instrument.timed()
 def selection_changed_cam_tool(*args, **kwargs):
-    """ Callback function to update the UI by Maya selection changed event """
+    """ Callback function of Maya selection changed event, defer the UI update to the next idle tick """
     ui = kwargs.get('ui')
+    ui.schedule_selection_update()
+
+
+@instrument.timed()
+def update_by_selection(ui):
+    """ update the UI by the last selected camera/imagePlane """
     sel_list = om2.MGlobal.getActiveSelectionList()
     if not sel_list.length():
         return None, None
@@ -835,59 +1250,44 @@ def update_ui(node, mode='cam', ui=None):
     index = {'cam': 0, 'imagePlane': 1}[mode]
     listWidget = ui.cam_listWidget, ui.imagePlane_listWidget
     updating_listWidget = listWidget[index]
-    get_connected_cmd = [get_connected_cam, get_connected_imagePlane][1 - index]
     ui.switch_lists(force=ui.prior_QPB.isChecked())
-    _, _, _, full_path = updating_listWidget.list_items()
-    item = [updating_listWidget.item(i) for i in range(updating_listWidget.count())]
-    fp = main.mobj2(node, 'fullPath')
-    if fp in full_path:
-        updating_listWidget.set_selected(updating_listWidget.item(full_path.index(fp)))
+    item = updating_listWidget.find(node)
+    if item:
+        updating_listWidget.set_selected(item)
     else:
-        connected = get_connected_cmd(node)
-        if connected:
-            connected = connected[0]
-        connected_fp = main.mobj2(connected, 'fullPath')
-        all_fp = listWidget[1 - index].list_items()[3]
-        if not connected_fp in all_fp:
-            return
-        idx = all_fp.index(connected_fp)
-        listWidget[1 - index].set_selected(listWidget[1 - index].item(idx))
-        idx = updating_listWidget.list_items()[3].index(fp)
-        updating_listWidget.set_selected(updating_listWidget.item(idx))
-
-
-def get_connected_cam(imagePlane):
-    """ get camera by given object's message connection (and has to be a camera node)"""
-    connected = []
-    fn = main.mobj2(imagePlane, 'fn')
-    plug = fn.findPlug('message', False)
-    for i in plug.connectedTo(0, 1):
-        if i.node().hasFn(om2.MFn.kCamera):
-            connected.append(i.node())
-    return connected
-
-
-def get_connected_imagePlane(cam):
-    """ get imagePlane by given object's imagePlane attribute connection (and has to be a imagePlane node) """
-    connected = []
-    fn = main.mobj2(cam, 'fn')
-    plug = fn.findPlug('imagePlane', False)
-    for c in range(plug.numConnectedElements()):
-        for connected_plug in plug.connectionByPhysicalIndex(c).connectedTo(1, 0):
-            if connected_plug.node().hasFn(om2.MFn.kImagePlane):
-                connected.append(connected_plug.node())
-    return connected
+        connected = ui.scene_index.connected(node)
+        if not connected:
+            return
+        connected_item = listWidget[1 - index].find(connected[0])
+        if not connected_item:
+            return
+        listWidget[1 - index].set_selected(connected_item)
+        item = updating_listWidget.find(node)
+        if item:
+            updating_listWidget.set_selected(item)
+
+
+imagePlane_pynodes = {}  # MObjectHandle.hashCode() -> (MObjectHandle, PyNode)
 
 
 def imagePlane_to_pynode(imagePlane):
-    """ Convert the given imagePlane to pynode, use list index since pymel might get duplicate naming error"""
+    """
+    Convert the given imagePlane to pynode, resolve by UUID since pymel might get duplicate naming error.
+    Results are cached per handle and dropped once the node is gone.
+    """
     imagePlane_parent = None
-    imagePlane = main.mobj2(imagePlane, 'fullPath')
-    imagePlane_strings = cmds.ls(type='imagePlane', long=1, ap=1)
-    if imagePlane in imagePlane_strings:
-        index = imagePlane_strings.index(imagePlane)
-        imagePlane = pm.ls(type='imagePlane')[index]
-    return imagePlane_parent, imagePlane
+    handle = main.mobj2(imagePlane, 'handle')
+    cached = imagePlane_pynodes.get(handle.hashCode())
+    if cached and cached[0].isValid() and cached[0].object() == handle.object() and cached[1].exists():
+        return imagePlane_parent, cached[1]
+    imagePlane_pynodes.pop(handle.hashCode(), None)
+    full_path = main.mobj2(handle, 'fullPath')
+    nodes = pm.ls(main.mobj2(handle, 'fn').uuid().asString())
+    if not nodes:
+        return imagePlane_parent, full_path
+    node = next((n for n in nodes if n.longName() == full_path), nodes[0])
+    imagePlane_pynodes[handle.hashCode()] = (handle, node)
+    return imagePlane_parent, node
 
 
 def show():